@@ -0,0 +1,3 @@
+"""
+Scripts de benchmark y pruebas de carga de la API.
+"""
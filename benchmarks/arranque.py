@@ -0,0 +1,56 @@
+"""
+Mide el tiempo de migración al arrancar, con y sin el camino rápido.
+
+Compara run_migrations(force=True), que refleja el catálogo y ejecuta
+create_all como hacía cada arranque antes de schema_version, con
+run_migrations() cuando el hash registrado coincide. Entre repeticiones se
+descarta el pool de conexiones para incluir el costo de conectar, como en
+el arranque real de un worker.
+
+Uso:
+    python -m benchmarks.arranque --repeticiones 5
+"""
+
+import argparse
+import logging
+import statistics
+import time
+
+from database.connection import engine
+from src.migrations import run_migrations
+
+
+def medir(repeticiones: int, force: bool) -> list:
+    tiempos = []
+    for _ in range(repeticiones):
+        engine.dispose()
+        inicio = time.perf_counter()
+        if not run_migrations(force=force):
+            raise RuntimeError("La migración falló")
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    # La migración completa deja registrado el hash para el camino rápido
+    completa = medir(args.repeticiones, force=True)
+    rapida = medir(args.repeticiones, force=False)
+
+    print("\n📊 Tiempo de migración al arrancar:")
+    print("=" * 50)
+    print(f"Completa (antes):      media {statistics.fmean(completa) * 1000:8.1f} ms, "
+          f"mín {min(completa) * 1000:8.1f} ms")
+    print(f"Camino rápido (ahora): media {statistics.fmean(rapida) * 1000:8.1f} ms, "
+          f"mín {min(rapida) * 1000:8.1f} ms")
+    print("=" * 50)
+    print(f"Mejora: {statistics.fmean(completa) / statistics.fmean(rapida):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark de carga para POST /tarjetas/autorizar.
+
+Crea un cliente, una cuenta y un conjunto de tarjetas de prueba en la base de
+datos configurada en DATABASE_URL, y luego dispara autorizaciones
+concurrentes contra un servidor en ejecución reportando p50/p95/p99.
+
+Uso:
+    python -m benchmarks.autorizacion_tarjetas --url http://127.0.0.1:8000 \\
+        --peticiones 5000 --concurrencia 64
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+
+from database.connection import SessionLocal
+from src.entities.clientes import Clientes
+from src.entities.cuentas import Cuentas
+from src.entities.tarjetas import Tarjetas
+
+OBJETIVO_P99_MS = 20.0
+
+
+def preparar_tarjetas(cantidad: int) -> list:
+    """Inserta tarjetas activas con saldo suficiente y devuelve sus números."""
+    db = SessionLocal()
+    try:
+        sufijo = uuid.uuid4().hex[:8]
+        cliente = Clientes(
+            nombre="Benchmark",
+            apellido="POS",
+            documento=f"BENCH-{sufijo}",
+        )
+        db.add(cliente)
+        db.flush()
+        cuenta = Cuentas(
+            idCliente=cliente.idCliente,
+            numeroCuenta=f"BENCH-{sufijo}",
+            tipoCuenta="Corriente",
+            saldo=0,
+        )
+        db.add(cuenta)
+        db.flush()
+
+        numeros = [f"9{sufijo}{i:07d}" for i in range(cantidad)]
+        expiracion = datetime.utcnow() + timedelta(days=365)
+        db.add_all(
+            Tarjetas(
+                idCuenta=cuenta.idCuenta,
+                numeroTarjeta=numero,
+                tipo="Crédito",
+                limiteCredito=1e12,
+                saldoDisponible=1e12,
+                estado="Activa",
+                fechaExpiracion=expiracion,
+            )
+            for numero in numeros
+        )
+        db.commit()
+        return numeros
+    finally:
+        db.close()
+
+
+def percentil(valores: list, p: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not valores:
+        return 0.0
+    indice = max(0, min(len(valores) - 1, round(p / 100 * len(valores) + 0.5) - 1))
+    return valores[indice]
+
+
+async def ejecutar(url: str, numeros: list, peticiones: int, concurrencia: int):
+    latencias = []
+    errores = 0
+    pendientes = iter(range(peticiones))
+
+    limites = httpx.Limits(max_connections=concurrencia, max_keepalive_connections=concurrencia)
+    async with httpx.AsyncClient(base_url=url, limits=limites, timeout=10.0) as client:
+
+        async def trabajador():
+            nonlocal errores
+            for _ in pendientes:
+                cuerpo = {"numeroTarjeta": random.choice(numeros), "monto": 1.0}
+                inicio = time.perf_counter()
+                respuesta = await client.post("/tarjetas/autorizar", json=cuerpo)
+                latencias.append((time.perf_counter() - inicio) * 1000)
+                if respuesta.status_code != 200:
+                    errores += 1
+
+        inicio_total = time.perf_counter()
+        await asyncio.gather(*(trabajador() for _ in range(concurrencia)))
+        duracion = time.perf_counter() - inicio_total
+
+    return sorted(latencias), errores, duracion
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--peticiones", type=int, default=5000)
+    parser.add_argument("--concurrencia", type=int, default=64)
+    parser.add_argument("--tarjetas", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"🏗️  Preparando {args.tarjetas} tarjetas de prueba...")
+    numeros = preparar_tarjetas(args.tarjetas)
+
+    print(f"🔄 {args.peticiones} autorizaciones con concurrencia {args.concurrencia}...")
+    latencias, errores, duracion = asyncio.run(
+        ejecutar(args.url, numeros, args.peticiones, args.concurrencia)
+    )
+
+    p99 = percentil(latencias, 99)
+    print("\n📊 Resultados /tarjetas/autorizar:")
+    print("=" * 50)
+    print(f"Peticiones:   {len(latencias)} ({errores} errores)")
+    print(f"Throughput:   {len(latencias) / duracion:.1f} req/s")
+    print(f"Media:        {statistics.fmean(latencias):.2f} ms")
+    print(f"p50:          {percentil(latencias, 50):.2f} ms")
+    print(f"p95:          {percentil(latencias, 95):.2f} ms")
+    print(f"p99:          {p99:.2f} ms")
+    print("=" * 50)
+    estado = "✅" if p99 <= OBJETIVO_P99_MS else "❌"
+    print(f"{estado} Objetivo p99 <= {OBJETIVO_P99_MS:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
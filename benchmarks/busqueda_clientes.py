@@ -0,0 +1,127 @@
+"""
+Benchmark de GET /clientes/buscar sobre una tabla de clientes grande.
+
+Puebla la tabla clientes hasta el tamaño pedido (por defecto 5M) con
+nombres y documentos sintéticos generados en SQL, y mide la latencia de
+buscar_clientes con términos parciales de nombre, apellido y documento.
+
+Uso:
+    python -m benchmarks.busqueda_clientes --clientes 5000000 --consultas 500
+"""
+
+import argparse
+import random
+import time
+
+from sqlalchemy import text
+
+from benchmarks.autorizacion_tarjetas import percentil
+from database.connection import SessionLocal, engine
+from src.controller.clientes import buscar_clientes
+
+OBJETIVO_P99_MS = 50.0
+LOTE_INSERCION = 250_000
+
+NOMBRES = [
+    "Juan", "María", "Carlos", "Ana", "Luis", "Laura", "Andrés", "Camila",
+    "Jorge", "Valentina", "Santiago", "Daniela", "Felipe", "Paula", "Diego",
+    "Natalia", "Sebastián", "Sofía", "Alejandro", "Mariana", "Julián", "Isabela",
+]
+APELLIDOS = [
+    "García", "Rodríguez", "Martínez", "López", "González", "Pérez", "Gómez",
+    "Sánchez", "Ramírez", "Torres", "Díaz", "Vargas", "Rojas", "Moreno",
+    "Jiménez", "Castro", "Ortiz", "Morales", "Herrera", "Oliveros", "Restrepo",
+    "Cardona", "Ospina", "Giraldo", "Quintero", "Mejía", "Valencia", "Salazar",
+]
+
+
+def poblar_clientes(objetivo: int):
+    """Inserta clientes sintéticos hasta alcanzar `objetivo` filas."""
+    with engine.connect() as conn:
+        actuales = conn.execute(text("SELECT COUNT(*) FROM clientes")).scalar()
+        print(f"📋 Clientes existentes: {actuales}")
+        desde = actuales
+        while desde < objetivo:
+            hasta = min(desde + LOTE_INSERCION, objetivo)
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO clientes ("idCliente", nombre, apellido, documento, fecha_creacion)
+                    SELECT gen_random_uuid(),
+                           (:nombres)[1 + floor(random() * cardinality(:nombres))::int]
+                               || ' ' || substr(md5(n::text), 1, 4),
+                           (:apellidos)[1 + floor(random() * cardinality(:apellidos))::int]
+                               || ' ' || (:apellidos)[1 + floor(random() * cardinality(:apellidos))::int],
+                           'BS' || to_char(n, 'FM0000000000'),
+                           now()
+                    FROM generate_series(:desde + 1, :hasta) AS n
+                    ON CONFLICT DO NOTHING
+                    """
+                ),
+                {"nombres": NOMBRES, "apellidos": APELLIDOS, "desde": desde, "hasta": hasta},
+            )
+            conn.commit()
+            desde = hasta
+            print(f"🏗️  {desde}/{objetivo} clientes")
+        conn.execute(text("ANALYZE clientes"))
+        conn.commit()
+
+
+def terminos_de_busqueda(cantidad: int, total: int) -> list:
+    """Mezcla de nombres parciales, apellidos y prefijos de documento."""
+    terminos = []
+    for _ in range(cantidad):
+        tipo = random.random()
+        if tipo < 0.4:
+            nombre = random.choice(NOMBRES)
+            terminos.append(nombre[: random.randint(3, len(nombre))])
+        elif tipo < 0.8:
+            terminos.append(random.choice(APELLIDOS))
+        else:
+            documento = f"BS{random.randint(1, max(total, 1)):010d}"
+            terminos.append(documento[: random.randint(8, 12)])
+    return terminos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clientes", type=int, default=5_000_000)
+    parser.add_argument("--consultas", type=int, default=500)
+    parser.add_argument("--sin-poblar", action="store_true", help="No insertar clientes")
+    args = parser.parse_args()
+
+    if not args.sin_poblar:
+        poblar_clientes(args.clientes)
+
+    db = SessionLocal()
+    try:
+        total = db.execute(text("SELECT COUNT(*) FROM clientes")).scalar()
+        terminos = terminos_de_busqueda(args.consultas, total)
+
+        # Calentar la caché de páginas antes de medir
+        for termino in terminos[:20]:
+            buscar_clientes(db, termino)
+
+        latencias = []
+        for termino in terminos:
+            inicio = time.perf_counter()
+            buscar_clientes(db, termino)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+        latencias.sort()
+    finally:
+        db.close()
+
+    p99 = percentil(latencias, 99)
+    print(f"\n📊 Búsqueda de clientes ({total} filas, {len(latencias)} consultas):")
+    print("=" * 50)
+    print(f"p50:  {percentil(latencias, 50):.2f} ms")
+    print(f"p95:  {percentil(latencias, 95):.2f} ms")
+    print(f"p99:  {p99:.2f} ms")
+    print(f"máx:  {latencias[-1]:.2f} ms")
+    print("=" * 50)
+    estado = "✅" if p99 <= OBJETIVO_P99_MS else "❌"
+    print(f"{estado} Objetivo p99 <= {OBJETIVO_P99_MS:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
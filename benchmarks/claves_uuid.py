@@ -0,0 +1,151 @@
+"""
+Compara claves primarias uuid4 y uuid7 en inserciones masivas.
+
+Carga con COPY la misma cantidad de filas (por defecto 10M) en dos tablas
+con la forma de transacciones, una por generador, y reporta el rendimiento
+de inserción total y del último tramo (cuando el índice ya es grande), el
+tamaño del índice de la clave primaria y la tasa de aciertos en caché de
+sus páginas.
+
+Uso:
+    python -m benchmarks.claves_uuid --filas 10000000 --lote 100000
+"""
+
+import argparse
+import io
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from database.connection import engine
+from database.identificadores import GENERADORES
+
+
+def _crear_tabla(tabla: str):
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {tabla}"))
+        conn.execute(
+            text(
+                f"""
+                CREATE TABLE {tabla} (
+                    "idTransaccion" uuid PRIMARY KEY,
+                    "idCuenta" uuid NOT NULL,
+                    tipo varchar NOT NULL,
+                    monto numeric(14, 2) NOT NULL,
+                    fecha timestamp
+                )
+                """
+            )
+        )
+
+
+def _lote_copy(generador, cuentas: list, cantidad: int, inicio: datetime) -> io.StringIO:
+    buffer = io.StringIO()
+    for i in range(cantidad):
+        buffer.write(
+            f"{generador()}\t{random.choice(cuentas)}\tcompra\t"
+            f"{random.randint(100, 5_000_000) / 100:.2f}\t"
+            f"{inicio + timedelta(milliseconds=i)}\n"
+        )
+    buffer.seek(0)
+    return buffer
+
+
+def cargar(nombre: str, filas: int, lote: int) -> dict:
+    """
+    Inserta `filas` filas con el generador `nombre` y mide el rendimiento.
+
+    Returns:
+        dict: Tiempos, filas por segundo y estadísticas del índice
+    """
+    tabla = f"bench_pk_{nombre}"
+    generador = GENERADORES[nombre]
+    cuentas = [GENERADORES["uuid4"]() for _ in range(10_000)]
+    _crear_tabla(tabla)
+
+    tiempos = []
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        insertadas = 0
+        while insertadas < filas:
+            cantidad = min(lote, filas - insertadas)
+            datos = _lote_copy(generador, cuentas, cantidad, datetime.now())
+            inicio = time.perf_counter()
+            cursor.copy_expert(
+                f'COPY {tabla} ("idTransaccion", "idCuenta", tipo, monto, fecha) FROM STDIN',
+                datos,
+            )
+            conn.commit()
+            tiempos.append((cantidad, time.perf_counter() - inicio))
+            insertadas += cantidad
+            print(f"  {nombre}: {insertadas:>11,} filas", end="\r")
+        print()
+    finally:
+        conn.close()
+
+    # Las estadísticas de E/S se publican cuando la sesión que cargó termina
+    time.sleep(1.5)
+    with engine.connect() as c:
+        indice = c.execute(
+            text(
+                """
+                SELECT pg_relation_size(indexrelid) AS bytes,
+                       idx_blks_hit AS aciertos,
+                       idx_blks_read AS lecturas
+                FROM pg_statio_user_indexes
+                WHERE relname = :tabla
+                """
+            ),
+            {"tabla": tabla},
+        ).one()
+
+    ultimo_tramo = tiempos[-max(1, len(tiempos) // 10):]
+    total = sum(t for _, t in tiempos)
+    accesos = indice.aciertos + indice.lecturas
+    return {
+        "generador": nombre,
+        "segundos": total,
+        "filas_por_segundo": filas / total,
+        "filas_por_segundo_final": sum(n for n, _ in ultimo_tramo) / sum(t for _, t in ultimo_tramo),
+        "indice_mb": indice.bytes / 1024 / 1024,
+        "aciertos_cache": indice.aciertos / accesos if accesos else 1.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, default=10_000_000)
+    parser.add_argument("--lote", type=int, default=100_000)
+    parser.add_argument(
+        "--conservar", action="store_true", help="No elimina las tablas de prueba al terminar"
+    )
+    args = parser.parse_args()
+
+    resultados = [cargar(nombre, args.filas, args.lote) for nombre in ("uuid4", "uuid7")]
+
+    print(f"\n📊 Inserción de {args.filas:,} filas con COPY:")
+    print("=" * 78)
+    print(f"{'Generador':<10} {'Tiempo':>10} {'Filas/s':>12} {'Filas/s (último 10%)':>22} "
+          f"{'Índice PK':>11} {'Caché':>8}")
+    for r in resultados:
+        print(
+            f"{r['generador']:<10} {r['segundos']:>9.1f}s {r['filas_por_segundo']:>12,.0f} "
+            f"{r['filas_por_segundo_final']:>22,.0f} {r['indice_mb']:>8.1f} MB "
+            f"{r['aciertos_cache']:>7.1%}"
+        )
+    print("=" * 78)
+    v4, v7 = resultados
+    print(f"uuid7: {v7['filas_por_segundo'] / v4['filas_por_segundo']:.2f}x filas/s, "
+          f"índice {v7['indice_mb'] / v4['indice_mb']:.2f}x del tamaño de uuid4")
+
+    if not args.conservar:
+        with engine.begin() as conn:
+            for r in resultados:
+                conn.execute(text(f"DROP TABLE IF EXISTS bench_pk_{r['generador']}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compara CPU contra bytes de cada algoritmo y nivel de compresión.
+
+Obtiene las respuestas reales de los listados grandes (GET /transacciones/
+y GET /clientes/clientes/) llamando a la aplicación en este proceso, sin
+comprimir, y las comprime con los mismos codificadores que usa
+CompresionMiddleware, en cada nivel pedido. Mide el tiempo por respuesta,
+el throughput y la razón de compresión, comprimiendo de una vez y también
+por partes de --parte bytes con un flush por parte, como en una respuesta
+en streaming.
+
+Uso:
+    python -m benchmarks.compresion --usuario admin --clave secreta --repeticiones 20
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+
+from benchmarks.autorizacion_tarjetas import percentil
+from src.middleware.compresion import CODIFICADORES
+
+RUTAS = ("/transacciones/", "/clientes/clientes/")
+NIVELES = {"gzip": (1, 4, 6, 9), "br": (1, 4, 6, 11), "zstd": (1, 3, 9, 19)}
+
+
+async def obtener_cuerpos(usuario: str, clave: str) -> dict:
+    """Devuelve el cuerpo sin comprimir de cada ruta de RUTAS."""
+    from main import app
+
+    transporte = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://compresion") as cliente:
+        login = await cliente.post("/auth/login", json={"username": usuario, "password": clave})
+        login.raise_for_status()
+        cabeceras = {
+            "Authorization": f"Bearer {login.json()['access_token']}",
+            "Accept-Encoding": "identity",
+        }
+        cuerpos = {}
+        for ruta in RUTAS:
+            respuesta = await cliente.get(ruta, headers=cabeceras)
+            respuesta.raise_for_status()
+            cuerpos[ruta] = respuesta.content
+        return cuerpos
+
+
+def comprimir(algoritmo: str, nivel: int, cuerpo: bytes, parte: int = 0) -> bytes:
+    """Comprime `cuerpo` de una vez, o por partes con flush si `parte` > 0."""
+    codificador = CODIFICADORES[algoritmo](nivel)
+    if not parte:
+        return codificador.final(cuerpo)
+    partes = [cuerpo[i:i + parte] for i in range(0, len(cuerpo), parte)] or [b""]
+    salida = [codificador.parte(p) for p in partes[:-1]]
+    salida.append(codificador.final(partes[-1]))
+    return b"".join(salida)
+
+
+def medir(cuerpo: bytes, algoritmo: str, nivel: int, repeticiones: int, parte: int) -> dict:
+    """Tiempo y tamaño de comprimir `cuerpo` `repeticiones` veces."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        salida = comprimir(algoritmo, nivel, cuerpo, parte)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    p50 = percentil(tiempos, 50)
+    return {
+        "algoritmo": algoritmo,
+        "nivel": nivel,
+        "bytes": len(salida),
+        "razon": len(cuerpo) / len(salida),
+        "p50_ms": p50,
+        "p95_ms": percentil(tiempos, 95),
+        "mb_por_segundo": len(cuerpo) / 1e6 / (p50 / 1000) if p50 else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--usuario", required=True)
+    parser.add_argument("--clave", required=True)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--parte", type=int, default=16384,
+                        help="Tamaño de cada parte al comprimir en streaming")
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    cuerpos = asyncio.run(obtener_cuerpos(args.usuario, args.clave))
+
+    for ruta, cuerpo in cuerpos.items():
+        print(f"\n📊 GET {ruta}: {len(cuerpo) / 1024:.1f} KiB sin comprimir")
+        print("=" * 86)
+        print(f"{'Algoritmo':<10} {'Nivel':>5} {'KiB':>9} {'Razón':>7} {'p50 ms':>8} "
+              f"{'p95 ms':>8} {'MB/s':>8} {'KiB stream':>11} {'p50 stream':>11}")
+        for algoritmo, niveles in NIVELES.items():
+            if algoritmo not in CODIFICADORES:
+                print(f"{algoritmo:<10} (no instalado)")
+                continue
+            for nivel in niveles:
+                r = medir(cuerpo, algoritmo, nivel, args.repeticiones, 0)
+                s = medir(cuerpo, algoritmo, nivel, args.repeticiones, args.parte)
+                print(f"{algoritmo:<10} {nivel:>5} {r['bytes'] / 1024:>9.1f} {r['razon']:>7.1f} "
+                      f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['mb_por_segundo']:>8.0f} "
+                      f"{s['bytes'] / 1024:>11.1f} {s['p50_ms']:>11.2f}")
+        print("=" * 86)
+
+
+if __name__ == "__main__":
+    main()
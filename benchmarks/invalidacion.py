@@ -0,0 +1,131 @@
+"""
+Mide cuánto tarda una invalidación en llegar a los demás workers.
+
+Levanta --procesos procesos, cada uno con su propio BusInvalidacion
+escuchando el canal, y desde el proceso principal confirma --avisos
+transacciones que publican una invalidación cada una. Cada proceso anota
+el instante en que recibió cada aviso; la diferencia con el instante del
+commit es el tiempo durante el cual ese worker pudo servir un dato viejo.
+El reporte da los percentiles de ese atraso y los avisos que no llegaron.
+
+Uso:
+    python -m benchmarks.invalidacion --procesos 4 --avisos 2000 --tasa 500
+"""
+
+import argparse
+import multiprocessing
+import queue
+import time
+
+from benchmarks.autorizacion_tarjetas import percentil
+from database.connection import SessionLocal
+from database.invalidacion import TODO, BusInvalidacion, publicar
+
+ENTIDAD = "bench_invalidacion"
+
+
+def _worker(numero: int, resultados, listo, detener):
+    from database.connection import engine_directo
+
+    bus = BusInvalidacion(engine_directo)
+
+    def recibir(clave: str):
+        # Al conectar el bus desaloja todo: es la señal de que ya escucha
+        if clave == TODO:
+            listo.set()
+        else:
+            resultados.put((numero, int(clave), time.time()))
+
+    bus.suscribir(ENTIDAD, recibir)
+    bus.iniciar()
+    detener.wait()
+    bus.detener()
+
+
+def medir(procesos: int, avisos: int, tasa: float, espera_final: float) -> dict:
+    """
+    Publica `avisos` invalidaciones y mide el atraso con que las ve cada proceso.
+
+    Returns:
+        dict: Percentiles del atraso en ms, avisos perdidos y ritmo de publicación
+    """
+    contexto = multiprocessing.get_context("spawn")
+    resultados = contexto.Queue()
+    detener = contexto.Event()
+    listos = [contexto.Event() for _ in range(procesos)]
+    workers = [
+        contexto.Process(target=_worker, args=(i, resultados, listos[i], detener), daemon=True)
+        for i in range(procesos)
+    ]
+    for worker in workers:
+        worker.start()
+    for listo in listos:
+        if not listo.wait(60):
+            raise RuntimeError("un worker no llegó a escuchar el canal")
+
+    confirmados = {}
+    intervalo = 1 / tasa if tasa else 0
+    inicio = time.perf_counter()
+    db = SessionLocal()
+    try:
+        for i in range(avisos):
+            publicar(db, ENTIDAD, i)
+            db.commit()
+            confirmados[i] = time.time()
+            objetivo = inicio + (i + 1) * intervalo
+            pausa = objetivo - time.perf_counter()
+            if pausa > 0:
+                time.sleep(pausa)
+    finally:
+        db.close()
+    duracion = time.perf_counter() - inicio
+
+    atrasos = []
+    esperados = avisos * procesos
+    limite = time.monotonic() + espera_final
+    while len(atrasos) < esperados and time.monotonic() < limite:
+        try:
+            _, aviso, recibido = resultados.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        atrasos.append((recibido - confirmados[aviso]) * 1000)
+
+    detener.set()
+    for worker in workers:
+        worker.join(10)
+
+    atrasos.sort()
+    return {
+        "procesos": procesos,
+        "avisos": avisos,
+        "avisos_por_segundo": avisos / duracion,
+        "perdidos": esperados - len(atrasos),
+        "p50_ms": percentil(atrasos, 50),
+        "p95_ms": percentil(atrasos, 95),
+        "p99_ms": percentil(atrasos, 99),
+        "max_ms": atrasos[-1] if atrasos else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--procesos", type=int, default=4)
+    parser.add_argument("--avisos", type=int, default=2000)
+    parser.add_argument("--tasa", type=float, default=500.0,
+                        help="Commits por segundo (0 = tan rápido como se pueda)")
+    parser.add_argument("--espera-final", type=float, default=10.0,
+                        help="Segundos para recibir los avisos pendientes al terminar")
+    args = parser.parse_args()
+
+    r = medir(args.procesos, args.avisos, args.tasa, args.espera_final)
+    print(f"\n📊 Invalidaciones: {r['avisos']} avisos a {r['avisos_por_segundo']:.0f}/s "
+          f"hacia {r['procesos']} procesos")
+    print("=" * 60)
+    print(f"Atraso p50 {r['p50_ms']:.2f} ms | p95 {r['p95_ms']:.2f} ms | "
+          f"p99 {r['p99_ms']:.2f} ms | máx {r['max_ms']:.2f} ms")
+    print(f"Avisos perdidos: {r['perdidos']}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
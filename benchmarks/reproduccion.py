@@ -0,0 +1,218 @@
+"""
+Reproduce una captura de tráfico y compara latencias con las originales.
+
+Lee el JSONL que escribe CapturaMiddleware y envía cada solicitud en el
+mismo instante relativo en que llegó, o más rápido con --velocidad (2 =
+el doble de tasa). Es una carga de ciclo abierto: las solicitudes salen a
+su hora aunque las anteriores no hayan terminado, igual que en producción.
+
+El objetivo puede ser un servidor (--url) o main.app en el mismo proceso
+(--en-proceso). Como la captura no guarda credenciales, las solicitudes
+autenticadas usan el token de --token o el que se obtiene con
+--usuario/--clave; --clave también reemplaza las contraseñas redactadas.
+
+Uso:
+    python -m benchmarks.reproduccion capturas/trafico.jsonl --url http://localhost:8000 --velocidad 2
+    python -m benchmarks.reproduccion capturas/trafico.jsonl --en-proceso --usuario admin --clave admin123
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import time
+
+import httpx
+
+from benchmarks.autorizacion_tarjetas import percentil
+from src.middleware.captura import REDACTADO
+
+CAMPOS_CLAVE = {"password", "clave"}
+PATRON_UUID = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
+
+def cargar_captura(archivo: str, limite: int = None) -> list:
+    """Lee los registros reproducibles de la captura, en orden de llegada."""
+    registros = []
+    with open(archivo, encoding="utf-8") as entrada:
+        for linea in entrada:
+            registro = json.loads(linea)
+            if "cuerpo_truncado" not in registro and "cuerpo_descartado" not in registro:
+                registros.append(registro)
+    registros.sort(key=lambda r: r["instante"])
+    return registros[:limite] if limite else registros
+
+
+def _clave(registro: dict) -> str:
+    plantilla = registro.get("plantilla") or PATRON_UUID.sub("{id}", registro["ruta"])
+    return f"{registro['metodo']} {plantilla}"
+
+
+def _restaurar(valor, clave: str, campo: str = ""):
+    """
+    Reemplaza las contraseñas redactadas por la clave de la reproducción.
+
+    Solo se tocan los campos de CAMPOS_CLAVE; el resto de los valores
+    redactados o enmascarados (cvv, tokens, números de tarjeta) se envía tal cual.
+    """
+    if isinstance(valor, dict):
+        return {k: _restaurar(v, clave, k) for k, v in valor.items()}
+    if isinstance(valor, list):
+        return [_restaurar(v, clave, campo) for v in valor]
+    if clave and valor == REDACTADO and campo.lower() in CAMPOS_CLAVE:
+        return clave
+    return valor
+
+
+def _solicitud(registro: dict, token: str, clave: str) -> dict:
+    cabeceras = dict(registro.get("cabeceras", {}))
+    if registro.get("autenticado") and token:
+        cabeceras["authorization"] = f"Bearer {token}"
+    solicitud = {
+        "method": registro["metodo"],
+        "url": registro["ruta"] + (f"?{registro['consulta']}" if registro.get("consulta") else ""),
+        "headers": cabeceras,
+    }
+    if "cuerpo" in registro:
+        solicitud["json"] = _restaurar(registro["cuerpo"], clave)
+    elif "formulario" in registro:
+        solicitud["data"] = _restaurar(registro["formulario"], clave)
+    return solicitud
+
+
+async def reproducir(cliente: httpx.AsyncClient, registros: list, velocidad: float,
+                     token: str, clave: str) -> dict:
+    """
+    Envía los registros respetando los intervalos originales divididos por `velocidad`.
+
+    Returns:
+        dict: Resultados por endpoint y el atraso máximo del planificador
+    """
+    resultados = {}
+    atraso_max = 0.0
+    origen = registros[0]["instante"]
+    inicio = time.perf_counter()
+
+    async def enviar(registro: dict):
+        comienzo = time.perf_counter()
+        try:
+            respuesta = await cliente.request(**_solicitud(registro, token, clave))
+            estado = respuesta.status_code
+        except httpx.HTTPError:
+            estado = None
+        resultado = resultados.setdefault(
+            _clave(registro), {"originales": [], "reproducidas": [], "estado_distinto": 0}
+        )
+        resultado["originales"].append(registro["duracion_ms"])
+        resultado["reproducidas"].append((time.perf_counter() - comienzo) * 1000)
+        if estado != registro["estado"]:
+            resultado["estado_distinto"] += 1
+
+    tareas = []
+    for registro in registros:
+        objetivo = (registro["instante"] - origen) / velocidad
+        espera = objetivo - (time.perf_counter() - inicio)
+        if espera > 0:
+            await asyncio.sleep(espera)
+        atraso_max = max(atraso_max, -espera)
+        tareas.append(asyncio.create_task(enviar(registro)))
+    await asyncio.gather(*tareas)
+
+    return {
+        "duracion_s": time.perf_counter() - inicio,
+        "atraso_max_ms": atraso_max * 1000,
+        "endpoints": resultados,
+    }
+
+
+def resumir(resultado: dict) -> list:
+    """Percentiles originales y reproducidos con su diferencia, por endpoint."""
+    filas = []
+    for clave, datos in sorted(resultado["endpoints"].items()):
+        originales = sorted(datos["originales"])
+        reproducidas = sorted(datos["reproducidas"])
+        fila = {"endpoint": clave, "solicitudes": len(originales),
+                "estado_distinto": datos["estado_distinto"]}
+        for p in (50, 95, 99):
+            original = percentil(originales, p)
+            reproducida = percentil(reproducidas, p)
+            fila[f"p{p}_original_ms"] = round(original, 3)
+            fila[f"p{p}_reproducida_ms"] = round(reproducida, 3)
+            fila[f"p{p}_delta_ms"] = round(reproducida - original, 3)
+        filas.append(fila)
+    return filas
+
+
+async def _ejecutar(args) -> dict:
+    registros = cargar_captura(args.captura, args.limite)
+    if not registros:
+        raise SystemExit(f"❌ {args.captura} no tiene solicitudes reproducibles "
+                         "(vacía o todas con el cuerpo truncado o descartado)")
+
+    if args.en_proceso:
+        from main import app
+
+        transporte = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        cliente = httpx.AsyncClient(transport=transporte, base_url="http://reproduccion")
+    else:
+        cliente = httpx.AsyncClient(
+            base_url=args.url,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=100),
+        )
+
+    async with cliente:
+        token = args.token
+        if not token and args.usuario:
+            login = await cliente.post(
+                "/auth/login", json={"username": args.usuario, "password": args.clave}
+            )
+            login.raise_for_status()
+            token = login.json()["access_token"]
+
+        print(f"▶️  Reproduciendo {len(registros)} solicitudes a {args.velocidad}x...")
+        return await reproducir(cliente, registros, args.velocidad, token, args.clave)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("captura", help="Archivo JSONL escrito por CapturaMiddleware")
+    destino = parser.add_mutually_exclusive_group(required=True)
+    destino.add_argument("--url", help="URL base del servidor objetivo")
+    destino.add_argument("--en-proceso", action="store_true", help="Usa main.app en este proceso")
+    parser.add_argument("--velocidad", type=float, default=1.0,
+                        help="Multiplicador de la tasa original")
+    parser.add_argument("--limite", type=int, default=None, help="Máximo de solicitudes")
+    parser.add_argument("--token", help="Token JWT para las solicitudes autenticadas")
+    parser.add_argument("--usuario", help="Usuario para obtener un token")
+    parser.add_argument("--clave", help="Contraseña del usuario y de los cuerpos redactados")
+    parser.add_argument("--salida", help="Archivo JSON con el resumen")
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    resultado = asyncio.run(_ejecutar(args))
+    filas = resumir(resultado)
+
+    print(f"\n📊 Reproducción en {resultado['duracion_s']:.1f} s "
+          f"(atraso máximo del planificador {resultado['atraso_max_ms']:.1f} ms):")
+    print("=" * 96)
+    print(f"{'Endpoint':<44} {'N':>6} {'p50 orig':>9} {'p50 rep':>9} {'p95 orig':>9} "
+          f"{'p95 rep':>9} {'Δp95':>8}")
+    for f in filas:
+        print(
+            f"{f['endpoint']:<44} {f['solicitudes']:>6} {f['p50_original_ms']:>9.1f} "
+            f"{f['p50_reproducida_ms']:>9.1f} {f['p95_original_ms']:>9.1f} "
+            f"{f['p95_reproducida_ms']:>9.1f} {f['p95_delta_ms']:>+8.1f}"
+            + (f"  ⚠️  {f['estado_distinto']} con otro estado" if f["estado_distinto"] else "")
+        )
+    print("=" * 96)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump({"atraso_max_ms": resultado["atraso_max_ms"], "endpoints": filas},
+                      archivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
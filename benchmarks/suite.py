@@ -0,0 +1,563 @@
+"""
+Suite de benchmarks en proceso de toda la API.
+
+Levanta main.app dentro del mismo proceso con el transporte ASGI de httpx,
+sin servidor ni red, contra la base de datos de DATABASE_URL (un Postgres
+local dedicado: la suite inserta y elimina datos). Recorre todos los
+routers: login, CRUD de las siete entidades, autorización de tarjetas,
+búsqueda y tareas de mantenimiento. Los listados se miden con las tablas
+pobladas a cada uno de los tamaños pedidos; el resto, con el mayor.
+
+Por endpoint reporta p50/p95/p99, rendimiento y consultas SQL por
+solicitud, en JSON para poder comparar resultados entre commits. Sin
+--salida el JSON va a stdout; el progreso y la comparación, a stderr.
+
+Uso:
+    python -m benchmarks.suite --tamanos 100,1000,10000 --concurrencia 8 --salida actual.json
+    python -m benchmarks.suite --comparar base.json --salida actual.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import random
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Callable, Optional
+
+import httpx
+from sqlalchemy import text
+
+from benchmarks.autorizacion_tarjetas import percentil
+from database.connection import SessionLocal, engine
+from database.instrumentacion import finalizar_estadisticas, iniciar_estadisticas
+from main import app
+from src.controller.auth_controller import create_user, get_user_by_username
+from src.migrations import run_migrations
+from src.schemas.auth import UserCreate
+
+USUARIO = "benchmark"
+CLAVE = "benchmark-clave"
+UMBRAL_REGRESION = 0.10
+
+# Inserciones sintéticas por tabla: crean las filas n = desde+1 .. hasta,
+# colgando cada una de un padre existente elegido por posición.
+INSERCIONES = {
+    "empleados": """
+        INSERT INTO empleados ("idEmpleado", nombre, apellido, documento, cargo, email, activo,
+                               fecha_creacion)
+        SELECT gen_random_uuid(), 'Empleado', 'Bench ' || n, 'EB' || :marca || n,
+               (ARRAY['Cajero', 'Asesor', 'Gerente'])[1 + n % 3],
+               'empleado' || :marca || n || '@bench.example.com', true, now()
+        FROM generate_series(:desde + 1, :hasta) AS n
+        RETURNING "idEmpleado"
+    """,
+    "clientes": """
+        INSERT INTO clientes ("idCliente", nombre, apellido, documento, email, fecha_creacion)
+        SELECT gen_random_uuid(), 'Cliente ' || n, 'Bench', 'CB' || :marca || n,
+               'cliente' || :marca || n || '@bench.example.com', now()
+        FROM generate_series(:desde + 1, :hasta) AS n
+        RETURNING "idCliente"
+    """,
+    "cuentas": """
+        INSERT INTO cuentas ("idCuenta", "idCliente", "numeroCuenta", "tipoCuenta", estado, saldo,
+                             fecha_creacion)
+        SELECT gen_random_uuid(), p.ids[1 + n % cardinality(p.ids)], 'NB' || :marca || n,
+               'Ahorros', 'Activa', 1000000, now()
+        FROM generate_series(:desde + 1, :hasta) AS n,
+             (SELECT array_agg("idCliente") AS ids FROM clientes) AS p
+        RETURNING "idCuenta"
+    """,
+    "tarjetas": """
+        INSERT INTO tarjetas ("idTarjeta", "idCuenta", "numeroTarjeta", tipo, "limiteCredito",
+                              "saldoDisponible", estado, "fechaExpiracion", fecha_creacion)
+        SELECT gen_random_uuid(), p.ids[1 + n % cardinality(p.ids)], 'TB' || :marca || n,
+               'Débito', 0, 1000000000, 'Activa', now() + interval '3 years', now()
+        FROM generate_series(:desde + 1, :hasta) AS n,
+             (SELECT array_agg("idCuenta") AS ids FROM cuentas) AS p
+        RETURNING "idTarjeta"
+    """,
+    "prestamos": """
+        INSERT INTO prestamos ("idPrestamo", "idCliente", "idEmpleado", monto, interes,
+                               "plazoMeses", estado, "fechaVencimiento", fecha_creacion)
+        SELECT gen_random_uuid(), c.ids[1 + n % cardinality(c.ids)],
+               e.ids[1 + n % cardinality(e.ids)], 5000000, 1.5, '24', 'pendiente',
+               now() + interval '2 years', now()
+        FROM generate_series(:desde + 1, :hasta) AS n,
+             (SELECT array_agg("idCliente") AS ids FROM clientes) AS c,
+             (SELECT array_agg("idEmpleado") AS ids FROM empleados) AS e
+        RETURNING "idPrestamo"
+    """,
+    "cheques": """
+        INSERT INTO cheques ("idCheque", "idCliente", "idCuenta", "fechaEmision", "fechaCobro",
+                             monto, motivo, estado, fecha_creacion)
+        SELECT gen_random_uuid(), cu."idCliente", cu."idCuenta", now(),
+               current_date + 30, 100, 'Cheque bench ' || n, 'pendiente', now()
+        FROM generate_series(:desde + 1, :hasta) AS n,
+             (SELECT array_agg("idCuenta") AS ids FROM cuentas) AS p
+        JOIN LATERAL (
+            SELECT "idCliente", "idCuenta" FROM cuentas
+            WHERE "idCuenta" = p.ids[1 + n % cardinality(p.ids)]
+        ) AS cu ON true
+        RETURNING "idCheque"
+    """,
+    "transacciones": """
+        INSERT INTO transacciones ("idTransaccion", "idCuenta", tipo, monto, descripcion, fecha,
+                                   fecha_creacion)
+        SELECT gen_random_uuid(), p.ids[1 + n % cardinality(p.ids)], 'deposito', 100,
+               'Transacción bench ' || n, now(), now()
+        FROM generate_series(:desde + 1, :hasta) AS n,
+             (SELECT array_agg("idCuenta") AS ids FROM cuentas) AS p
+        RETURNING "idTransaccion"
+    """,
+}
+
+CLAVES = {
+    "empleados": "idEmpleado",
+    "clientes": "idCliente",
+    "cuentas": "idCuenta",
+    "tarjetas": "idTarjeta",
+    "prestamos": "idPrestamo",
+    "cheques": "idCheque",
+    "transacciones": "idTransaccion",
+}
+
+
+def insertar(tabla: str, cantidad: int, marca: str) -> list:
+    """Inserta `cantidad` filas sintéticas en `tabla` y devuelve sus ids."""
+    desde = random.randint(0, 10**9)
+    with engine.begin() as conn:
+        return list(
+            conn.execute(
+                text(INSERCIONES[tabla]),
+                {"desde": desde, "hasta": desde + cantidad, "marca": marca},
+            ).scalars()
+        )
+
+
+def poblar(tamano: int, marca: str):
+    """Completa cada tabla hasta `tamano` filas, de padres a hijos."""
+    for tabla in INSERCIONES:
+        with engine.connect() as conn:
+            actuales = conn.execute(text(f"SELECT COUNT(*) FROM {tabla}")).scalar()
+        if actuales < tamano:
+            insertar(tabla, tamano - actuales, marca)
+
+
+def muestrear_ids(limite: int = 1000) -> dict:
+    """Toma una muestra de ids existentes por tabla para las lecturas."""
+    ids = {}
+    with engine.connect() as conn:
+        for tabla, clave in CLAVES.items():
+            ids[tabla] = [
+                str(valor)
+                for valor in conn.execute(
+                    text(f'SELECT "{clave}" FROM {tabla} ORDER BY random() LIMIT :limite'),
+                    {"limite": limite},
+                ).scalars()
+            ]
+        ids["numeros_tarjeta"] = list(
+            conn.execute(
+                text(
+                    """
+                    SELECT "numeroTarjeta" FROM tarjetas
+                    WHERE estado = 'Activa' AND "saldoDisponible" > 1000
+                    ORDER BY random() LIMIT :limite
+                    """
+                ),
+                {"limite": limite},
+            ).scalars()
+        )
+    return ids
+
+
+def asegurar_usuario():
+    """Crea el usuario administrador de la suite si no existe."""
+    db = SessionLocal()
+    try:
+        if not get_user_by_username(db, USUARIO):
+            create_user(
+                db,
+                UserCreate(
+                    username=USUARIO,
+                    email=f"{USUARIO}@bench.example.com",
+                    nombre_completo="Usuario de benchmark",
+                    rol="admin",
+                    password=CLAVE,
+                ),
+            )
+    finally:
+        db.close()
+
+
+class Escenario:
+    """
+    Solicitud a medir contra un endpoint.
+
+    `parametros` completa la ruta y `cuerpo` arma el JSON; ambos reciben el
+    contexto compartido. `preparar` crea antes de medir los datos que la
+    solicitud consume (por ejemplo, las filas que se van a eliminar).
+    """
+
+    def __init__(
+        self,
+        metodo: str,
+        ruta: str,
+        parametros: Callable[[dict], dict] = None,
+        cuerpo: Callable[[dict], dict] = None,
+        consulta: Callable[[dict], dict] = None,
+        preparar: Callable[[dict, int], None] = None,
+        listado: bool = False,
+    ):
+        self.metodo = metodo
+        self.ruta = ruta
+        self.parametros = parametros or (lambda ctx: {})
+        self.cuerpo = cuerpo
+        self.consulta = consulta
+        self.preparar = preparar
+        self.listado = listado
+
+    @property
+    def nombre(self) -> str:
+        return f"{self.metodo} {self.ruta}"
+
+    async def ejecutar(self, cliente: httpx.AsyncClient, ctx: dict) -> httpx.Response:
+        return await cliente.request(
+            self.metodo,
+            self.ruta.format(**self.parametros(ctx)),
+            json=self.cuerpo(ctx) if self.cuerpo else None,
+            params=self.consulta(ctx) if self.consulta else None,
+            headers=ctx["cabeceras"],
+        )
+
+
+def _azar(tabla: str) -> Callable[[dict], str]:
+    return lambda ctx: random.choice(ctx["ids"][tabla])
+
+
+def _secuencia(ctx: dict) -> str:
+    return f"{ctx['marca']}{next(ctx['secuencia'])}"
+
+
+def _desechables(tabla: str) -> Callable[[dict, int], None]:
+    def preparar(ctx: dict, cantidad: int):
+        ctx["desechables"][tabla] = [str(i) for i in insertar(tabla, cantidad, ctx["marca"])]
+
+    return preparar
+
+
+def _tomar(tabla: str) -> Callable[[dict], str]:
+    return lambda ctx: ctx["desechables"][tabla].pop()
+
+
+def _cliente(ctx: dict, id_cliente: str = None) -> dict:
+    sufijo = _secuencia(ctx)
+    return {
+        "idCliente": id_cliente or str(uuid.uuid4()),
+        "nombre": f"Cliente {sufijo}",
+        "apellido": "Bench",
+        "documento": f"CS{sufijo}",
+        "email": f"cs{sufijo}@bench.example.com",
+    }
+
+
+def _cuenta(ctx: dict) -> dict:
+    return {
+        "idCliente": _azar("clientes")(ctx),
+        "numeroCuenta": f"NS{_secuencia(ctx)}",
+        "tipoCuenta": "Ahorros",
+        "saldo": 1000.0,
+        "estado": "Activa",
+    }
+
+
+def _tarjeta(ctx: dict) -> dict:
+    return {
+        "idCuenta": _azar("cuentas")(ctx),
+        "numeroTarjeta": f"TS{_secuencia(ctx)}",
+        "tipo": "Débito",
+        "limiteCredito": 0.0,
+        "saldoDisponible": 1000.0,
+        "fechaExpiracion": (datetime.now() + timedelta(days=1000)).isoformat(),
+        "estado": "Activa",
+    }
+
+
+def _prestamo(ctx: dict) -> dict:
+    return {
+        "idCliente": _azar("clientes")(ctx),
+        "idEmpleado": _azar("empleados")(ctx),
+        "montoPrestamo": 1000000.0,
+        "interes": 1.5,
+        "plazoMeses": 12,
+        "estado": "pendiente",
+    }
+
+
+def _cheque(ctx: dict) -> dict:
+    return {
+        "idCliente": _azar("clientes")(ctx),
+        "idCuenta": _azar("cuentas")(ctx),
+        "fechaEmision": date.today().isoformat(),
+        "fechaCobro": (date.today() + timedelta(days=30)).isoformat(),
+        "monto": 100.0,
+        "motivo": "Cheque de la suite",
+    }
+
+
+def _empleado(ctx: dict, id_empleado: str = None) -> dict:
+    sufijo = _secuencia(ctx)
+    return {
+        "idEmpleado": id_empleado or str(uuid.uuid4()),
+        "nombreEmpleado": f"Empleado {sufijo}",
+        "documentoEmpleado": f"ES{sufijo}",
+        "correoEmpleado": f"es{sufijo}@bench.example.com",
+        "cargo": "Asesor",
+    }
+
+
+def _transaccion(ctx: dict) -> dict:
+    return {
+        "idCuenta": _azar("cuentas")(ctx),
+        "tipo": "deposito",
+        "monto": 100.0,
+        "fecha": datetime.now().isoformat(),
+        "descripcion": "Transacción de la suite",
+    }
+
+
+def _crud(prefijo: str, tabla: str, clave: str, cuerpo, detalle: str, escritura: str) -> list:
+    """Escenarios de crear, listar, leer, actualizar y eliminar una entidad."""
+    return [
+        Escenario("POST", prefijo, cuerpo=cuerpo),
+        Escenario("GET", prefijo, listado=True),
+        Escenario("GET", detalle, parametros=lambda ctx: {clave: _azar(tabla)(ctx)}),
+        Escenario(
+            "PUT",
+            escritura,
+            parametros=lambda ctx: {clave: _tomar(tabla)(ctx)},
+            cuerpo=cuerpo,
+            preparar=_desechables(tabla),
+        ),
+        Escenario(
+            "DELETE",
+            escritura,
+            parametros=lambda ctx: {clave: _tomar(tabla)(ctx)},
+            preparar=_desechables(tabla),
+        ),
+    ]
+
+
+ESCENARIOS = [
+    Escenario("POST", "/auth/login", cuerpo=lambda ctx: {"username": USUARIO, "password": CLAVE}),
+    Escenario("GET", "/auth/me"),
+    *_crud(
+        "/clientes/clientes/", "clientes", "cliente_id", _cliente,
+        "/clientes/clientes/{cliente_id}", "/clientes/clientes/{cliente_id}",
+    ),
+    Escenario("GET", "/clientes/buscar", consulta=lambda ctx: {"q": "Cliente 1"}),
+    *_crud(
+        "/cuentas/", "cuentas", "cuenta_id", _cuenta,
+        "/cuentas/{cuenta_id}", "/cuentas/cuentas/{cuenta_id}",
+    ),
+    *_crud(
+        "/tarjetas/", "tarjetas", "tarjeta_id", _tarjeta,
+        "/tarjetas/{tarjeta_id}", "/tarjetas/tarjetas/{tarjeta_id}",
+    ),
+    Escenario(
+        "POST",
+        "/tarjetas/autorizar",
+        cuerpo=lambda ctx: {
+            "numeroTarjeta": random.choice(ctx["ids"]["numeros_tarjeta"]),
+            "monto": 1.0,
+        },
+    ),
+    *_crud(
+        "/prestamos/", "prestamos", "prestamo_id", _prestamo,
+        "/prestamos/{prestamo_id}", "/prestamos/prestamos/{prestamo_id}",
+    ),
+    *_crud(
+        "/cheques/", "cheques", "cheque_id", _cheque,
+        "/cheques/{cheque_id}", "/cheques/cheques/{cheque_id}",
+    ),
+    Escenario(
+        "POST",
+        "/cheques/compensacion",
+        consulta=lambda ctx: {"tamano_lote": 50, "max_lotes": 1},
+    ),
+    *_crud(
+        "/empleados/empleados/", "empleados", "empleado_id", _empleado,
+        "/empleados/empleados/{empleado_id}", "/empleados/empleados/{empleado_id}",
+    ),
+    *_crud(
+        "/transacciones/", "transacciones", "transaccion_id", _transaccion,
+        "/transacciones/{transaccion_id}", "/transacciones/{transaccion_id}",
+    ),
+    Escenario("GET", "/mantenimiento/tareas"),
+]
+
+
+async def medir(
+    cliente: httpx.AsyncClient, escenario: Escenario, ctx: dict, solicitudes: int, concurrencia: int
+) -> dict:
+    """Ejecuta `solicitudes` del escenario con `concurrencia` en vuelo."""
+    if escenario.preparar:
+        escenario.preparar(ctx, solicitudes)
+
+    latencias, consultas, codigos = [], [], {}
+    errores = 0
+    pendientes = iter(range(solicitudes))
+
+    async def trabajador():
+        nonlocal errores
+        for _ in pendientes:
+            # El transporte ASGI corre la app en esta tarea: los middlewares
+            # acumulan las consultas de la solicitud en estas estadísticas
+            estadisticas, token = iniciar_estadisticas()
+            inicio = time.perf_counter()
+            try:
+                respuesta = await escenario.ejecutar(cliente, ctx)
+                codigo = str(respuesta.status_code)
+            except httpx.HTTPError as error:
+                codigo = type(error).__name__
+            finally:
+                finalizar_estadisticas(token)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            consultas.append(estadisticas.consultas)
+            codigos[codigo] = codigos.get(codigo, 0) + 1
+            if not codigo.startswith(("2", "3")):
+                errores += 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabajador() for _ in range(concurrencia)))
+    duracion = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        "endpoint": escenario.nombre,
+        "solicitudes": solicitudes,
+        "errores": errores,
+        "codigos": codigos,
+        "p50_ms": round(percentil(latencias, 50), 3),
+        "p95_ms": round(percentil(latencias, 95), 3),
+        "p99_ms": round(percentil(latencias, 99), 3),
+        "solicitudes_por_segundo": round(solicitudes / duracion, 1),
+        "consultas_promedio": round(statistics.fmean(consultas), 2),
+        "consultas_max": max(consultas),
+    }
+
+
+async def ejecutar_suite(tamanos: list, solicitudes: int, concurrencia: int, filtro: str) -> list:
+    """Recorre los escenarios: los listados en cada tamaño y el resto en el mayor."""
+    ctx = {
+        "marca": uuid.uuid4().hex[:8],
+        "secuencia": itertools.count(),
+        "desechables": {},
+        "cabeceras": {},
+    }
+    escenarios = [e for e in ESCENARIOS if not filtro or filtro in e.nombre]
+    resultados = []
+
+    # Las excepciones no manejadas se reportan como 500, igual que con uvicorn
+    transporte = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        login = await cliente.post("/auth/login", json={"username": USUARIO, "password": CLAVE})
+        login.raise_for_status()
+        ctx["cabeceras"] = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        for posicion, tamano in enumerate(sorted(tamanos)):
+            poblar(tamano, ctx["marca"])
+            ctx["ids"] = muestrear_ids()
+            ultimo = posicion == len(tamanos) - 1
+            for escenario in escenarios:
+                if not (escenario.listado or ultimo):
+                    continue
+                resultado = await medir(cliente, escenario, ctx, solicitudes, concurrencia)
+                resultado["tamano"] = tamano
+                resultados.append(resultado)
+                print(
+                    f"  {resultado['endpoint']:<42} {tamano:>8} filas "
+                    f"p95 {resultado['p95_ms']:8.1f} ms  {resultado['consultas_promedio']:5.1f} consultas"
+                    + (f"  ⚠️  {resultado['errores']} errores" if resultado["errores"] else ""),
+                    file=sys.stderr,
+                )
+    return resultados
+
+
+def comparar(base: dict, actual: dict):
+    """Imprime en stderr las diferencias de p95 y consultas contra una ejecución anterior."""
+    anteriores = {(r["endpoint"], r["tamano"]): r for r in base["resultados"]}
+    print(f"\n📊 Comparación con {base.get('commit') or 'la ejecución base'}:", file=sys.stderr)
+    print("=" * 90, file=sys.stderr)
+    for r in actual["resultados"]:
+        previo = anteriores.get((r["endpoint"], r["tamano"]))
+        if not previo or not previo["p95_ms"]:
+            continue
+        cambio = r["p95_ms"] / previo["p95_ms"] - 1
+        marca = "🔺" if cambio > UMBRAL_REGRESION else "🔻" if cambio < -UMBRAL_REGRESION else "  "
+        consultas = r["consultas_promedio"] - previo["consultas_promedio"]
+        print(
+            f"{marca} {r['endpoint']:<42} {r['tamano']:>8} "
+            f"p95 {previo['p95_ms']:8.1f} -> {r['p95_ms']:8.1f} ms ({cambio:+.0%})"
+            + (f"  consultas {consultas:+.1f}" if consultas else ""),
+            file=sys.stderr,
+        )
+    print("=" * 90, file=sys.stderr)
+
+
+def _commit_actual() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanos", default="100,1000,10000",
+                        help="Tamaños de tabla para los listados, separados por comas")
+    parser.add_argument("--solicitudes", type=int, default=200, help="Solicitudes por escenario")
+    parser.add_argument("--concurrencia", type=int, default=8)
+    parser.add_argument("--filtro", default="", help="Solo escenarios cuyo nombre lo contenga")
+    parser.add_argument("--salida", help="Archivo JSON de resultados (por defecto, stdout)")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior para comparar")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    if not run_migrations():
+        raise SystemExit("La migración falló")
+    asegurar_usuario()
+
+    tamanos = [int(t) for t in args.tamanos.split(",")]
+    resultados = asyncio.run(
+        ejecutar_suite(tamanos, args.solicitudes, args.concurrencia, args.filtro)
+    )
+    reporte = {
+        "commit": _commit_actual(),
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "concurrencia": args.concurrencia,
+        "solicitudes": args.solicitudes,
+        "resultados": resultados,
+    }
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(reporte, archivo, indent=2, ensure_ascii=False)
+    else:
+        print(json.dumps(reporte, indent=2, ensure_ascii=False))
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            comparar(json.load(archivo), reporte)
+
+
+if __name__ == "__main__":
+    main()
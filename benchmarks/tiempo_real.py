@@ -0,0 +1,143 @@
+"""
+Mide el reparto de eventos SSE a muchos suscriptores inactivos.
+
+Abre --suscriptores conexiones a GET /cuentas/{id}/stream de un servidor
+en marcha (todas a la misma cuenta, el peor caso para el reparto), espera
+el saldo inicial de cada una y luego confirma --eventos cambios de saldo
+directamente en la base. Para cada evento mide el atraso entre el commit y
+su llegada a cada suscriptor, y reporta los percentiles y los eventos que
+no llegaron. El flujo exige autenticación: se usa el token de --token o
+el que se obtiene con --usuario/--clave.
+
+Uso:
+    python -m benchmarks.tiempo_real --url http://localhost:8000 --usuario admin --clave admin123 --suscriptores 2000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+
+import httpx
+from sqlalchemy import text
+
+from benchmarks.autorizacion_tarjetas import percentil
+from database.connection import SessionLocal
+from database.eventos import notificar_saldos
+
+
+async def suscriptor(cliente: httpx.AsyncClient, id_cuenta: str, conectados: list,
+                     recibidos: list):
+    """Lee un flujo; el primer saldo es el inicial, los demás se registran con su llegada."""
+    async with cliente.stream("GET", f"/cuentas/{id_cuenta}/stream") as respuesta:
+        respuesta.raise_for_status()
+        evento = None
+        inicial = True
+        async for linea in respuesta.aiter_lines():
+            if linea.startswith("event: "):
+                evento = linea[7:]
+            elif linea.startswith("data: ") and evento == "saldo":
+                if inicial:
+                    inicial = False
+                    conectados[0] += 1
+                    continue
+                fecha = json.loads(linea[6:]).get("fecha_actualizacion")
+                if fecha:
+                    recibidos.append((datetime.fromisoformat(fecha), time.time()))
+
+
+def confirmar_saldo(id_cuenta: str) -> tuple:
+    """Toca la cuenta y avisa su saldo; devuelve (marca del evento, instante del commit)."""
+    db = SessionLocal()
+    try:
+        ahora = datetime.utcnow()
+        db.execute(
+            text('UPDATE cuentas SET fecha_actualizacion = :ahora WHERE "idCuenta" = :id'),
+            {"ahora": ahora, "id": id_cuenta},
+        )
+        notificar_saldos(db, [id_cuenta])
+        db.commit()
+        return ahora, time.time()
+    finally:
+        db.close()
+
+
+async def medir(url: str, suscriptores: int, eventos: int, pausa: float, token: str = None,
+                usuario: str = None, clave: str = None) -> dict:
+    limites = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=url, timeout=None, limits=limites) as cliente:
+        if not token and usuario:
+            login = await cliente.post("/auth/login", json={"username": usuario, "password": clave})
+            login.raise_for_status()
+            token = login.json()["access_token"]
+        if token:
+            cliente.headers["authorization"] = f"Bearer {token}"
+        cuentas = (await cliente.get("/cuentas/")).json()
+        id_cuenta = cuentas[0]["idCuenta"]
+
+        conectados = [0]
+        recibidos = []
+        tareas = [
+            asyncio.create_task(suscriptor(cliente, id_cuenta, conectados, recibidos))
+            for _ in range(suscriptores)
+        ]
+        inicio = time.perf_counter()
+        while conectados[0] < suscriptores:
+            if time.perf_counter() - inicio > 120:
+                raise RuntimeError(f"solo {conectados[0]} de {suscriptores} suscriptores conectados")
+            await asyncio.sleep(0.1)
+        conexion_s = time.perf_counter() - inicio
+
+        confirmados = {}
+        for _ in range(eventos):
+            marca, instante = await asyncio.to_thread(confirmar_saldo, id_cuenta)
+            confirmados[marca] = instante
+            await asyncio.sleep(pausa)
+        await asyncio.sleep(2.0)
+
+        for tarea in tareas:
+            tarea.cancel()
+        await asyncio.gather(*tareas, return_exceptions=True)
+
+    atrasos = sorted(
+        (llegada - confirmados[marca]) * 1000 for marca, llegada in recibidos if marca in confirmados
+    )
+    return {
+        "suscriptores": suscriptores,
+        "eventos": eventos,
+        "conexion_s": conexion_s,
+        "perdidos": suscriptores * eventos - len(atrasos),
+        "p50_ms": percentil(atrasos, 50),
+        "p99_ms": percentil(atrasos, 99),
+        "max_ms": atrasos[-1] if atrasos else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", required=True, help="URL base del servidor")
+    parser.add_argument("--suscriptores", type=int, default=1000)
+    parser.add_argument("--eventos", type=int, default=20)
+    parser.add_argument("--pausa", type=float, default=0.25,
+                        help="Segundos entre eventos")
+    parser.add_argument("--token", help="Token JWT de un usuario con acceso a la cuenta")
+    parser.add_argument("--usuario", help="Usuario para obtener un token")
+    parser.add_argument("--clave", help="Contraseña del usuario")
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    r = asyncio.run(medir(args.url, args.suscriptores, args.eventos, args.pausa,
+                          args.token, args.usuario, args.clave))
+    print(f"\n📊 SSE: {r['suscriptores']} suscriptores conectados en {r['conexion_s']:.1f} s, "
+          f"{r['eventos']} eventos")
+    print("=" * 60)
+    print(f"Atraso commit → cliente p50 {r['p50_ms']:.1f} ms | p99 {r['p99_ms']:.1f} ms | "
+          f"máx {r['max_ms']:.1f} ms")
+    print(f"Entregas perdidas: {r['perdidos']}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Compara el rendimiento de servidor.py con 1 worker y con N workers.
+
+Para cada cantidad de workers levanta el servidor en un puerto local, espera
+a que responda, le aplica carga de ciclo cerrado durante --duracion
+segundos y lo detiene con SIGTERM (lo que también ejercita el drenado).
+Mide dos escenarios: GET /tarjetas/ (E/S contra la base) y POST /auth/login,
+dominado por bcrypt y por lo tanto limitado por CPU, que es donde más se
+nota tener un proceso por núcleo.
+
+Uso:
+    python -m benchmarks.trabajadores --workers 1 4 --duracion 20 --concurrencia 64
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.autorizacion_tarjetas import percentil
+from benchmarks.suite import CLAVE, USUARIO, asegurar_usuario
+
+ESCENARIOS = {
+    "GET /tarjetas/": lambda c, token: c.get(
+        "/tarjetas/", headers={"Authorization": f"Bearer {token}"}
+    ),
+    "POST /auth/login": lambda c, token: c.post(
+        "/auth/login", json={"username": USUARIO, "password": CLAVE}
+    ),
+}
+
+
+def levantar(workers: int, puerto: int) -> subprocess.Popen:
+    """Inicia servidor.py y espera a que acepte solicitudes."""
+    proceso = subprocess.Popen(
+        [sys.executable, "servidor.py", "--workers", str(workers),
+         "--bind", f"127.0.0.1:{puerto}", "--sin-migrar"],
+        env={**os.environ, "PLANIFICADOR_ACTIVO": "0"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    limite = time.monotonic() + 60
+    while time.monotonic() < limite:
+        try:
+            if httpx.get(f"http://127.0.0.1:{puerto}/health/ready", timeout=1).status_code == 200:
+                return proceso
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proceso.kill()
+    raise RuntimeError(f"servidor.py con {workers} workers no respondió")
+
+
+def detener(proceso: subprocess.Popen) -> float:
+    """Envía SIGTERM y devuelve cuánto tardó en terminar."""
+    inicio = time.perf_counter()
+    proceso.send_signal(signal.SIGTERM)
+    proceso.wait(timeout=60)
+    return time.perf_counter() - inicio
+
+
+async def cargar(url: str, escenario: str, token: str, duracion: float, concurrencia: int) -> dict:
+    """Carga de ciclo cerrado: cada cliente envía la siguiente al recibir la anterior."""
+    latencias = []
+    errores = 0
+    solicitud = ESCENARIOS[escenario]
+
+    async with httpx.AsyncClient(
+        base_url=url, timeout=30.0, limits=httpx.Limits(max_connections=concurrencia)
+    ) as cliente:
+        fin = time.perf_counter() + duracion
+
+        async def trabajador():
+            nonlocal errores
+            while time.perf_counter() < fin:
+                inicio = time.perf_counter()
+                try:
+                    respuesta = await solicitud(cliente, token)
+                    if respuesta.status_code != 200:
+                        errores += 1
+                except httpx.HTTPError:
+                    errores += 1
+                latencias.append((time.perf_counter() - inicio) * 1000)
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(trabajador() for _ in range(concurrencia)))
+        transcurrido = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        "solicitudes_por_segundo": len(latencias) / transcurrido,
+        "p50_ms": percentil(latencias, 50),
+        "p95_ms": percentil(latencias, 95),
+        "errores": errores,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--duracion", type=float, default=20.0)
+    parser.add_argument("--concurrencia", type=int, default=64)
+    parser.add_argument("--puerto", type=int, default=8765)
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asegurar_usuario()
+    url = f"http://127.0.0.1:{args.puerto}"
+
+    resultados = []
+    for workers in args.workers:
+        print(f"▶️  {workers} workers...")
+        proceso = levantar(workers, args.puerto)
+        try:
+            token = httpx.post(
+                f"{url}/auth/login", json={"username": USUARIO, "password": CLAVE}
+            ).json()["access_token"]
+            for escenario in ESCENARIOS:
+                r = asyncio.run(cargar(url, escenario, token, args.duracion, args.concurrencia))
+                resultados.append({"workers": workers, "escenario": escenario, **r})
+        finally:
+            drenado = detener(proceso)
+        print(f"   detenido con SIGTERM en {drenado:.1f} s")
+
+    print(f"\n📊 Rendimiento por cantidad de workers (concurrencia {args.concurrencia}):")
+    print("=" * 78)
+    print(f"{'Escenario':<20} {'Workers':>8} {'Solic/s':>10} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'Errores':>8} {'Escala':>8}")
+    for escenario in ESCENARIOS:
+        filas = [r for r in resultados if r["escenario"] == escenario]
+        base = filas[0]["solicitudes_por_segundo"]
+        for r in filas:
+            print(
+                f"{escenario:<20} {r['workers']:>8} {r['solicitudes_por_segundo']:>10.1f} "
+                f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['errores']:>8} "
+                f"{r['solicitudes_por_segundo'] / base:>7.2f}x"
+            )
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
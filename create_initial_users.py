@@ -58,14 +58,6 @@ def create_initial_users():
 
         users_to_create = [admin_user, empleado_user, cuenta_user, usuario_user]
 
-        for user_data in users_to_create:
-            try:
-                create_user(db, user_data)
-                print(f"Usuario creado: {user_data.username} ({user_data.rol})")
-            except ValueError as e:
-                print(f"Usuario {user_data.username} ya existe: {e}")
-        users_to_create = [admin_user, empleado_user, cuenta_user, usuario_user]
-
         for user_data in users_to_create:
             try:
                 create_user(db, user_data)
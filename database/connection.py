@@ -1,6 +1,7 @@
 import os
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -17,6 +18,40 @@ engine = create_engine(
     echo=False,
 )
 
+
+
+def url_directa(url: str) -> str:
+    """
+    URL de conexión directa a Postgres, sin pasar por el pooler.
+
+    En Neon el host con "-pooler" es PgBouncer en modo transacción, que
+    puede atender cada transacción con un backend distinto; el host sin
+    ese sufijo llega directo al servidor.
+    """
+    url_parseada = make_url(url)
+    if url_parseada.host and "-pooler." in url_parseada.host:
+        url_parseada = url_parseada.set(host=url_parseada.host.replace("-pooler.", ".", 1))
+    return url_parseada.render_as_string(hide_password=False)
+
+
+# Conexión directa para lo que necesita quedarse en un mismo backend de
+# Postgres más allá de una transacción (LISTEN, advisory locks). No debe
+# apuntar a un pooler en modo transacción: por defecto se deriva de
+# DATABASE_URL quitando "-pooler" del host.
+DATABASE_URL_DIRECTA = os.getenv("DATABASE_URL_DIRECTA") or url_directa(DATABASE_URL)
+
+if DATABASE_URL_DIRECTA == DATABASE_URL:
+    engine_directo = engine
+else:
+    engine_directo = create_engine(
+        DATABASE_URL_DIRECTA,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        pool_size=2,
+        max_overflow=2,
+        echo=False,
+    )
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
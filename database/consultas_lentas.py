@@ -0,0 +1,160 @@
+"""
+Registro de consultas lentas con su plan de ejecución.
+
+Cuando una consulta supera el umbral, el hilo de la solicitud solo encola
+la sentencia y sus parámetros. Un hilo en segundo plano obtiene el plan con
+EXPLAIN (ANALYZE off, FORMAT JSON), que no ejecuta la consulta, y escribe el
+registro en un archivo JSONL. Cada forma de consulta se explica a lo sumo
+una vez por intervalo; las repeticiones intermedias se cuentan en el
+siguiente registro como omitidas.
+
+Los parámetros de texto se reemplazan por REDACTADO, porque pueden tener
+datos personales o credenciales. Los números, fechas e ids se conservan,
+que son los que suelen explicar un cambio de plan.
+
+El hilo se inicia con iniciar() desde cada worker, no al construir el
+registro: con preload_app de gunicorn la aplicación se importa en el
+proceso maestro y los hilos no sobreviven al fork.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Optional
+
+from database.instrumentacion import EstadisticasSQL, forma_consulta
+
+logger = logging.getLogger(__name__)
+
+REDACTADO = "<redactado>"
+SENTENCIAS_EXPLICABLES = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+MAX_HUELLAS = 10_000
+
+
+def _redactar_parametros(parametros):
+    if isinstance(parametros, dict):
+        return {k: _redactar_parametros(v) for k, v in parametros.items()}
+    if isinstance(parametros, (list, tuple)):
+        return [_redactar_parametros(v) for v in parametros]
+    if isinstance(parametros, (str, bytes)):
+        return REDACTADO
+    return parametros
+
+
+def _ruta(estadisticas: Optional[EstadisticasSQL]) -> Optional[str]:
+    """Método y plantilla de la ruta que originó la consulta, si hay solicitud."""
+    alcance = estadisticas.alcance if estadisticas is not None else None
+    if alcance is None:
+        return None
+    ruta = getattr(alcance.get("route"), "path", alcance.get("path"))
+    return f"{alcance.get('method')} {ruta}"
+
+
+class RegistroConsultasLentas:
+    """
+    Detecta consultas lentas y escribe su plan en un archivo JSONL.
+
+    Args:
+        engine: Engine con el que se ejecutan los EXPLAIN
+        archivo: Ruta del archivo JSONL
+        umbral_ms: Duración a partir de la cual una consulta es lenta
+        intervalo: Segundos mínimos entre dos registros de la misma forma
+        capacidad: Consultas lentas pendientes antes de empezar a descartar
+    """
+
+    def __init__(self, engine, archivo: str, umbral_ms: float = 500.0,
+                 intervalo: float = 60.0, capacidad: int = 1000):
+        self.engine = engine
+        self.archivo = archivo
+        self.umbral = umbral_ms / 1000
+        self.intervalo = intervalo
+        self.cola = queue.Queue(maxsize=capacidad)
+        self.descartadas = 0
+        # huella -> [instante del último registro, repeticiones omitidas]
+        self._huellas = {}
+        directorio = os.path.dirname(archivo)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self._hilo = None
+
+    def iniciar(self):
+        """Inicia el hilo que explica y escribe las consultas, si no corre ya en este proceso."""
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._hilo = threading.Thread(target=self._trabajar, name="consultas-lentas", daemon=True)
+        self._hilo.start()
+        logger.info(f"🐢 Registrando consultas de más de {self.umbral * 1000:.0f} ms en {self.archivo}")
+
+    def observar(self, sentencia: str, parametros, duracion: float,
+                 estadisticas: Optional[EstadisticasSQL], error: Optional[str] = None):
+        """
+        Encola una consulta lenta, salvo que su forma se haya registrado hace poco.
+
+        `error` es el mensaje de la excepción si la consulta falló, por
+        ejemplo al cancelarla statement_timeout.
+        """
+        forma = forma_consulta(sentencia)
+        huella = hashlib.sha1(forma.encode()).hexdigest()[:16]
+        ahora = time.monotonic()
+        estado = self._huellas.get(huella)
+        if estado is not None and ahora - estado[0] < self.intervalo:
+            estado[1] += 1
+            return
+        omitidas = estado[1] if estado is not None else 0
+        if len(self._huellas) >= MAX_HUELLAS:
+            self._huellas.clear()
+        self._huellas[huella] = [ahora, 0]
+
+        try:
+            self.cola.put_nowait({
+                "instante": time.time(),
+                "huella": huella,
+                "duracion_ms": round(duracion * 1000, 3),
+                "ruta": _ruta(estadisticas),
+                "omitidas": omitidas,
+                "error": error,
+                "sentencia": sentencia,
+                "parametros": parametros,
+            })
+        except queue.Full:
+            self.descartadas += 1
+
+    def _explicar(self, sentencia: str, parametros):
+        """Plan estimado de la sentencia, sin ejecutarla."""
+        if not sentencia.lstrip().upper().startswith(SENTENCIAS_EXPLICABLES):
+            return None
+        # La conexión DBAPI directa no dispara los eventos del engine, así
+        # que el EXPLAIN no se cuenta ni se vuelve a registrar como lento
+        conexion = self.engine.raw_connection()
+        try:
+            cursor = conexion.cursor()
+            cursor.execute("EXPLAIN (ANALYZE off, FORMAT JSON) " + sentencia, parametros)
+            plan = cursor.fetchone()[0]
+            conexion.rollback()
+            return plan
+        finally:
+            conexion.close()
+
+    def _trabajar(self):
+        with open(self.archivo, "a", encoding="utf-8") as salida:
+            while True:
+                registro = self.cola.get()
+                parametros = registro.pop("parametros")
+                try:
+                    registro["plan"] = self._explicar(registro["sentencia"], parametros)
+                except Exception as e:
+                    registro["plan"] = None
+                    registro["error_plan"] = str(e)
+                registro["parametros"] = _redactar_parametros(parametros)
+
+                logger.warning(
+                    f"🐢 Consulta lenta ({registro['duracion_ms']:.0f} ms) en "
+                    f"{registro['ruta'] or 'segundo plano'}, huella {registro['huella']}"
+                    + (" (falló)" if registro["error"] else "")
+                )
+                salida.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+                salida.flush()
@@ -0,0 +1,82 @@
+"""
+Eventos de cuentas (movimientos y cambios de saldo) por NOTIFY de Postgres.
+
+Quien registra un movimiento o cambia un saldo llama a estas funciones
+dentro de la misma transacción, antes del commit. El aviso se arma en SQL
+a partir de las filas ya escritas, así que lleva los valores que quedaron
+en la base, y Postgres lo entrega a todos los workers solo si la
+transacción confirma. Cada worker lo recibe por el bus de
+database.invalidacion y lo reparte a sus suscriptores (ver src.tiempo_real).
+
+Cada carga es un objeto JSON:
+    {"cuenta": "<idCuenta>", "evento": "transaccion" | "saldo", "datos": {...}}
+
+Postgres rechaza cargas de 8000 bytes o más y ese error aborta la
+transacción de quien notifica, así que los textos libres se recortan a
+LARGO_DESCRIPCION caracteres; quien necesite el texto completo lo lee por
+idTransaccion.
+"""
+
+from typing import Iterable
+
+from sqlalchemy import text
+
+CANAL_CUENTAS = "cuenta_eventos"
+LARGO_DESCRIPCION = 200
+
+# Carga del evento de un movimiento, sobre una fila de transacciones `t`
+EVENTO_TRANSACCION = f"""
+    json_build_object(
+        'cuenta', t."idCuenta",
+        'evento', 'transaccion',
+        'datos', json_build_object(
+            'idTransaccion', t."idTransaccion",
+            'tipo', t.tipo,
+            'monto', t.monto,
+            'descripcion', left(t.descripcion, {LARGO_DESCRIPCION}),
+            'fecha', t.fecha
+        )
+    )::text
+"""
+
+EVENTO_SALDO = """
+    json_build_object(
+        'cuenta', c."idCuenta",
+        'evento', 'saldo',
+        'datos', json_build_object(
+            'saldo', c.saldo,
+            'fecha_actualizacion', c.fecha_actualizacion
+        )
+    )::text
+"""
+
+
+def notificar_transaccion(db, id_transaccion):
+    """Avisa del movimiento `id_transaccion` a los suscriptores de su cuenta."""
+    db.execute(
+        text(
+            f"""
+            SELECT pg_notify(:canal, {EVENTO_TRANSACCION})
+            FROM transacciones AS t
+            WHERE t."idTransaccion" = CAST(:id AS uuid)
+            """
+        ),
+        {"canal": CANAL_CUENTAS, "id": str(id_transaccion)},
+    )
+
+
+def notificar_saldos(db, ids_cuentas: Iterable):
+    """Avisa del saldo actual de cada cuenta, tal como está en la transacción."""
+    ids = [str(i) for i in ids_cuentas]
+    if not ids:
+        return
+    db.execute(
+        text(
+            f"""
+            SELECT pg_notify(:canal, {EVENTO_SALDO})
+            FROM cuentas AS c
+            WHERE c."idCuenta" = ANY(CAST(:ids AS uuid[]))
+            """
+        ),
+        {"canal": CANAL_CUENTAS, "ids": ids},
+    )
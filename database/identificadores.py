@@ -0,0 +1,111 @@
+"""
+Generadores de claves primarias UUID.
+
+uuid4 produce valores aleatorios: cada inserción cae en una hoja distinta
+del índice de la clave primaria, lo que obliga a tener todo el btree en
+caché y provoca divisiones de página a medida que la tabla crece. uuid7
+(RFC 9562) antepone el instante en milisegundos, de modo que los valores
+nuevos se agregan al final del índice como con una secuencia, pero sin
+perder la generación descentralizada de UUID.
+
+El generador de las tablas con muchas inserciones se elige con la variable
+de entorno GENERADOR_PK (uuid7 por defecto) o con configurar_generador_pk.
+"""
+
+import os
+import threading
+import time
+import uuid
+from typing import Callable
+
+_lock = threading.Lock()
+_ultimo_ms = 0
+_contador = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Genera un UUID versión 7 ordenado por tiempo.
+
+    Los 48 bits altos son el instante Unix en milisegundos. Dentro del mismo
+    milisegundo los 12 bits de rand_a funcionan como contador, así que los
+    valores generados por un proceso son estrictamente crecientes.
+
+    Returns:
+        uuid.UUID: Identificador versión 7
+    """
+    global _ultimo_ms, _contador
+
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _ultimo_ms:
+            _ultimo_ms = ms
+            _contador = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            _contador += 1
+            if _contador > 0xFFF:
+                # Contador agotado: se toma prestado el milisegundo siguiente
+                _ultimo_ms += 1
+                _contador = 0
+        ms, contador = _ultimo_ms, _contador
+
+    aleatorio = int.from_bytes(os.urandom(8), "big") & 0x3FFFFFFFFFFFFFFF
+    return uuid7_desde(ms, contador << 62 | aleatorio)
+
+
+def uuid7_desde(ms: int, aleatorio: int) -> uuid.UUID:
+    """
+    Arma un UUID versión 7 a partir del instante y los bits aleatorios dados.
+
+    Permite generar claves reproducibles (por ejemplo, con un random.Random
+    con semilla) que conservan el orden por tiempo.
+
+    Args:
+        ms: Instante Unix en milisegundos
+        aleatorio: 74 bits para rand_a (12 altos) y rand_b (62 bajos)
+
+    Returns:
+        uuid.UUID: Identificador versión 7
+    """
+    valor = (
+        (ms & 0xFFFFFFFFFFFF) << 80
+        | 0x7 << 76
+        | (aleatorio >> 62 & 0xFFF) << 64
+        | 0b10 << 62
+        | aleatorio & 0x3FFFFFFFFFFFFFFF
+    )
+    return uuid.UUID(int=valor)
+
+
+GENERADORES = {
+    "uuid4": uuid.uuid4,
+    "uuid7": uuid7,
+}
+
+_generador: Callable[[], uuid.UUID] = GENERADORES[os.getenv("GENERADOR_PK", "uuid7")]
+
+
+def configurar_generador_pk(nombre: str):
+    """
+    Cambia el generador usado por generar_pk.
+
+    Args:
+        nombre: Clave en GENERADORES ("uuid4" o "uuid7")
+    """
+    global _generador
+    if nombre not in GENERADORES:
+        raise ValueError(f"Generador de claves desconocido: {nombre}")
+    _generador = GENERADORES[nombre]
+
+
+def generar_pk() -> uuid.UUID:
+    """
+    Genera una clave primaria con el generador configurado.
+
+    Se usa como default de las columnas en lugar de referenciar el
+    generador directamente, para que pueda cambiarse en tiempo de ejecución.
+
+    Returns:
+        uuid.UUID: Nueva clave primaria
+    """
+    return _generador()
@@ -0,0 +1,159 @@
+"""
+Instrumentación de las consultas SQL por solicitud.
+
+Los eventos del engine suman la cantidad y la duración de las consultas en
+un objeto EstadisticasSQL guardado en una ContextVar. El middleware que
+atiende la solicitud crea ese objeto; los endpoints síncronos corren en el
+threadpool con una copia del contexto que apunta al mismo objeto, así que
+las consultas hechas desde cualquier hilo se atribuyen a su solicitud.
+
+Además se cuenta cuántas veces se repite cada forma de consulta (el SQL
+con los parámetros y literales reemplazados por ?), que es lo que delata
+un patrón N+1: la misma consulta ejecutada una vez por cada fila. Si se
+configura un RegistroConsultasLentas, las consultas que superan su umbral se
+le entregan para registrar su plan.
+
+Las consultas que fallan (por ejemplo, canceladas por statement_timeout)
+no pasan por after_cursor_execute: se miden en handle_error, que además
+descarta su instante de inicio, y llegan al registro de lentas con el
+error.
+"""
+
+import re
+import time
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+
+MAX_FORMAS_EN_CACHE = 2000
+
+_PARAMETROS = re.compile(r"%\(\w+\)s(?:\s*,\s*%\(\w+\)s)*|\$\d+|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_ESPACIOS = re.compile(r"\s+")
+_formas = {}
+
+
+def forma_consulta(sentencia: str) -> str:
+    """
+    Normaliza una sentencia para agrupar las que solo difieren en sus valores.
+
+    Las listas de parámetros de un IN se colapsan en un solo ?, así que
+    consultas con distinta cantidad de ids comparten forma.
+    """
+    forma = _formas.get(sentencia)
+    if forma is None:
+        forma = _ESPACIOS.sub(" ", _PARAMETROS.sub("?", sentencia)).strip()
+        if len(_formas) >= MAX_FORMAS_EN_CACHE:
+            _formas.clear()
+        _formas[sentencia] = forma
+    return forma
+
+
+class EstadisticasSQL:
+    """Consultas ejecutadas durante una solicitud, su duración y sus formas."""
+
+    __slots__ = ("consultas", "segundos", "formas", "alcance")
+
+    def __init__(self, alcance: Optional[dict] = None):
+        # El scope ASGI de la solicitud; el router le agrega la ruta después
+        self.alcance = alcance
+        self.consultas = 0
+        self.segundos = 0.0
+        # forma -> [ejecuciones, segundos]
+        self.formas = {}
+
+    def repetidas(self, umbral: int) -> List[Tuple[str, int, float]]:
+        """
+        Formas ejecutadas más de `umbral` veces, de la más repetida a la menos.
+
+        Returns:
+            list: Tuplas (forma, ejecuciones, segundos)
+        """
+        return sorted(
+            ((forma, n, segundos) for forma, (n, segundos) in self.formas.items() if n > umbral),
+            key=lambda f: f[1],
+            reverse=True,
+        )
+
+
+_estadisticas: ContextVar[Optional[EstadisticasSQL]] = ContextVar(
+    "estadisticas_sql", default=None
+)
+
+
+_consultas_lentas = None
+
+
+def iniciar_estadisticas(alcance: Optional[dict] = None):
+    """
+    Empieza a acumular las consultas del contexto actual.
+
+    Args:
+        alcance: Scope ASGI de la solicitud, para atribuirle las consultas
+
+    Returns:
+        tuple: Estadísticas nuevas y el token para restaurar el contexto
+    """
+    estadisticas = EstadisticasSQL(alcance)
+    return estadisticas, _estadisticas.set(estadisticas)
+
+
+def finalizar_estadisticas(token):
+    """Deja de acumular consultas en el contexto actual."""
+    _estadisticas.reset(token)
+
+
+def estadisticas_actuales() -> Optional[EstadisticasSQL]:
+    """Estadísticas de la solicitud en curso, si hay alguna."""
+    return _estadisticas.get()
+
+
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("inicio_consulta", []).append(time.perf_counter())
+
+
+def _medir(statement, parameters, duracion: float, executemany: bool, error=None):
+    estadisticas = _estadisticas.get()
+    if estadisticas is not None:
+        estadisticas.consultas += 1
+        estadisticas.segundos += duracion
+        forma = estadisticas.formas.setdefault(forma_consulta(statement), [0, 0.0])
+        forma[0] += 1
+        forma[1] += duracion
+    if (_consultas_lentas is not None and duracion >= _consultas_lentas.umbral
+            and not executemany):
+        _consultas_lentas.observar(statement, parameters, duracion, estadisticas, error)
+
+
+def _despues(conn, cursor, statement, parameters, context, executemany):
+    duracion = time.perf_counter() - conn.info["inicio_consulta"].pop()
+    _medir(statement, parameters, duracion, executemany)
+
+
+def _al_fallar(contexto):
+    # Solo los errores de la ejecución tienen su inicio registrado en _antes
+    conn = contexto.connection
+    ejecucion = contexto.execution_context
+    if conn is None or ejecucion is None or not conn.info.get("inicio_consulta"):
+        return
+    duracion = time.perf_counter() - conn.info["inicio_consulta"].pop()
+    _medir(contexto.statement, contexto.parameters, duracion, ejecucion.executemany,
+           str(contexto.original_exception).strip())
+
+
+def instrumentar(engine, consultas_lentas=None):
+    """
+    Registra los eventos de medición en el engine.
+
+    Args:
+        engine: Engine de SQLAlchemy
+        consultas_lentas: RegistroConsultasLentas opcional para las consultas
+            que superan su umbral
+    """
+    global _consultas_lentas
+    if consultas_lentas is not None:
+        _consultas_lentas = consultas_lentas
+    if not event.contains(engine, "before_cursor_execute", _antes):
+        event.listen(engine, "before_cursor_execute", _antes)
+        event.listen(engine, "after_cursor_execute", _despues)
+        event.listen(engine, "handle_error", _al_fallar)
@@ -0,0 +1,206 @@
+"""
+Bus de invalidación de cachés entre workers con LISTEN/NOTIFY de Postgres.
+
+Quien modifica una entidad cacheable llama a publicar() dentro de la misma
+transacción. Eso ejecuta pg_notify('cache_invalidate', '<entidad>:<id>'),
+que Postgres entrega solo si la transacción confirma. Cada worker mantiene
+un hilo con una conexión propia en LISTEN y, por cada aviso, llama a las
+funciones suscritas para esa entidad, que desalojan la entrada local.
+
+El worker que hizo el cambio además desaloja apenas confirma la sesión,
+sin esperar el aviso, para que una lectura inmediata después de su propia
+escritura nunca vea el valor viejo.
+
+Si la conexión de escucha se corta, los avisos de ese intervalo se pierden:
+al reconectar se desaloja todo ("<entidad>:*") para no servir datos viejos.
+
+La misma conexión puede escuchar otros canales (escuchar()), para que cada
+worker mantenga una sola conexión en LISTEN.
+
+LISTEN necesita una sesión fija en un mismo backend, así que la escucha se
+abre sobre DATABASE_URL_DIRECTA y nunca sobre un pooler en modo
+transacción (como el host "-pooler" de Neon): a través de él los avisos
+pueden dejar de llegar sin ningún error. pg_notify() sí puede ejecutarse
+por el pooler, dentro de la transacción que hace el cambio.
+"""
+
+import logging
+import select
+import threading
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from database.connection import engine_directo
+
+logger = logging.getLogger(__name__)
+
+CANAL = "cache_invalidate"
+TODO = "*"
+
+
+def normalizar_clave(clave) -> str:
+    """
+    Texto canónico de un id, igual para quien publica y quien cachea.
+
+    Los UUID se escriben en minúsculas con guiones aunque lleguen como
+    texto con otro formato; cualquier otro valor se convierte con str().
+    """
+    if isinstance(clave, uuid.UUID):
+        return str(clave)
+    try:
+        return str(uuid.UUID(str(clave)))
+    except ValueError:
+        return str(clave)
+
+
+class BusInvalidacion:
+    """
+    Recibe los avisos de invalidación y los reparte a los suscriptores locales.
+
+    Args:
+        engine: Engine con conexión directa (sin pooler) para la escucha
+        canal: Canal de LISTEN/NOTIFY
+    """
+
+    def __init__(self, engine, canal: str = CANAL):
+        self.engine = engine
+        self.canal = canal
+        self.recibidas = 0
+        self.reconexiones = 0
+        self._suscriptores: Dict[str, List[Callable[[str], None]]] = defaultdict(list)
+        self._canales: Dict[str, Callable[[str], None]] = {canal: self._procesar}
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def suscribir(self, entidad: str, funcion: Callable[[str], None]):
+        """
+        Registra una función que recibe la clave invalidada de `entidad`.
+
+        La clave es el id como texto, o TODO si hay que desalojar todo.
+        """
+        self._suscriptores[entidad].append(funcion)
+
+    def escuchar(self, canal: str, funcion: Callable[[str], None]):
+        """
+        Escucha además `canal` y pasa la carga de cada aviso a `funcion`.
+
+        Debe llamarse antes de iniciar(). La función corre en el hilo de
+        escucha, así que no debe bloquear.
+        """
+        self._canales[canal] = funcion
+
+    def desalojar(self, entidad: str, clave: str):
+        """Aplica una invalidación en este proceso."""
+        for funcion in self._suscriptores.get(entidad, ()):
+            try:
+                funcion(clave)
+            except Exception as e:
+                logger.error(f"❌ Error desalojando {entidad}:{clave}: {e}")
+
+    def desalojar_todo(self):
+        for entidad in list(self._suscriptores):
+            self.desalojar(entidad, TODO)
+
+    def _procesar(self, carga: str):
+        entidad, _, clave = carga.partition(":")
+        self.recibidas += 1
+        self.desalojar(entidad, clave or TODO)
+
+    def _despachar(self, canal: str, carga: str):
+        funcion = self._canales.get(canal)
+        if funcion is None:
+            return
+        try:
+            funcion(carga)
+        except Exception as e:
+            logger.error(f"❌ Error procesando un aviso de {canal}: {e}")
+
+    def _conectar(self):
+        # Conexión DBAPI propia, fuera del pool: queda tomada mientras viva el worker
+        argumentos, opciones = self.engine.dialect.create_connect_args(self.engine.url)
+        conexion = self.engine.dialect.connect(*argumentos, **opciones)
+        conexion.autocommit = True
+        cursor = conexion.cursor()
+        for canal in self._canales:
+            cursor.execute(f"LISTEN {canal}")
+        return conexion
+
+    def _escuchar(self):
+        espera = 1.0
+        while not self._detener.is_set():
+            conexion = None
+            try:
+                conexion = self._conectar()
+                # Lo que cambió mientras no se escuchaba no se va a avisar
+                self.desalojar_todo()
+                espera = 1.0
+                while not self._detener.is_set():
+                    if select.select([conexion], [], [], 1.0)[0]:
+                        conexion.poll()
+                        while conexion.notifies:
+                            aviso = conexion.notifies.pop(0)
+                            self._despachar(aviso.channel, aviso.payload)
+            except Exception as e:
+                self.reconexiones += 1
+                logger.warning(f"⚠️  Escucha de invalidaciones interrumpida: {e}")
+                self._detener.wait(espera)
+                espera = min(espera * 2, 30.0)
+            finally:
+                if conexion is not None:
+                    conexion.close()
+
+    def iniciar(self):
+        """Inicia el hilo de escucha."""
+        if self._hilo is not None:
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._escuchar, name="invalidacion", daemon=True)
+        self._hilo.start()
+        logger.info(f"📡 Escuchando invalidaciones en el canal {self.canal}")
+
+    def detener(self):
+        """Detiene el hilo de escucha y espera a que termine."""
+        if self._hilo is None:
+            return
+        self._detener.set()
+        self._hilo.join()
+        self._hilo = None
+
+
+bus_invalidacion = BusInvalidacion(engine_directo)
+
+
+def publicar(db, entidad: str, clave=TODO):
+    """
+    Avisa a todos los workers que `entidad`/`clave` cambió.
+
+    Debe llamarse dentro de la transacción que hace el cambio, antes del
+    commit: Postgres entrega el aviso solo si la transacción confirma.
+
+    Args:
+        db: Sesión o conexión de la transacción
+        entidad: Nombre de la entidad (por ejemplo, "cuentas")
+        clave: Id de la fila, o TODO para toda la entidad
+    """
+    clave = clave if clave == TODO else normalizar_clave(clave)
+    db.execute(
+        text("SELECT pg_notify(:canal, :carga)"),
+        {"canal": bus_invalidacion.canal, "carga": f"{entidad}:{clave}"},
+    )
+    if isinstance(db, Session):
+        db.info.setdefault("invalidaciones", set()).add((entidad, clave))
+
+
+@event.listens_for(Session, "after_commit")
+def _desalojar_al_confirmar(session):
+    for entidad, clave in session.info.pop("invalidaciones", ()):
+        bus_invalidacion.desalojar(entidad, clave)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_al_revertir(session):
+    session.info.pop("invalidaciones", None)
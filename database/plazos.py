@@ -0,0 +1,87 @@
+"""
+Plazo de la solicitud en curso, propagado hasta Postgres.
+
+El middleware de plazos guarda en una ContextVar el instante en que vence
+la solicitud. Antes de cada sentencia se fija statement_timeout con el
+tiempo que queda (set_config local, así que vuelve al valor del servidor
+al terminar la transacción y no contamina el pool); fijarlo una sola vez
+al abrir la transacción dejaría a cada sentencia siguiente el plazo
+completo, aunque las anteriores ya hubieran consumido parte. Una consulta
+que se pasa del plazo la cancela el propio Postgres, que libera la
+conexión aunque el cliente ya haya recibido el 504.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+# Por debajo de esto no tiene sentido empezar una transacción
+MINIMO_MS = 10
+
+_vencimiento: ContextVar[Optional[float]] = ContextVar("vencimiento_solicitud", default=None)
+
+
+class PlazoVencido(Exception):
+    """La solicitud agotó su plazo antes de ejecutar una sentencia."""
+
+
+def fijar_plazo(segundos: float):
+    """
+    Fija el plazo del contexto actual a `segundos` desde ahora.
+
+    Returns:
+        Token para restaurar el plazo anterior
+    """
+    return _vencimiento.set(time.monotonic() + segundos)
+
+
+def restablecer_plazo(token):
+    """Restaura el plazo que había antes de fijar_plazo."""
+    _vencimiento.reset(token)
+
+
+def tiempo_restante() -> Optional[float]:
+    """Segundos que le quedan a la solicitud en curso, o None si no tiene plazo."""
+    vencimiento = _vencimiento.get()
+    if vencimiento is None:
+        return None
+    return vencimiento - time.monotonic()
+
+
+def _milisegundos_restantes() -> Optional[int]:
+    restante = tiempo_restante()
+    if restante is None:
+        return None
+    milisegundos = int(restante * 1000)
+    if milisegundos < MINIMO_MS:
+        raise PlazoVencido("la solicitud agotó su plazo")
+    return milisegundos
+
+
+def _al_iniciar_transaccion(session, transaction, connection):
+    # Corta antes de empezar a trabajar si el plazo ya no alcanza
+    _milisegundos_restantes()
+
+
+def _antes_de_sentencia(conn, cursor, statement, parameters, context, executemany):
+    milisegundos = _milisegundos_restantes()
+    if milisegundos is not None:
+        cursor.execute(
+            "SELECT set_config('statement_timeout', %s, true)", (f"{milisegundos}ms",)
+        )
+
+
+def aplicar_plazos(fabrica_sesiones, engine):
+    """
+    Registra los eventos que aplican el plazo de la solicitud.
+
+    Las sesiones de la fábrica fallan con PlazoVencido al abrir una
+    transacción sin plazo suficiente, y cada sentencia del engine fija
+    statement_timeout con el tiempo que le queda a la solicitud.
+    """
+    if not event.contains(fabrica_sesiones, "after_begin", _al_iniciar_transaccion):
+        event.listen(fabrica_sesiones, "after_begin", _al_iniciar_transaccion)
+    if not event.contains(engine, "before_cursor_execute", _antes_de_sentencia):
+        event.listen(engine, "before_cursor_execute", _antes_de_sentencia)
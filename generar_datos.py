@@ -0,0 +1,359 @@
+"""
+Script para generar un conjunto de datos sintético de gran volumen.
+
+Crea empleados, clientes y, para cada cliente, cuentas, tarjetas, préstamos,
+cheques e historiales de transacciones coherentes entre sí: el saldo de cada
+cuenta es el resultado de su historial y el de las tarjetas débito coincide
+con el de la cuenta. La actividad se reparte con una distribución de Pareto,
+así que unas pocas cuentas concentran la mayoría de las transacciones, como
+en producción.
+
+El trabajo se divide en particiones de clientes que se generan en procesos
+paralelos y se cargan con COPY. Cada partición usa su propio generador
+aleatorio derivado de la semilla, de modo que la misma semilla y la misma
+fecha producen exactamente los mismos datos sin importar cuántos procesos
+se usen.
+
+Uso:
+    python generar_datos.py --clientes 1000000 --transacciones 10000000 --semilla 42
+"""
+
+import argparse
+import io
+import math
+import os
+import random
+import time
+import uuid
+from datetime import date, datetime, time as hora, timedelta
+from multiprocessing import Pool
+
+from sqlalchemy import text
+
+from database.connection import engine
+from database.identificadores import uuid7_desde
+from src.controller.prestamos import sumar_meses
+from src.migrations import run_migrations
+
+CLIENTES_POR_PARTICION = 2000
+TRANSACCIONES_POR_PARTICION = 200_000
+# alfa = 1.16 reproduce la regla 80/20
+ALFA_PARETO = 1.16
+
+TABLAS = ["empleados", "clientes", "cuentas", "tarjetas", "prestamos", "cheques", "transacciones"]
+
+COLUMNAS = {
+    "empleados": '("idEmpleado", nombre, apellido, documento, cargo, email, telefono, activo, '
+                 "fecha_creacion)",
+    "clientes": '("idCliente", nombre, apellido, documento, direccion, telefono, email, '
+                '"fechaNacimiento", fecha_creacion)',
+    "cuentas": '("idCuenta", "idCliente", "numeroCuenta", "tipoCuenta", estado, saldo, '
+               "fecha_creacion)",
+    "tarjetas": '("idTarjeta", "idCuenta", "numeroTarjeta", tipo, "limiteCredito", '
+                '"saldoDisponible", estado, "fechaExpiracion", fecha_creacion)',
+    "prestamos": '("idPrestamo", "idCliente", "idEmpleado", monto, interes, "plazoMeses", estado, '
+                 '"fechaVencimiento", fecha_creacion)',
+    "cheques": '("idCheque", "idCliente", "idCuenta", "fechaEmision", "fechaCobro", monto, motivo, '
+               "estado, fecha_creacion)",
+    "transacciones": '("idTransaccion", "idCuenta", tipo, monto, descripcion, fecha, '
+                     "fecha_creacion)",
+}
+
+NOMBRES = [
+    "Juan", "María", "Carlos", "Ana", "Luis", "Laura", "Andrés", "Camila", "Jorge",
+    "Valentina", "Santiago", "Daniela", "Felipe", "Paula", "Diego", "Natalia",
+    "Sebastián", "Sofía", "Alejandro", "Mariana", "Julián", "Isabela",
+]
+APELLIDOS = [
+    "García", "Rodríguez", "Martínez", "López", "González", "Pérez", "Gómez", "Sánchez",
+    "Ramírez", "Torres", "Díaz", "Vargas", "Rojas", "Moreno", "Jiménez", "Castro",
+    "Ortiz", "Morales", "Herrera", "Restrepo", "Cardona", "Ospina", "Giraldo", "Mejía",
+]
+CARGOS = ["Cajero", "Asesor", "Gerente"]
+# Tipo, peso y si debita la cuenta
+TIPOS_TRANSACCION = [("deposito", 35, False), ("retiro", 25, True),
+                     ("compra", 25, True), ("transferencia", 15, True)]
+
+
+def _uuid4(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _fila(*valores) -> str:
+    """Línea en formato de texto de COPY; None se escribe como NULL."""
+    return "\t".join("\\N" if v is None else str(v) for v in valores) + "\n"
+
+
+def _copiar(cursor, tabla: str, buffer: io.StringIO):
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {tabla} {COLUMNAS[tabla]} FROM STDIN", buffer)
+
+
+def _instante(rng: random.Random, desde: datetime, hasta: datetime) -> datetime:
+    return desde + timedelta(seconds=rng.random() * (hasta - desde).total_seconds())
+
+
+def generar_empleados(semilla: int, cantidad: int, inicio: datetime) -> list:
+    """Carga los empleados y devuelve sus ids para asignar préstamos."""
+    rng = random.Random(f"{semilla}:empleados")
+    buffer = io.StringIO()
+    ids = []
+    for i in range(cantidad):
+        id_empleado = _uuid4(rng)
+        ids.append(id_empleado)
+        buffer.write(_fila(
+            id_empleado, rng.choice(NOMBRES), rng.choice(APELLIDOS), f"E{80_000_000 + i}",
+            rng.choices(CARGOS, weights=[60, 30, 10])[0], f"empleado{i}@banco.com",
+            f"60{rng.randint(10_000_000, 99_999_999)}", "t", inicio,
+        ))
+
+    conn = engine.raw_connection()
+    try:
+        _copiar(conn.cursor(), "empleados", buffer)
+        conn.commit()
+    finally:
+        conn.close()
+    return ids
+
+
+def _historial(rng: random.Random, cantidad: int, desde: datetime, hasta: datetime,
+               id_cuenta, transacciones: io.StringIO) -> float:
+    """
+    Escribe el historial de una cuenta en orden cronológico.
+
+    Returns:
+        float: Saldo final, que pasa a ser el saldo de la cuenta
+    """
+    saldo = 0.0
+    instantes = sorted(_instante(rng, desde, hasta) for _ in range(cantidad))
+    for n, instante in enumerate(instantes):
+        tipo, _, debito = rng.choices(TIPOS_TRANSACCION, weights=[t[1] for t in TIPOS_TRANSACCION])[0]
+        if n == 0 or (debito and saldo < 10_000):
+            tipo, debito = "deposito", False
+        if debito:
+            monto = round(min(rng.lognormvariate(10.5, 1.2), saldo), 2)
+            saldo -= monto
+        else:
+            monto = round(rng.lognormvariate(12, 1.0), 2)
+            saldo += monto
+        id_transaccion = uuid7_desde(int(instante.timestamp() * 1000), rng.getrandbits(74))
+        transacciones.write(_fila(
+            id_transaccion, id_cuenta, tipo, f"{monto:.2f}", f"{tipo.capitalize()} {n + 1}",
+            instante, instante,
+        ))
+    return saldo
+
+
+def generar_particion(args) -> dict:
+    """
+    Genera y carga una partición de clientes con todos sus datos asociados.
+    """
+    semilla, particion, primer_cliente, ultimo_cliente, transacciones, empleados, inicio, fin = args
+    rng = random.Random(f"{semilla}:{particion}")
+    buffers = {tabla: io.StringIO() for tabla in TABLAS[1:]}
+    conteos = dict.fromkeys(TABLAS[1:], 0)
+    comienzo = time.perf_counter()
+
+    cuentas = []
+    for i in range(primer_cliente, ultimo_cliente):
+        id_cliente = _uuid4(rng)
+        alta = _instante(rng, inicio - timedelta(days=3 * 365), inicio)
+        buffers["clientes"].write(_fila(
+            id_cliente, rng.choice(NOMBRES), f"{rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}",
+            f"{10_000_000 + i}", f"Calle {rng.randint(1, 200)} # {rng.randint(1, 99)}-{rng.randint(1, 99)}",
+            f"3{rng.randint(100_000_000, 999_999_999)}", f"cliente{i}@correo.com",
+            date(rng.randint(1950, 2005), rng.randint(1, 12), rng.randint(1, 28)), alta,
+        ))
+        conteos["clientes"] += 1
+
+        for k in range(rng.choices([1, 2, 3], weights=[60, 30, 10])[0]):
+            cuentas.append((i, k, id_cliente, _uuid4(rng), alta, rng.paretovariate(ALFA_PARETO)))
+
+        if rng.random() < 0.3:
+            plazo = rng.choice([12, 24, 36, 48, 60])
+            desembolso = _instante(rng, alta, fin)
+            vencimiento = sumar_meses(desembolso, plazo)
+            if vencimiento >= fin:
+                estado = "pendiente"
+            else:
+                estado = rng.choices(["pagado", "vencido"], weights=[85, 15])[0]
+            buffers["prestamos"].write(_fila(
+                _uuid4(rng), id_cliente, rng.choice(empleados),
+                rng.choice([2_000_000, 5_000_000, 10_000_000, 30_000_000]),
+                round(rng.uniform(1.0, 2.5), 2), plazo, estado, vencimiento, desembolso,
+            ))
+            conteos["prestamos"] += 1
+
+    # Reparto de las transacciones de la partición según el peso de cada cuenta
+    pesos = [c[5] for c in cuentas]
+    total_pesos = sum(pesos)
+    por_cuenta = [int(transacciones * p / total_pesos) for p in pesos]
+    for posicion in rng.choices(range(len(cuentas)), weights=pesos, k=transacciones - sum(por_cuenta)):
+        por_cuenta[posicion] += 1
+
+    for (i, k, id_cliente, id_cuenta, alta, _), cantidad in zip(cuentas, por_cuenta):
+        saldo = _historial(rng, cantidad, max(alta, fin - timedelta(days=365)), fin, id_cuenta,
+                           buffers["transacciones"])
+        conteos["transacciones"] += cantidad
+        estado_cuenta = rng.choices(["Activa", "Inactiva"], weights=[97, 3])[0]
+
+        # Un cheque vencido se cobra como lo haría la compensación: solo de
+        # cuentas activas con saldo, con su transacción de débito
+        for _ in range(rng.choices([0, 1, 2, 3], weights=[50, 30, 15, 5])[0]):
+            id_cheque = _uuid4(rng)
+            emision = _instante(rng, max(alta, fin - timedelta(days=365)), fin)
+            cobro = (emision + timedelta(days=rng.randint(0, 30))).date()
+            monto = round(rng.lognormvariate(12, 1.0), 2)
+            if cobro >= fin.date():
+                estado = "pendiente"
+            elif estado_cuenta == "Activa" and monto <= saldo:
+                estado = "cobrado"
+                saldo -= monto
+                instante = datetime.combine(cobro, emision.time())
+                buffers["transacciones"].write(_fila(
+                    uuid7_desde(int(instante.timestamp() * 1000), rng.getrandbits(74)),
+                    id_cuenta, "cheque", f"{monto:.2f}", f"Cobro de cheque {id_cheque}",
+                    instante, instante,
+                ))
+                conteos["transacciones"] += 1
+            else:
+                estado = "rechazado"
+            buffers["cheques"].write(_fila(
+                id_cheque, id_cliente, id_cuenta, emision, cobro, f"{monto:.2f}",
+                "Pago a terceros", estado, emision,
+            ))
+            conteos["cheques"] += 1
+
+        buffers["cuentas"].write(_fila(
+            id_cuenta, id_cliente, f"{i:09d}{k}", rng.choice(["Ahorros", "Corriente"]),
+            estado_cuenta, f"{saldo:.2f}", alta,
+        ))
+        conteos["cuentas"] += 1
+
+        for j in range(rng.choices([0, 1, 2], weights=[30, 55, 15])[0]):
+            tipo = rng.choice(["Débito", "Crédito"])
+            limite = rng.choice([2_000_000, 5_000_000, 10_000_000]) if tipo == "Crédito" else 0
+            expiracion = fin + timedelta(days=rng.randint(-180, 5 * 365))
+            if expiracion < fin:
+                estado = "Vencida"
+            else:
+                estado = rng.choices(["Activa", "Bloqueada"], weights=[95, 5])[0]
+            buffers["tarjetas"].write(_fila(
+                _uuid4(rng), id_cuenta, f"4{i:013d}{k}{j}", tipo, limite,
+                limite if tipo == "Crédito" else round(saldo, 2), estado, expiracion, alta,
+            ))
+            conteos["tarjetas"] += 1
+
+
+    generacion = time.perf_counter() - comienzo
+
+    # Cada proceso debe abrir sus propias conexiones
+    engine.dispose(close=False)
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        for tabla in TABLAS[1:]:
+            _copiar(cursor, tabla, buffers[tabla])
+        conn.commit()
+    finally:
+        conn.close()
+
+    conteos["generacion"] = generacion
+    conteos["carga"] = time.perf_counter() - comienzo - generacion
+    return conteos
+
+
+def generar_datos(clientes: int, transacciones: int, empleados: int, trabajadores: int,
+                  semilla: int, hasta: date, limpiar: bool):
+    """
+    Genera y carga el conjunto de datos completo.
+    """
+    if not run_migrations():
+        raise SystemExit("❌ La migración falló")
+
+    with engine.begin() as conn:
+        if limpiar:
+            print("🗑️  Vaciando tablas...")
+            conn.execute(text(f"TRUNCATE {', '.join(TABLAS)} CASCADE"))
+        elif conn.execute(text("SELECT EXISTS (SELECT 1 FROM clientes)")).scalar():
+            raise SystemExit("❌ La tabla clientes no está vacía; use --limpiar para reemplazar los datos")
+
+    fin = datetime.combine(hasta, hora())
+    inicio = fin - timedelta(days=365)
+    particiones = max(
+        math.ceil(clientes / CLIENTES_POR_PARTICION),
+        math.ceil(transacciones / TRANSACCIONES_POR_PARTICION),
+    )
+
+    print(f"🌱 Semilla {semilla}, fecha {hasta} (repetir con --semilla {semilla} --hasta {hasta})")
+    print(f"🔄 {clientes:,} clientes y {transacciones:,} transacciones en {particiones} "
+          f"particiones con {trabajadores} proceso(s)...")
+    comienzo = time.perf_counter()
+
+    ids_empleados = generar_empleados(semilla, empleados, inicio)
+    tareas = [
+        (
+            semilla,
+            p,
+            p * clientes // particiones,
+            (p + 1) * clientes // particiones,
+            (p + 1) * transacciones // particiones - p * transacciones // particiones,
+            ids_empleados,
+            inicio,
+            fin,
+        )
+        for p in range(particiones)
+    ]
+
+    totales = dict.fromkeys(TABLAS[1:] + ["generacion", "carga"], 0)
+    with Pool(trabajadores) as pool:
+        for n, conteos in enumerate(pool.imap_unordered(generar_particion, tareas), start=1):
+            for clave, valor in conteos.items():
+                totales[clave] += valor
+            print(f"  Partición {n}/{particiones} ({totales['transacciones']:,} transacciones)",
+                  end="\r")
+    print()
+
+    segundos = time.perf_counter() - comienzo
+    with engine.begin() as conn:
+        conn.execute(text(f"ANALYZE {', '.join(TABLAS)}"))
+
+    print("\n📊 Datos generados:")
+    print("=" * 50)
+    print(f"{'empleados':<15} {empleados:>12,}")
+    for tabla in TABLAS[1:]:
+        print(f"{tabla:<15} {totales[tabla]:>12,}")
+    print("=" * 50)
+    print(f"Duración:    {segundos:.1f} s "
+          f"(generación {totales['generacion']:.0f} s, carga {totales['carga']:.0f} s en total)")
+    print(f"Ritmo:       {totales['transacciones'] / segundos:,.0f} transacciones/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generación de datos sintéticos")
+    parser.add_argument("--clientes", type=int, default=100_000)
+    parser.add_argument("--transacciones", type=int, default=10_000_000)
+    parser.add_argument("--empleados", type=int, default=None,
+                        help="Por defecto, uno por cada 1000 clientes (mínimo 10)")
+    parser.add_argument("--trabajadores", type=int, default=os.cpu_count(),
+                        help="Procesos en paralelo")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument(
+        "--hasta",
+        type=date.fromisoformat,
+        default=date.today(),
+        help="Fecha final de los historiales (YYYY-MM-DD), por defecto hoy",
+    )
+    parser.add_argument("--limpiar", action="store_true",
+                        help="Vacía las tablas antes de generar")
+    args = parser.parse_args()
+
+    generar_datos(
+        args.clientes,
+        args.transacciones,
+        args.empleados or max(10, args.clientes // 1000),
+        args.trabajadores,
+        args.semilla,
+        args.hasta,
+        args.limpiar,
+    )
@@ -6,23 +6,52 @@ para el sistema de gestión médica, incluyendo la configuración de CORS,
 registro de routers y la función principal de ejecución.
 """
 
+import asyncio
 import logging
+import os
 
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-
-from src.migrations import print_migration_status, run_migrations
+from sqlalchemy.exc import OperationalError
+
+from database.connection import SessionLocal, engine
+from database.consultas_lentas import RegistroConsultasLentas
+from database.instrumentacion import instrumentar
+from database.invalidacion import bus_invalidacion
+from database.plazos import PlazoVencido, aplicar_plazos
+from src.arranque import preparacion
+from src.jobs import planificador
+from src.metricas import preregistrar_rutas
+from src.middleware import (
+    CapturaMiddleware,
+    CompresionMiddleware,
+    ConsultasSQLMiddleware,
+    GrupoConcurrencia,
+    LimitesMiddleware,
+    MetricasMiddleware,
+    PerfilamientoMiddleware,
+    PlazosMiddleware,
+)
+from src.middleware.plazos import (
+    consulta_cancelada_handler,
+    leer_plazos,
+    plazo_vencido_handler,
+)
 from src.routers import (
     cheques,
     clientes,
     cuentas,
     empleados,
+    mantenimiento,
+    metricas,
     prestamos,
     auth,
+    salud,
     tarjetas,
     transacciones,
 )
+from src.tiempo_real import difusor
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -43,16 +72,30 @@ app = FastAPI(
         {"name": "Préstamos", "description": "Gestión de información de préstamos."},
         {"name": "Tarjetas", "description": "Gestión de información de tarjetas."},
         {"name": "Transacciones", "description": "Gestión de información de transacciones."},
+        {"name": "Mantenimiento", "description": "Estado de las tareas periódicas."},
+        {"name": "Salud", "description": "Sondas de liveness y readiness."},
     ],
 )
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Compresión de respuestas según Accept-Encoding (gzip; br y zstd si están instalados)
+if os.getenv("COMPRESION_ACTIVA", "1") == "1":
+    app.add_middleware(
+        CompresionMiddleware,
+        minimo=int(os.getenv("COMPRESION_MINIMO_BYTES", "1024")),
+        niveles={
+            "gzip": int(os.getenv("COMPRESION_NIVEL_GZIP", "6")),
+            "br": int(os.getenv("COMPRESION_NIVEL_BROTLI", "4")),
+            "zstd": int(os.getenv("COMPRESION_NIVEL_ZSTD", "3")),
+        },
+    )
+
+# Captura de una muestra del tráfico para reproducirla en pruebas de carga
+if os.getenv("CAPTURA_ACTIVA", "0") == "1":
+    app.add_middleware(
+        CapturaMiddleware,
+        archivo=os.getenv("CAPTURA_ARCHIVO", "capturas/trafico.jsonl"),
+        muestreo=float(os.getenv("CAPTURA_MUESTREO", "0.01")),
+    )
 
 # Incluir router de autenticación (sin protección)
 app.include_router(auth.router)
@@ -65,6 +108,84 @@ app.include_router(empleados.router)
 app.include_router(prestamos.router)
 app.include_router(tarjetas.router)
 app.include_router(transacciones.router)
+app.include_router(mantenimiento.router)
+app.include_router(metricas.router)
+app.include_router(salud.router)
+
+# Consultas lentas con su plan de ejecución
+consultas_lentas = None
+if os.getenv("SQL_LENTAS_ACTIVO", "1") == "1":
+    consultas_lentas = RegistroConsultasLentas(
+        engine,
+        archivo=os.getenv("SQL_LENTAS_ARCHIVO", "logs/consultas_lentas.jsonl"),
+        umbral_ms=float(os.getenv("SQL_UMBRAL_LENTA_MS", "500")),
+        intervalo=float(os.getenv("SQL_LENTAS_INTERVALO_SEGUNDOS", "60")),
+    )
+
+# Perfilamiento a demanda para administradores (cabecera X-Profile: 1)
+if os.getenv("PERFILAMIENTO_ACTIVO", "1") == "1":
+    app.add_middleware(
+        PerfilamientoMiddleware,
+        directorio=os.getenv("PERFILES_DIRECTORIO", "perfiles"),
+        intervalo_ms=float(os.getenv("PERFIL_INTERVALO_MS", "2")),
+    )
+
+# Límite de concurrencia por grupo de rutas; lo transaccional tiene prioridad
+# y el total por defecto coincide con los hilos del threadpool de anyio
+app.add_middleware(
+    LimitesMiddleware,
+    total=int(os.getenv("CONCURRENCIA_TOTAL", "40")),
+    grupos=[
+        GrupoConcurrencia(
+            "transaccional", limite=32, cola=256, prioridad=0, espera_maxima=2.0,
+            rutas=("/transacciones", "POST /tarjetas/autorizar"),
+        ),
+        GrupoConcurrencia("autenticacion", limite=8, cola=64, prioridad=1, rutas=("/auth",)),
+        GrupoConcurrencia(
+            "escrituras", limite=16, cola=128, prioridad=1, metodos=("POST", "PUT", "PATCH", "DELETE"),
+        ),
+        GrupoConcurrencia("consultas", limite=16, cola=64, prioridad=2, espera_maxima=1.0),
+    ],
+)
+
+# Plazo por solicitud, propagado a Postgres como statement_timeout
+PLAZOS_POR_RUTA = {
+    "POST /cheques/compensacion": 120.0,
+    "POST /tarjetas/autorizar": 2.0,
+    "/health": 2.0,
+}
+aplicar_plazos(SessionLocal, engine)
+app.add_exception_handler(PlazoVencido, plazo_vencido_handler)
+app.add_exception_handler(OperationalError, consulta_cancelada_handler)
+app.add_middleware(
+    PlazosMiddleware,
+    por_defecto=float(os.getenv("PLAZO_SEGUNDOS", "10")),
+    por_ruta={**PLAZOS_POR_RUTA, **leer_plazos(os.getenv("PLAZOS_POR_RUTA", ""))},
+    maximo=float(os.getenv("PLAZO_MAXIMO_SEGUNDOS", "60")),
+)
+
+# Métricas por ruta para /metrics
+instrumentar(engine, consultas_lentas=consultas_lentas)
+preregistrar_rutas(app)
+app.add_middleware(MetricasMiddleware)
+
+# Consultas SQL por solicitud: cabecera Server-Timing y alertas de N+1
+app.add_middleware(
+    ConsultasSQLMiddleware,
+    umbral_repeticiones=int(os.getenv("SQL_UMBRAL_REPETICIONES", "10")),
+    server_timing=os.getenv("SERVER_TIMING_ACTIVO", "1") == "1",
+)
+
+# CORS se registra al final para quedar como el middleware más externo: así
+# también llevan sus cabeceras los 503 y 504 que responden los de arriba
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["Retry-After", "Server-Timing", "X-Profile-File"],
+)
 
 origins = [
     "http://localhost",
@@ -76,25 +197,20 @@ origins = [
 @app.on_event("startup")
 async def startup_event():
     """
-    Evento de inicio que ejecuta la migración automática de la base de datos.
+    Evento de inicio: lanza las migraciones y el calentamiento en segundo plano.
+
+    No espera a que terminen, así que el servidor responde /health/live de
+    inmediato; /health/ready pasa a 200 cuando la preparación completa.
     """
     logger.info("Iniciando Sistema de Gestión Médica...")
-
-    try:
-        logger.info("Ejecutando migración automática...")
-        migration_success = run_migrations()
-
-        if migration_success:
-            logger.info("Migración completada exitosamente")
-            print_migration_status()
-        else:
-            logger.error(
-                "Error en la migración - la aplicación puede no funcionar correctamente"
-            )
-
-    except Exception as e:
-        logger.error(f"Error crítico durante el inicio: {e}")
-        raise
+    al_terminar = None
+    if os.getenv("PLANIFICADOR_ACTIVO", "1") == "1":
+        al_terminar = planificador.iniciar
+    preparacion.iniciar(al_terminar=al_terminar)
+    if consultas_lentas is not None:
+        consultas_lentas.iniciar()
+    if os.getenv("INVALIDACION_ACTIVA", "1") == "1":
+        bus_invalidacion.iniciar()
 
 
 @app.on_event("shutdown")
@@ -103,6 +219,10 @@ async def shutdown_event():
     Evento de cierre de la aplicación.
     """
     logger.info("🛑 Cerrando Sistema de Gestión Médica...")
+    difusor.cerrar()
+    await preparacion.detener()
+    await planificador.detener()
+    await asyncio.to_thread(bus_invalidacion.detener)
 
 
 def main():
@@ -111,6 +231,7 @@ def main():
 
     Configura y ejecuta el servidor con uvicorn, habilitando el modo de recarga
     automática para desarrollo y configurando el host y puerto apropiados.
+    En producción usar servidor.py, que levanta varios workers.
     """
     print("Iniciando servidor FastAPI...")
     uvicorn.run(
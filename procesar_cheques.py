@@ -0,0 +1,76 @@
+"""
+Script para compensar los cheques cuya fecha de cobro ya llegó.
+
+Puede ejecutarse con varios procesos en paralelo: cada lote se toma con
+FOR UPDATE SKIP LOCKED, así que ningún cheque se compensa dos veces.
+"""
+
+import argparse
+from datetime import date
+from multiprocessing import Pool
+
+from database.connection import SessionLocal, engine
+from src.controller.cheques import compensar_cheques
+
+
+def compensar(args) -> dict:
+    """
+    Ejecuta la compensación completa en un proceso trabajador.
+    """
+    tamano_lote, max_lotes, fecha_corte = args
+    # Cada proceso debe abrir sus propias conexiones
+    engine.dispose(close=False)
+    db = SessionLocal()
+    try:
+        return compensar_cheques(db, tamano_lote, max_lotes, fecha_corte)
+    finally:
+        db.close()
+
+
+def procesar_cheques(tamano_lote: int, max_lotes: int, fecha_corte: date, trabajadores: int):
+    """
+    Compensa los cheques vencidos con uno o varios procesos.
+    """
+    print(f"🔄 Compensando cheques con {trabajadores} proceso(s), lotes de {tamano_lote}...")
+
+    tarea = (tamano_lote, max_lotes, fecha_corte)
+    if trabajadores == 1:
+        resultados = [compensar(tarea)]
+    else:
+        with Pool(trabajadores) as pool:
+            resultados = pool.map(compensar, [tarea] * trabajadores)
+
+    cheques = sum(r["cheques"] for r in resultados)
+    rechazados = sum(r["rechazados"] for r in resultados)
+    monto = sum(r["monto_total"] for r in resultados)
+    segundos = max(r["segundos"] for r in resultados)
+
+    print("\n📊 Resultado de la compensación:")
+    print("=" * 50)
+    for i, r in enumerate(resultados, start=1):
+        print(
+            f"Proceso {i}: {r['cheques']} cheques en {r['lotes']} lotes "
+            f"({r['cheques_por_segundo']:.1f} cheques/s)"
+        )
+    print("=" * 50)
+    print(f"Total:    {cheques} cheques, monto {monto:,.2f}")
+    print(f"Rechazados: {rechazados} cheques (cuenta inactiva o sin saldo)")
+    print(f"Duración: {segundos:.2f} s")
+    if segundos > 0:
+        print(f"Ritmo:    {cheques / segundos:.1f} cheques/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compensación de cheques por lotes")
+    parser.add_argument("--lote", type=int, default=500, help="Cheques por lote")
+    parser.add_argument("--max-lotes", type=int, default=None, help="Lotes por proceso")
+    parser.add_argument(
+        "--fecha",
+        type=date.fromisoformat,
+        default=None,
+        help="Fecha de corte (YYYY-MM-DD), por defecto hoy",
+    )
+    parser.add_argument("--trabajadores", type=int, default=1, help="Procesos en paralelo")
+    args = parser.parse_args()
+
+    procesar_cheques(args.lote, args.max_lotes, args.fecha, args.trabajadores)
@@ -0,0 +1,101 @@
+"""
+Servidor de producción: gunicorn con workers de uvicorn.
+
+El proceso maestro aplica las migraciones una sola vez (bajo el advisory
+lock de migraciones, así que también es seguro con varias instancias
+arrancando a la vez), carga la aplicación y recién entonces crea los
+workers, que la heredan ya importada. Los workers arrancan con
+MIGRAR_AL_INICIAR=0 y descartan las conexiones heredadas del maestro.
+
+Con SIGTERM gunicorn deja de aceptar conexiones y espera hasta
+--drenado segundos a que los workers terminen las solicitudes en curso
+antes de cerrarlos.
+
+Uso:
+    python servidor.py
+    python servidor.py --workers 4 --bind 0.0.0.0:8000 --drenado 30
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+from gunicorn.app.base import BaseApplication
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _post_fork(server, worker):
+    """Cada worker abre su propio pool en lugar de compartir los sockets del maestro."""
+    from database.connection import engine
+
+    engine.dispose(close=False)
+
+
+class ServidorProduccion(BaseApplication):
+    """Aplicación de gunicorn que sirve main:app con la configuración recibida."""
+
+    def __init__(self, opciones: dict):
+        self.opciones = opciones
+        super().__init__()
+
+    def load_config(self):
+        for clave, valor in self.opciones.items():
+            self.cfg.set(clave, valor)
+
+    def load(self):
+        from main import app
+
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bind", default=os.getenv("BIND", "0.0.0.0:8000"))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        help="Cantidad de workers (por defecto, uno por CPU)",
+    )
+    parser.add_argument(
+        "--drenado",
+        type=int,
+        default=int(os.getenv("DRENADO_SEGUNDOS", "30")),
+        help="Segundos para terminar las solicitudes en curso al recibir SIGTERM",
+    )
+    parser.add_argument(
+        "--sin-migrar", action="store_true", help="No aplica las migraciones antes de arrancar"
+    )
+    args = parser.parse_args()
+
+    from database.connection import engine
+    from src.migrations import run_migrations
+
+    if not args.sin_migrar:
+        logger.info("🔄 Aplicando migraciones antes de crear los workers...")
+        if not run_migrations():
+            logger.error("❌ La migración falló, no se inicia el servidor")
+            sys.exit(1)
+    engine.dispose()
+    os.environ["MIGRAR_AL_INICIAR"] = "0"
+
+    logger.info(f"🚀 Iniciando {args.workers} workers en {args.bind}")
+    ServidorProduccion(
+        {
+            "bind": args.bind,
+            "workers": args.workers,
+            "worker_class": "uvicorn.workers.UvicornWorker",
+            "preload_app": True,
+            "graceful_timeout": args.drenado,
+            "timeout": 60,
+            "keepalive": 5,
+            "post_fork": _post_fork,
+        }
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""
+Arranque de la aplicación en segundo plano y readiness.
+"""
+
+import os
+
+from src.cache import instantanea_empleados
+
+from .calentamiento import calentar_pool, cargar_bcrypt, migrar
+from .preparacion import FALLIDO, INICIANDO, LISTO, PasoPreparacion, Preparacion
+
+preparacion = Preparacion(
+    intervalo_verificacion=float(os.getenv("READINESS_INTERVALO_SEGUNDOS", "10")),
+    intentos=int(os.getenv("ARRANQUE_INTENTOS", "5")),
+    espera_maxima=float(os.getenv("ARRANQUE_ESPERA_MAXIMA_SEGUNDOS", "30")),
+)
+preparacion.registrar("migraciones", migrar)
+preparacion.registrar("pool", calentar_pool)
+preparacion.registrar("bcrypt", cargar_bcrypt)
+preparacion.registrar("empleados", instantanea_empleados.refrescar)
+
+__all__ = ["preparacion", "Preparacion", "PasoPreparacion", "INICIANDO", "LISTO", "FALLIDO"]
@@ -0,0 +1,45 @@
+"""
+Pasos de arranque: migraciones y calentamiento.
+"""
+
+import os
+
+from sqlalchemy import text
+
+from database.connection import engine
+
+
+def migrar():
+    """Aplica las migraciones, salvo que servidor.py ya lo haya hecho."""
+    # servidor.py migra una sola vez en el proceso maestro antes de crear
+    # los workers y los lanza con MIGRAR_AL_INICIAR=0
+    if os.getenv("MIGRAR_AL_INICIAR", "1") != "1":
+        return
+
+    from src.migrations import run_migrations
+
+    if not run_migrations():
+        raise RuntimeError("la migración no se completó correctamente")
+
+
+def calentar_pool():
+    """
+    Abre todas las conexiones del pool, para que las primeras solicitudes no
+    paguen la conexión y el handshake TLS con la base.
+    """
+    conexiones = []
+    try:
+        for _ in range(engine.pool.size()):
+            conexion = engine.connect()
+            conexiones.append(conexion)
+            conexion.execute(text("SELECT 1"))
+    finally:
+        for conexion in conexiones:
+            conexion.close()
+
+
+def cargar_bcrypt():
+    """Carga el backend de bcrypt, que passlib elige en el primer uso."""
+    from src.auth.jwt_handler import pwd_context
+
+    pwd_context.handler("bcrypt").get_backend()
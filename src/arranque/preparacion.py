@@ -0,0 +1,188 @@
+"""
+Preparación de la aplicación en segundo plano y estado de readiness.
+
+El arranque (migraciones, pool de conexiones y calentamiento de cachés)
+corre como una tarea del event loop que delega cada paso bloqueante a un
+hilo, así que el servidor acepta conexiones y responde /health/live desde
+el primer momento. /health/ready responde 503 hasta que todos los pasos
+terminan.
+
+Un paso que falla (por ejemplo, la base no responde durante unos segundos
+al arrancar) se reintenta con espera exponencial. Si agota los intentos la
+preparación queda FALLIDO y /health/live también responde 503, para que el
+orquestador reinicie el proceso en lugar de dejarlo vivo y nunca listo.
+
+Una vez lista, la verificación de la base se cachea: las sondas leen el
+último resultado y, si tiene más de `intervalo_verificacion` segundos,
+disparan una verificación nueva en segundo plano sin esperarla.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+from database.connection import engine
+
+logger = logging.getLogger(__name__)
+
+INICIANDO = "iniciando"
+LISTO = "listo"
+FALLIDO = "fallido"
+
+
+class PasoPreparacion:
+    """Función bloqueante que debe terminar antes de aceptar tráfico."""
+
+    def __init__(self, nombre: str, funcion: Callable[[], None]):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.duracion: Optional[float] = None
+        self.error: Optional[str] = None
+        self.intentos = 0
+
+    def estado(self) -> dict:
+        return {
+            "nombre": self.nombre,
+            "duracion_segundos": self.duracion,
+            "intentos": self.intentos,
+            "error": self.error,
+        }
+
+
+class Preparacion:
+    """
+    Ejecuta los pasos registrados en orden y expone el estado de readiness.
+
+    Args:
+        intervalo_verificacion: Segundos de validez de la última verificación de la base
+        intentos: Intentos de cada paso antes de dar la preparación por fallida
+        espera_inicial: Segundos antes del primer reintento; se duplica en cada uno
+        espera_maxima: Tope de la espera entre reintentos
+    """
+
+    def __init__(self, intervalo_verificacion: float = 10.0, intentos: int = 5,
+                 espera_inicial: float = 1.0, espera_maxima: float = 30.0):
+        self.pasos: List[PasoPreparacion] = []
+        self.estado = INICIANDO
+        self.intervalo_verificacion = intervalo_verificacion
+        self.intentos = max(intentos, 1)
+        self.espera_inicial = espera_inicial
+        self.espera_maxima = espera_maxima
+        self.base_disponible = False
+        self.ultima_verificacion: Optional[datetime] = None
+        self._verificada_en = 0.0
+        self._verificando = False
+        self._tarea: Optional[asyncio.Task] = None
+
+    def registrar(self, nombre: str, funcion: Callable[[], None]):
+        """Agrega un paso al final de la preparación."""
+        self.pasos.append(PasoPreparacion(nombre, funcion))
+
+    async def _ejecutar_paso(self, paso: PasoPreparacion) -> bool:
+        """Ejecuta un paso, reintentándolo con espera exponencial si falla."""
+        espera = self.espera_inicial
+        while True:
+            paso.intentos += 1
+            comienzo = time.perf_counter()
+            try:
+                await asyncio.to_thread(paso.funcion)
+                paso.error = None
+                return True
+            except Exception as e:
+                paso.error = str(e)
+                if paso.intentos >= self.intentos:
+                    logger.error(
+                        f"❌ Falló el paso de arranque {paso.nombre} tras {paso.intentos} intentos: {e}"
+                    )
+                    return False
+                logger.warning(
+                    f"⚠️  Falló el paso de arranque {paso.nombre} (intento {paso.intentos}), "
+                    f"se reintenta en {espera:g} s: {e}"
+                )
+            finally:
+                paso.duracion = time.perf_counter() - comienzo
+            await asyncio.sleep(espera)
+            espera = min(espera * 2, self.espera_maxima)
+
+    async def _preparar(self, al_terminar: Optional[Callable[[], None]]):
+        inicio = time.perf_counter()
+        for paso in self.pasos:
+            if not await self._ejecutar_paso(paso):
+                self.estado = FALLIDO
+                return
+            logger.info(f"✅ {paso.nombre} listo en {paso.duracion:.3f} s")
+
+        self.base_disponible = True
+        self._verificada_en = time.monotonic()
+        self.ultima_verificacion = datetime.now()
+        self.estado = LISTO
+        if al_terminar is not None:
+            al_terminar()
+        logger.info(f"⏱️  Aplicación lista en {time.perf_counter() - inicio:.3f} s")
+
+    def iniciar(self, al_terminar: Optional[Callable[[], None]] = None):
+        """
+        Lanza la preparación en el event loop actual sin esperarla.
+
+        Args:
+            al_terminar: Función que se llama en el event loop cuando todos
+                los pasos terminaron bien
+        """
+        if self._tarea is None:
+            self._tarea = asyncio.create_task(self._preparar(al_terminar))
+
+    async def detener(self):
+        """Cancela la preparación si todavía está en curso."""
+        if self._tarea is not None and not self._tarea.done():
+            self._tarea.cancel()
+            await asyncio.gather(self._tarea, return_exceptions=True)
+
+    def _consultar_base(self):
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            disponible = True
+        except Exception as e:
+            disponible = False
+            logger.warning(f"⚠️  La base de datos no responde: {e}")
+        self.base_disponible = disponible
+        self._verificada_en = time.monotonic()
+        self.ultima_verificacion = datetime.now()
+
+    async def _verificar(self):
+        try:
+            await asyncio.to_thread(self._consultar_base)
+        finally:
+            self._verificando = False
+
+    def vivo(self) -> bool:
+        """Indica si el proceso sigue siendo útil: falso si la preparación falló."""
+        return self.estado != FALLIDO
+
+    def listo(self) -> bool:
+        """
+        Indica si la aplicación puede recibir tráfico, según el último resultado.
+
+        Nunca consulta la base en la sonda: si el resultado venció, agenda
+        una verificación para las sondas siguientes.
+        """
+        if self.estado != LISTO:
+            return False
+        vencida = time.monotonic() - self._verificada_en > self.intervalo_verificacion
+        if vencida and not self._verificando:
+            self._verificando = True
+            asyncio.get_running_loop().create_task(self._verificar())
+        return self.base_disponible
+
+    def resumen(self) -> Dict:
+        """Estado general y de cada paso, para /health/ready."""
+        return {
+            "estado": self.estado,
+            "base_disponible": self.base_disponible,
+            "ultima_verificacion": self.ultima_verificacion,
+            "pasos": [paso.estado() for paso in self.pasos],
+        }
@@ -3,6 +3,7 @@ JWT authentication utilities.
 """
 
 import os
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -10,6 +11,8 @@ import jwt
 from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
+from src.metricas import duracion_bcrypt, duracion_jwt
+
 # Configuración de seguridad
 SECRET_KEY = os.getenv(
     "SECRET_KEY", "tu-clave-secreta-super-segura-cambiar-en-produccion"
@@ -32,7 +35,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True si la contraseña es correcta
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    inicio = time.perf_counter()
+    try:
+        return pwd_context.verify(plain_password, hashed_password)
+    finally:
+        duracion_bcrypt.observar(time.perf_counter() - inicio, "verificar")
 
 
 def get_password_hash(password: str) -> str:
@@ -45,7 +52,11 @@ def get_password_hash(password: str) -> str:
     Returns:
         str: Hash de la contraseña
     """
-    return pwd_context.hash(password)
+    inicio = time.perf_counter()
+    try:
+        return pwd_context.hash(password)
+    finally:
+        duracion_bcrypt.observar(time.perf_counter() - inicio, "hash")
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -59,6 +70,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Returns:
         str: Token JWT codificado
     """
+    inicio = time.perf_counter()
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -67,6 +79,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    duracion_jwt.observar(time.perf_counter() - inicio, "crear")
     return encoded_jwt
 
 
@@ -83,6 +96,7 @@ def verify_token(token: str) -> dict:
     Raises:
         HTTPException: Si el token es inválido o ha expirado
     """
+    inicio = time.perf_counter()
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -109,3 +123,5 @@ def verify_token(token: str) -> dict:
             detail="Token inválido",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    finally:
+        duracion_jwt.observar(time.perf_counter() - inicio, "verificar")
@@ -0,0 +1,52 @@
+"""
+Cachés de lectura de entidades e instantáneas de tablas de referencia,
+invalidadas por el bus de database.invalidacion.
+"""
+
+import os
+
+from src.entities.clientes import Clientes
+from src.entities.cuentas import Cuentas
+from src.entities.empleados import Empleados
+from src.entities.tarjetas import Tarjetas
+from src.metricas import registro
+from src.metricas.registro import MedidorCalculado
+
+from .entidades import CacheEntidades
+from .referencia import Instantanea, InstantaneaReferencia
+
+_MAXIMO = int(os.getenv("CACHE_ENTIDADES_MAXIMO", "10000"))
+_TTL = float(os.getenv("CACHE_ENTIDADES_TTL_SEGUNDOS", "30"))
+
+cache_clientes = CacheEntidades("clientes", Clientes, _MAXIMO, _TTL)
+cache_cuentas = CacheEntidades("cuentas", Cuentas, _MAXIMO, _TTL)
+cache_tarjetas = CacheEntidades("tarjetas", Tarjetas, _MAXIMO, _TTL)
+
+# Tabla chica y de lectura frecuente: se guarda entera en vez de por id
+instantanea_empleados = InstantaneaReferencia(
+    "empleados",
+    Empleados,
+    indices=("documento",),
+    intervalo_verificacion=float(os.getenv("EMPLEADOS_VERIFICACION_SEGUNDOS", "30")),
+)
+
+_CACHES = (cache_clientes, cache_cuentas, cache_tarjetas)
+
+registro.registrar(
+    MedidorCalculado(
+        "cache_entradas",
+        "Entradas guardadas por caché de entidades",
+        lambda: {(c.entidad,): len(c) for c in _CACHES},
+        ("cache",),
+    )
+)
+
+__all__ = [
+    "CacheEntidades",
+    "cache_clientes",
+    "cache_cuentas",
+    "cache_tarjetas",
+    "Instantanea",
+    "InstantaneaReferencia",
+    "instantanea_empleados",
+]
@@ -0,0 +1,109 @@
+"""
+Caché de lectura de entidades por clave primaria, con LRU y TTL.
+
+Cada worker guarda en memoria las filas leídas por id (clientes, cuentas,
+tarjetas, empleados) y las devuelve sin consultar la base mientras no
+venzan ni se invaliden. Las invalidaciones llegan por el bus de
+database.invalidacion, así que una escritura en cualquier worker desaloja
+la entrada en todos.
+
+Se guardan solo los valores de las columnas, nunca la instancia de la
+sesión que la cargó: cada acierto devuelve una instancia nueva, sin sesión,
+que puede leerse pero no tiene cargadas las relaciones.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from database.invalidacion import TODO, bus_invalidacion, normalizar_clave
+from src.metricas import cache_aciertos, cache_desalojos, cache_fallos
+
+
+class CacheEntidades:
+    """
+    Caché read-through de una entidad, indexada por su clave primaria.
+
+    Args:
+        entidad: Nombre de la entidad en el bus de invalidación y en las métricas
+        modelo: Clase del modelo de SQLAlchemy
+        maximo: Entradas como máximo; al superarlo se desaloja la menos usada
+        ttl: Segundos que una entrada se considera vigente (0 desactiva la caché)
+    """
+
+    def __init__(self, entidad: str, modelo, maximo: int = 10000, ttl: float = 30.0):
+        self.entidad = entidad
+        self.modelo = modelo
+        self.maximo = maximo
+        self.ttl = ttl
+        mapeo = inspect(modelo)
+        self._pk = mapeo.primary_key[0]
+        self._columnas = [c.key for c in mapeo.column_attrs]
+        self._entradas: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Avanza con cada invalidación; una carga que empezó antes no se guarda
+        self._generacion = 0
+        cache_aciertos.preregistrar(entidad)
+        cache_fallos.preregistrar(entidad)
+        cache_desalojos.preregistrar(entidad)
+        bus_invalidacion.suscribir(entidad, self.invalidar)
+
+    @property
+    def activa(self) -> bool:
+        return self.maximo > 0 and self.ttl > 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def _instancia(self, datos: dict):
+        return self.modelo(**datos)
+
+    def obtener(self, db: Session, clave):
+        """
+        Devuelve la entidad con esa clave primaria, o None si no existe.
+
+        Las ausencias no se guardan: una entidad recién creada se encuentra
+        en la siguiente lectura sin esperar ninguna invalidación.
+        """
+        if not self.activa:
+            return db.query(self.modelo).filter(self._pk == clave).first()
+
+        llave = normalizar_clave(clave)
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get(llave)
+            if entrada is not None:
+                vence, datos = entrada
+                if vence > ahora:
+                    self._entradas.move_to_end(llave)
+                    cache_aciertos.inc(1, self.entidad)
+                    return self._instancia(datos)
+                del self._entradas[llave]
+            generacion = self._generacion
+
+        cache_fallos.inc(1, self.entidad)
+        fila = db.query(self.modelo).filter(self._pk == clave).first()
+        if fila is None:
+            return None
+
+        datos = {columna: getattr(fila, columna) for columna in self._columnas}
+        with self._lock:
+            if generacion == self._generacion:
+                self._entradas[llave] = (time.monotonic() + self.ttl, datos)
+                self._entradas.move_to_end(llave)
+                while len(self._entradas) > self.maximo:
+                    self._entradas.popitem(last=False)
+                    cache_desalojos.inc(1, self.entidad)
+        return fila
+
+    def invalidar(self, clave: str = TODO):
+        """Desaloja una entrada, o todas si la clave es TODO."""
+        with self._lock:
+            self._generacion += 1
+            if clave == TODO:
+                self._entradas.clear()
+            else:
+                self._entradas.pop(normalizar_clave(clave), None)
@@ -0,0 +1,51 @@
+"""
+ETags débiles y GET condicional.
+
+El ETag de un recurso sale de datos que ya se tienen sin serializarlo: la
+clave primaria y fecha_actualizacion para un detalle, o un agregado barato
+(max(fecha_actualizacion), count(*)) para un listado. Si el cliente manda
+If-None-Match con ese valor se responde 304 sin cuerpo, así que la ruta no
+arma ni serializa la respuesta.
+
+Son débiles (W/) porque dos respuestas con el mismo ETag representan los
+mismos datos, no necesariamente los mismos bytes (por ejemplo, con y sin
+compresión).
+"""
+
+import hashlib
+
+from fastapi import Request, Response
+
+CONTROL_CACHE = "no-cache"
+
+
+def etag_debil(*partes) -> str:
+    """Arma un ETag débil a partir de los valores que identifican la versión."""
+    texto = "|".join("" if p is None else str(p) for p in partes)
+    return f'W/"{hashlib.blake2b(texto.encode(), digest_size=8).hexdigest()}"'
+
+
+def _opaco(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def coincide(request: Request, etag: str) -> bool:
+    """Indica si If-None-Match contiene `etag`, con comparación débil."""
+    cabecera = request.headers.get("if-none-match")
+    if not cabecera:
+        return False
+    if cabecera.strip() == "*":
+        return True
+    buscado = _opaco(etag)
+    return any(_opaco(candidato) == buscado for candidato in cabecera.split(","))
+
+
+def cabeceras(etag: str) -> dict:
+    """Cabeceras de validación para una respuesta 200 o 304."""
+    return {"ETag": etag, "Cache-Control": CONTROL_CACHE}
+
+
+def no_modificado(etag: str) -> Response:
+    """Respuesta 304 sin cuerpo."""
+    return Response(status_code=304, headers=cabeceras(etag))
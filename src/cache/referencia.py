@@ -0,0 +1,179 @@
+"""
+Instantáneas en memoria de tablas de referencia chicas.
+
+Una tabla que cambia poco y se consulta mucho (empleados) se carga entera
+en una instantánea inmutable, indexada por clave primaria y por las
+columnas únicas que se usen para buscar. Las búsquedas leen la instantánea
+vigente sin ir a la base; reemplazarla es una sola asignación, así que un
+lector ve la instantánea vieja completa o la nueva completa, nunca una
+mezcla.
+
+La versión de una instantánea es (max(fecha_actualizacion), cantidad de
+filas), calculada sobre las mismas filas cargadas. Se reconstruye:
+
+- de inmediato, cuando el controlador escribe en la tabla;
+- en segundo plano y sin comparar versiones, cuando el bus de
+  invalidación avisa que otro worker escribió. Si ya hay un refresco en
+  curso, el aviso queda pendiente y ese hilo reconstruye una vez más al
+  terminar, porque pudo haber leído la tabla antes del otro commit;
+- en segundo plano, si la versión en la base cambió, lo que se verifica
+  como mucho cada `intervalo_verificacion` segundos desde las búsquedas.
+"""
+
+import logging
+import threading
+import time
+from types import MappingProxyType
+from typing import Iterable, Optional
+
+from sqlalchemy import func, inspect, select
+
+from database.connection import SessionLocal
+from database.invalidacion import bus_invalidacion, normalizar_clave
+
+logger = logging.getLogger(__name__)
+
+
+class Instantanea:
+    """Filas de una tabla en un momento dado, de solo lectura."""
+
+    __slots__ = ("version", "filas", "indices")
+
+    def __init__(self, version: tuple, filas: tuple, indices: dict):
+        self.version = version
+        self.filas = filas
+        self.indices = MappingProxyType(indices)
+
+
+class InstantaneaReferencia:
+    """
+    Mantiene la instantánea vigente de la tabla de `modelo`.
+
+    Args:
+        entidad: Nombre de la entidad en el bus de invalidación
+        modelo: Clase del modelo de SQLAlchemy; debe tener fecha_actualizacion
+        indices: Columnas únicas por las que se busca, además de la clave primaria
+        intervalo_verificacion: Segundos entre verificaciones de la versión en la base
+    """
+
+    def __init__(self, entidad: str, modelo, indices: Iterable[str] = (),
+                 intervalo_verificacion: float = 30.0):
+        self.entidad = entidad
+        self.modelo = modelo
+        self.intervalo_verificacion = intervalo_verificacion
+        mapeo = inspect(modelo)
+        self._pk = mapeo.primary_key[0].key
+        self._indices = (self._pk, *indices)
+        self._columnas = [getattr(modelo, c.key) for c in mapeo.column_attrs]
+        self._instantanea: Optional[Instantanea] = None
+        self._verificada_en = 0.0
+        self._lock = threading.Lock()
+        self._hilo: Optional[threading.Thread] = None
+        # Refresco pedido mientras el hilo ya corría: None, o si debe forzarse
+        self._pendiente: Optional[bool] = None
+        self._lock_hilo = threading.Lock()
+        bus_invalidacion.suscribir(entidad, lambda clave: self._refrescar_en_segundo_plano(forzar=True))
+
+    @property
+    def version(self) -> Optional[tuple]:
+        instantanea = self._instantanea
+        return instantanea.version if instantanea else None
+
+    def _version_en_base(self, db) -> tuple:
+        fila = db.execute(
+            select(func.max(self.modelo.fecha_actualizacion), func.count())
+            .select_from(self.modelo)
+        ).one()
+        return (fila[0], fila[1])
+
+    def _construir(self, db) -> Instantanea:
+        filas = tuple(
+            MappingProxyType(dict(fila))
+            for fila in db.execute(select(*self._columnas)).mappings()
+        )
+        indices = {}
+        for columna in self._indices:
+            indices[columna] = MappingProxyType({
+                normalizar_clave(fila[columna]): fila
+                for fila in filas if fila[columna] is not None
+            })
+        fechas = [f["fecha_actualizacion"] for f in filas if f["fecha_actualizacion"] is not None]
+        version = (max(fechas, default=None), len(filas))
+        return Instantanea(version, filas, indices)
+
+    def refrescar(self, db=None, forzar: bool = False) -> bool:
+        """
+        Reconstruye la instantánea si cambió la versión en la base.
+
+        Args:
+            db: Sesión a usar; si no se pasa se abre una propia
+            forzar: Reconstruir sin comparar versiones
+
+        Returns:
+            bool: True si se reemplazó la instantánea
+        """
+        propia = db is None
+        if propia:
+            db = SessionLocal()
+        try:
+            with self._lock:
+                self._verificada_en = time.monotonic()
+                actual = self._instantanea
+                if not forzar and actual is not None and self._version_en_base(db) == actual.version:
+                    return False
+                nueva = self._construir(db)
+                self._instantanea = nueva
+        finally:
+            if propia:
+                db.close()
+        logger.debug(f"🗂️  Instantánea de {self.entidad}: {len(nueva.filas)} filas")
+        return True
+
+    def _refrescar_en_segundo_plano(self, forzar: bool = False):
+        with self._lock_hilo:
+            self._pendiente = bool(self._pendiente) or forzar
+            if self._hilo is not None:
+                return
+            self._hilo = threading.Thread(
+                target=self._refrescar_pendientes, name=f"instantanea_{self.entidad}", daemon=True
+            )
+            self._hilo.start()
+
+    def _refrescar_pendientes(self):
+        while True:
+            with self._lock_hilo:
+                forzar = self._pendiente
+                if forzar is None:
+                    self._hilo = None
+                    return
+                self._pendiente = None
+            try:
+                self.refrescar(forzar=forzar)
+            except Exception as e:
+                logger.error(f"❌ Error refrescando la instantánea de {self.entidad}: {e}")
+
+    def _vigente(self, db) -> Instantanea:
+        instantanea = self._instantanea
+        if instantanea is None:
+            self.refrescar(db)
+            return self._instantanea
+        if time.monotonic() - self._verificada_en > self.intervalo_verificacion:
+            self._verificada_en = time.monotonic()
+            self._refrescar_en_segundo_plano()
+        return instantanea
+
+    def _instancia(self, fila):
+        return self.modelo(**fila) if fila is not None else None
+
+    def obtener(self, db, clave):
+        """Devuelve la fila con esa clave primaria, o None si no existe."""
+        return self.buscar(db, self._pk, clave)
+
+    def buscar(self, db, columna: str, valor):
+        """Devuelve la fila cuyo índice `columna` vale `valor`, o None."""
+        fila = self._vigente(db).indices[columna].get(normalizar_clave(valor))
+        return self._instancia(fila)
+
+    def todas(self, db) -> list:
+        """Devuelve todas las filas de la instantánea."""
+        return [self._instancia(fila) for fila in self._vigente(db).filas]
@@ -4,10 +4,11 @@ Authentication controller for user management.
 
 from datetime import datetime
 from typing import Optional
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from sqlalchemy.orm import Session
 
+from database.identificadores import generar_pk
 from src.auth.jwt_handler import create_access_token, get_password_hash, verify_password
 from src.entities.usuario import Usuario
 from src.schemas.auth import LoginRequest, UserCreate, UserResponse
@@ -36,7 +37,7 @@ def create_user(db: Session, user: UserCreate) -> Usuario:
     # Crear nuevo usuario
     hashed_password = get_password_hash(user.password)
     db_user = Usuario(
-        id_usuario=uuid4(),
+        id_usuario=generar_pk(),
         username=user.username,
         email=user.email,
         nombre_completo=user.nombre_completo,
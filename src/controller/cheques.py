@@ -1,13 +1,22 @@
+import time
+from datetime import date, datetime
+
+from sqlalchemy import text
 from sqlalchemy.orm import Session
+from database.eventos import CANAL_CUENTAS, EVENTO_TRANSACCION, notificar_saldos
+from database.invalidacion import publicar
 from src.entities.cheques import Cheques
 
 # Crear Chequea
 def create_cheque(db: Session, cheque: Cheques):
     new_cheque = Cheques(
         idCliente=str(cheque.idCliente),
+        idCuenta=cheque.idCuenta,
         fechaEmision=cheque.fechaEmision,
+        fechaCobro=cheque.fechaCobro,
         monto=cheque.monto,
         motivo=cheque.motivo,
+        estado="pendiente",
     )
     db.add(new_cheque)
     db.commit()
@@ -30,7 +39,9 @@ def update_cheque(db: Session, cheque_id: str, cheque: Cheques):
     db_cheque = db.query(Cheques).filter(Cheques.idCheque == cheque_id).first()
     if db_cheque:
         db_cheque.idCliente = str(cheque.idCliente)
+        db_cheque.idCuenta = cheque.idCuenta
         db_cheque.fechaEmision = cheque.fechaEmision
+        db_cheque.fechaCobro = cheque.fechaCobro
         db_cheque.monto = cheque.monto
         db_cheque.motivo = cheque.motivo
         db.commit()
@@ -45,3 +56,166 @@ def delete_cheque(db: Session, cheque_id: str):
         db.delete(db_cheque)
         db.commit()
     return db_cheque
+
+
+# Compensar un lote de cheques vencidos para cobro
+def compensar_lote_cheques(db: Session, tamano_lote: int = 500, fecha_corte: date = None):
+    """
+    Compensa un lote de cheques pendientes cuya fecha de cobro ya llegó.
+
+    Los cheques se toman con ``FOR UPDATE SKIP LOCKED``, así que varios
+    procesos pueden compensar en paralelo sin tomar el mismo cheque. Las
+    cuentas afectadas se bloquean en orden de ``idCuenta`` para evitar
+    interbloqueos, se debitan con un único UPDATE agregado y cada cheque
+    genera su transacción, todo en el mismo commit. Los movimientos y los
+    saldos nuevos se avisan por NOTIFY (ver database.eventos).
+
+    Solo se cobran los cheques de cuentas activas y, dentro de cada
+    cuenta, en orden de fecha de cobro mientras el acumulado no supere el
+    saldo. Los movimientos y los cheques cobrados salen de las cuentas que
+    el UPDATE realmente debitó; los demás quedan sin cobrar, en estado
+    "rechazado", para que no vuelvan a tomarse en cada lote.
+
+    Returns:
+        tuple: (cheques compensados, monto total debitado, cheques rechazados)
+    """
+    fecha_corte = fecha_corte or date.today()
+    ahora = datetime.utcnow()
+
+    ids = db.execute(
+        text(
+            """
+            SELECT "idCheque" FROM cheques
+            WHERE estado = 'pendiente'
+              AND "fechaCobro" <= :fecha_corte
+              AND "idCuenta" IS NOT NULL
+            ORDER BY "fechaCobro"
+            LIMIT :tamano_lote
+            FOR UPDATE SKIP LOCKED
+            """
+        ),
+        {"fecha_corte": fecha_corte, "tamano_lote": tamano_lote},
+    ).scalars().all()
+    if not ids:
+        db.rollback()
+        return 0, 0, 0
+
+    db.execute(
+        text(
+            """
+            SELECT "idCuenta" FROM cuentas
+            WHERE "idCuenta" IN (
+                SELECT "idCuenta" FROM cheques WHERE "idCheque" = ANY(:ids)
+            )
+            ORDER BY "idCuenta"
+            FOR UPDATE
+            """
+        ),
+        {"ids": ids},
+    )
+
+    cantidad, total, rechazados, _, cuentas = db.execute(
+        text(
+            f"""
+            WITH lote AS (
+                SELECT ch."idCheque", ch."idCuenta", ch.monto,
+                       COALESCE(
+                           c.estado = 'Activa'
+                           AND SUM(ch.monto) OVER (
+                               PARTITION BY ch."idCuenta" ORDER BY ch."fechaCobro", ch."idCheque"
+                           ) <= c.saldo,
+                           false
+                       ) AS aceptado
+                FROM cheques AS ch
+                JOIN cuentas AS c ON c."idCuenta" = ch."idCuenta"
+                WHERE ch."idCheque" = ANY(:ids)
+            ),
+            debitos AS (
+                UPDATE cuentas AS c
+                SET saldo = c.saldo - d.total, fecha_actualizacion = :ahora
+                FROM (
+                    SELECT "idCuenta", SUM(monto) AS total
+                    FROM lote WHERE aceptado GROUP BY "idCuenta"
+                ) AS d
+                WHERE c."idCuenta" = d."idCuenta"
+                  AND c.estado = 'Activa'
+                  AND c.saldo >= d.total
+                RETURNING c."idCuenta"
+            ),
+            movimientos AS (
+                INSERT INTO transacciones
+                    ("idTransaccion", "idCuenta", tipo, monto, descripcion, fecha, fecha_creacion)
+                SELECT uuid_generate_v7(), lote."idCuenta", 'cheque', lote.monto,
+                       'Cobro de cheque ' || lote."idCheque", :ahora, :ahora
+                FROM lote
+                JOIN debitos ON debitos."idCuenta" = lote."idCuenta"
+                WHERE lote.aceptado
+                RETURNING "idTransaccion", "idCuenta", tipo, monto, descripcion, fecha
+            ),
+            avisos AS (
+                SELECT pg_notify(:canal, {EVENTO_TRANSACCION}) FROM movimientos AS t
+            ),
+            cobrados AS (
+                UPDATE cheques AS ch
+                SET estado = 'cobrado', fecha_actualizacion = :ahora
+                FROM lote
+                JOIN debitos ON debitos."idCuenta" = lote."idCuenta"
+                WHERE ch."idCheque" = lote."idCheque" AND lote.aceptado
+                RETURNING lote.monto
+            ),
+            rechazos AS (
+                UPDATE cheques AS ch
+                SET estado = 'rechazado', fecha_actualizacion = :ahora
+                FROM lote
+                WHERE ch."idCheque" = lote."idCheque"
+                  AND NOT (lote.aceptado AND lote."idCuenta" IN (SELECT "idCuenta" FROM debitos))
+                RETURNING ch."idCheque"
+            )
+            SELECT (SELECT COUNT(*) FROM cobrados),
+                   (SELECT COALESCE(SUM(monto), 0) FROM cobrados),
+                   (SELECT COUNT(*) FROM rechazos),
+                   (SELECT COUNT(*) FROM avisos),
+                   (SELECT COALESCE(array_agg("idCuenta"), '{{}}') FROM debitos)
+            """
+        ),
+        {"ids": ids, "ahora": ahora, "canal": CANAL_CUENTAS},
+    ).one()
+    notificar_saldos(db, cuentas)
+    for id_cuenta in cuentas:
+        publicar(db, "cuentas", id_cuenta)
+    db.commit()
+    return cantidad, total, rechazados
+
+
+# Compensar todos los cheques vencidos, lote por lote
+def compensar_cheques(
+    db: Session, tamano_lote: int = 500, max_lotes: int = None, fecha_corte: date = None
+) -> dict:
+    """
+    Ejecuta lotes de compensación hasta que no queden cheques por cobrar.
+
+    Returns:
+        dict: lotes, cheques, rechazados, monto total, segundos y cheques por segundo
+    """
+    lotes = 0
+    cheques = 0
+    rechazados = 0
+    monto_total = 0
+    inicio = time.perf_counter()
+    while max_lotes is None or lotes < max_lotes:
+        cantidad, total, rechazos = compensar_lote_cheques(db, tamano_lote, fecha_corte)
+        if cantidad == 0 and rechazos == 0:
+            break
+        lotes += 1
+        cheques += cantidad
+        rechazados += rechazos
+        monto_total += total
+    segundos = time.perf_counter() - inicio
+    return {
+        "lotes": lotes,
+        "cheques": cheques,
+        "rechazados": rechazados,
+        "monto_total": float(monto_total),
+        "segundos": segundos,
+        "cheques_por_segundo": cheques / segundos if segundos > 0 else 0.0,
+    }
@@ -1,9 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy import func, text
 from sqlalchemy.orm import Session
+from database.invalidacion import publicar
+from src.cache import cache_clientes
 from src.entities.clientes import Clientes
 
+LIMITE_BUSQUEDA = 20
+LIMITE_CANDIDATOS = 1000
+
 
 # Crear Cliente
 def create_cliente(db: Session, cliente: Clientes):
+    ahora = datetime.utcnow()
     new_cliente = Clientes(
         nombre=cliente.nombre,
         apellido=cliente.apellido,
@@ -12,6 +21,8 @@ def create_cliente(db: Session, cliente: Clientes):
         telefono=cliente.telefono,
         email=cliente.email,
         fechaNacimiento=cliente.fechaNacimiento,
+        fecha_creacion=ahora,
+        fecha_actualizacion=ahora,
     )
     db.add(new_cliente)
     db.commit()
@@ -21,7 +32,57 @@ def create_cliente(db: Session, cliente: Clientes):
 
 # Obtener Cliente por ID
 def get_cliente(db: Session, cliente_id: str):
-    return db.query(Clientes).filter(Clientes.idCliente == cliente_id).first()
+    return cache_clientes.obtener(db, cliente_id)
+
+
+# Buscar Clientes por nombre, apellido o prefijo de documento
+def buscar_clientes(db: Session, q: str, limite: int = LIMITE_BUSQUEDA):
+    """
+    Busca clientes por coincidencia parcial, ordenados por similitud.
+
+    Nombre y apellido se comparan por trigramas (``<%``) y el documento por
+    prefijo (índice ``text_pattern_ops``). Cada criterio aporta a lo sumo
+    LIMITE_CANDIDATOS, los más parecidos primero: nombre y apellido se
+    recorren en orden de distancia (``<<->``) sobre sus índices GiST de
+    pg_trgm, así que un término muy común (un apellido frecuente) no
+    obliga a ordenar una fracción grande de la tabla y una coincidencia
+    exacta nunca queda fuera de los candidatos.
+    """
+    q = q.strip()
+    prefijo = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    return db.execute(
+        text(
+            """
+            WITH candidatos AS (
+                (SELECT "idCliente" FROM clientes
+                 WHERE :q <% nombre
+                 ORDER BY CAST(:q AS text) <<-> nombre
+                 LIMIT :candidatos)
+                UNION
+                (SELECT "idCliente" FROM clientes
+                 WHERE :q <% apellido
+                 ORDER BY CAST(:q AS text) <<-> apellido
+                 LIMIT :candidatos)
+                UNION
+                (SELECT "idCliente" FROM clientes
+                 WHERE documento LIKE :prefijo
+                 ORDER BY documento
+                 LIMIT :candidatos)
+            )
+            SELECT c."idCliente", c.nombre, c.apellido, c.documento,
+                   GREATEST(
+                       word_similarity(:q, c.nombre),
+                       word_similarity(:q, c.apellido),
+                       CASE WHEN c.documento LIKE :prefijo THEN 1.0 ELSE 0.0 END
+                   ) AS similitud
+            FROM candidatos
+            JOIN clientes AS c USING ("idCliente")
+            ORDER BY similitud DESC, c.apellido, c.nombre
+            LIMIT :limite
+            """
+        ),
+        {"q": q, "prefijo": prefijo, "candidatos": LIMITE_CANDIDATOS, "limite": limite},
+    ).all()
 
 
 # Listar todos los Clientes
@@ -29,6 +90,14 @@ def get_clientes(db: Session):
     return db.query(Clientes).all()
 
 
+# Versión del listado de Clientes, para su ETag
+def version_clientes(db: Session):
+    """Devuelve (max(fecha_actualizacion), cantidad de clientes)."""
+    return tuple(
+        db.query(func.max(Clientes.fecha_actualizacion), func.count(Clientes.idCliente)).one()
+    )
+
+
 # Actualizar Cliente
 def update_cliente(db: Session, cliente_id: str, cliente: Clientes):
     db_cliente = db.query(Clientes).filter(Clientes.idCliente == cliente_id).first()
@@ -40,6 +109,8 @@ def update_cliente(db: Session, cliente_id: str, cliente: Clientes):
         db_cliente.telefono = cliente.telefono
         db_cliente.email = cliente.email
         db_cliente.fechaNacimiento = cliente.fechaNacimiento
+        db_cliente.fecha_actualizacion = datetime.utcnow()
+        publicar(db, "clientes", cliente_id)
         db.commit()
         db.refresh(db_cliente)
     return db_cliente
@@ -50,5 +121,6 @@ def delete_cliente(db: Session, cliente_id: str):
     db_cliente = db.query(Clientes).filter(Clientes.idCliente == cliente_id).first()
     if db_cliente:
         db.delete(db_cliente)
+        publicar(db, "clientes", cliente_id)
         db.commit()
     return db_cliente
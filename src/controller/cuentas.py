@@ -1,14 +1,22 @@
+from datetime import datetime
+
 from sqlalchemy.orm import Session
+from database.eventos import notificar_saldos
+from database.invalidacion import publicar
+from src.cache import cache_cuentas
 from src.entities.cuentas import Cuentas
 
 
 def create_cuenta(db: Session, cuenta: Cuentas):
+    ahora = datetime.utcnow()
     new_cuenta = Cuentas(
         idCliente=cuenta.idCliente,
         numeroCuenta=cuenta.numeroCuenta,
         tipoCuenta=cuenta.tipoCuenta,
         saldo=cuenta.saldo,
         estado=cuenta.estado,
+        fecha_creacion=ahora,
+        fecha_actualizacion=ahora,
     )
     db.add(new_cuenta)
     db.commit()
@@ -17,7 +25,7 @@ def create_cuenta(db: Session, cuenta: Cuentas):
 
 
 def get_cuenta(db: Session, cuenta_id: str):
-    return db.query(Cuentas).filter(Cuentas.idCuenta == cuenta_id).first()
+    return cache_cuentas.obtener(db, cuenta_id)
 
 
 def get_cuentas(db: Session):
@@ -32,6 +40,10 @@ def update_cuenta(db: Session, cuenta_id: str, cuenta: Cuentas):
         db_cuenta.tipoCuenta = cuenta.tipoCuenta
         db_cuenta.saldo = cuenta.saldo
         db_cuenta.estado = cuenta.estado
+        db_cuenta.fecha_actualizacion = datetime.utcnow()
+        db.flush()
+        notificar_saldos(db, [cuenta_id])
+        publicar(db, "cuentas", cuenta_id)
         db.commit()
         db.refresh(db_cuenta)
     return db_cuenta
@@ -41,5 +53,6 @@ def delete_cuenta(db: Session, cuenta_id: str):
     db_cuenta = db.query(Cuentas).filter(Cuentas.idCuenta == cuenta_id).first()
     if db_cuenta:
         db.delete(db_cuenta)
+        publicar(db, "cuentas", cuenta_id)
         db.commit()
     return db_cuenta
@@ -1,9 +1,14 @@
+from datetime import datetime
+
 from sqlalchemy.orm import Session
+from database.invalidacion import publicar
+from src.cache import instantanea_empleados
 from src.entities.empleados import Empleados
 
 
 # Crear Empleado
 def create_empleado(db: Session, empleado: Empleados):
+    ahora = datetime.utcnow()
     new_empleado = Empleados(
         nombre=empleado.nombre,
         apellido=empleado.apellido,
@@ -12,21 +17,30 @@ def create_empleado(db: Session, empleado: Empleados):
         telefono=empleado.telefono,
         email=empleado.email,
         activo=empleado.activo,
+        fecha_creacion=ahora,
+        fecha_actualizacion=ahora,
     )
     db.add(new_empleado)
+    publicar(db, "empleados")
     db.commit()
     db.refresh(new_empleado)
+    instantanea_empleados.refrescar(db, forzar=True)
     return new_empleado
 
 
 # Obtener Empleado por ID
 def get_empleado(db: Session, empleado_id: str):
-    return db.query(Empleados).filter(Empleados.idEmpleado == empleado_id).first()
+    return instantanea_empleados.obtener(db, empleado_id)
+
+
+# Obtener Empleado por documento
+def get_empleado_por_documento(db: Session, documento: str):
+    return instantanea_empleados.buscar(db, "documento", documento)
 
 
 # Listar todos los Empleados
 def get_empleados(db: Session):
-    return db.query(Empleados).all()
+    return instantanea_empleados.todas(db)
 
 
 # Actualizar Empleado
@@ -40,8 +54,11 @@ def update_empleado(db: Session, empleado_id: str, empleado: Empleados):
         db_empleado.telefono = empleado.telefono
         db_empleado.email = empleado.email
         db_empleado.activo = empleado.activo
+        db_empleado.fecha_actualizacion = datetime.utcnow()
+        publicar(db, "empleados", empleado_id)
         db.commit()
         db.refresh(db_empleado)
+        instantanea_empleados.refrescar(db, forzar=True)
     return db_empleado
 
 
@@ -50,5 +67,7 @@ def delete_empleado(db: Session, empleado_id: str):
     db_empleado = db.query(Empleados).filter(Empleados.idEmpleado == empleado_id).first()
     if db_empleado:
         db.delete(db_empleado)
+        publicar(db, "empleados", empleado_id)
         db.commit()
+        instantanea_empleados.refrescar(db, forzar=True)
     return db_empleado
@@ -1,15 +1,30 @@
+import calendar
+from datetime import datetime
+
 from sqlalchemy.orm import Session
 from src.entities.prestamos import Prestamos
 
 
+def sumar_meses(fecha: datetime, meses: int) -> datetime:
+    """Suma meses calendario, ajustando al último día del mes si hace falta."""
+    mes = fecha.month - 1 + meses
+    anio = fecha.year + mes // 12
+    mes = mes % 12 + 1
+    dia = min(fecha.day, calendar.monthrange(anio, mes)[1])
+    return fecha.replace(year=anio, month=mes, day=dia)
+
+
 def create_prestamo(db: Session, prestamo: Prestamos):
+    ahora = datetime.utcnow()
     new_prestamo = Prestamos(
         idCliente=prestamo.idCliente,
         idEmpleado=prestamo.idEmpleado,
-        monto=prestamo.monto,
+        monto=prestamo.montoPrestamo,
         interes=prestamo.interes,
-        plazo=prestamo.plazoMeses,
+        plazoMeses=prestamo.plazoMeses,
         estado=prestamo.estado,
+        fechaVencimiento=sumar_meses(ahora, int(prestamo.plazoMeses)),
+        fecha_creacion=ahora,
     )
     db.add(new_prestamo)
     db.commit()
@@ -1,5 +1,12 @@
+from datetime import datetime
+
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
+from database.eventos import notificar_transaccion
+from database.invalidacion import publicar
+from src.cache import cache_tarjetas
 from src.entities.tarjetas import Tarjetas
+from src.entities.transacciones import Transacciones
 
 
 def create_tarjeta(db: Session, tarjeta: Tarjetas):
@@ -19,7 +26,7 @@ def create_tarjeta(db: Session, tarjeta: Tarjetas):
 
 
 def get_tarjeta(db: Session, tarjeta_id: str):
-    return db.query(Tarjetas).filter(Tarjetas.idTarjeta == tarjeta_id).first()
+    return cache_tarjetas.obtener(db, tarjeta_id)
 
 
 def get_tarjetas(db: Session):
@@ -36,6 +43,7 @@ def update_tarjeta(db: Session, tarjeta_id: str, tarjeta: Tarjetas):
         db_tarjeta.saldoDisponible = tarjeta.saldoDisponible
         db_tarjeta.fechaExpiracion = tarjeta.fechaExpiracion
         db_tarjeta.estado = tarjeta.estado
+        publicar(db, "tarjetas", tarjeta_id)
         db.commit()
         db.refresh(db_tarjeta)
     return db_tarjeta
@@ -45,5 +53,75 @@ def delete_tarjeta(db: Session, tarjeta_id: str):
     db_tarjeta = db.query(Tarjetas).filter(Tarjetas.idTarjeta == tarjeta_id).first()
     if db_tarjeta:
         db.delete(db_tarjeta)
+        publicar(db, "tarjetas", tarjeta_id)
         db.commit()
     return db_tarjeta
+
+
+# Autorizar una compra con tarjeta
+def autorizar_tarjeta(db: Session, numero_tarjeta: str, monto: float, descripcion: str = None):
+    """
+    Autoriza una compra descontando el saldo disponible de la tarjeta.
+
+    La validación de estado, vigencia y saldo se hace en un único
+    ``UPDATE ... RETURNING`` condicional sobre el índice único de
+    ``numeroTarjeta``, de modo que dos autorizaciones concurrentes nunca
+    dejan el saldo en negativo. La transacción se registra en el mismo commit.
+
+    Returns:
+        tuple: (fila de la tarjeta, id de la transacción) si se aprobó,
+        o (None, motivo del rechazo) si no
+    """
+    ahora = datetime.utcnow()
+    resultado = db.execute(
+        update(Tarjetas)
+        .where(
+            Tarjetas.numeroTarjeta == numero_tarjeta,
+            Tarjetas.estado == "Activa",
+            Tarjetas.fechaExpiracion > ahora,
+            Tarjetas.saldoDisponible >= monto,
+        )
+        .values(
+            saldoDisponible=Tarjetas.saldoDisponible - monto,
+            fecha_actualizacion=ahora,
+        )
+        .returning(Tarjetas.idTarjeta, Tarjetas.idCuenta, Tarjetas.saldoDisponible)
+        .execution_options(synchronize_session=False)
+    ).first()
+
+    if resultado is None:
+        db.rollback()
+        return None, _motivo_rechazo(db, numero_tarjeta, monto, ahora)
+
+    id_transaccion = db.execute(
+        insert(Transacciones)
+        .values(
+            idCuenta=resultado.idCuenta,
+            tipo="compra",
+            monto=monto,
+            descripcion=descripcion or "Compra con tarjeta",
+            fecha=ahora,
+            fecha_creacion=ahora,
+        )
+        .returning(Transacciones.idTransaccion)
+    ).scalar_one()
+    notificar_transaccion(db, id_transaccion)
+    publicar(db, "tarjetas", resultado.idTarjeta)
+    db.commit()
+    return resultado, id_transaccion
+
+
+def _motivo_rechazo(db: Session, numero_tarjeta: str, monto: float, ahora: datetime) -> str:
+    """Determina por qué se rechazó una autorización (solo en el camino de rechazo)."""
+    tarjeta = (
+        db.query(Tarjetas.estado, Tarjetas.fechaExpiracion, Tarjetas.saldoDisponible)
+        .filter(Tarjetas.numeroTarjeta == numero_tarjeta)
+        .first()
+    )
+    if tarjeta is None:
+        return "Tarjeta no encontrada"
+    if tarjeta.estado != "Activa":
+        return f"Tarjeta en estado {tarjeta.estado}"
+    if tarjeta.fechaExpiracion is None or tarjeta.fechaExpiracion <= ahora:
+        return "Tarjeta vencida"
+    return "Saldo insuficiente"
@@ -1,17 +1,24 @@
+from datetime import datetime
+
 from sqlalchemy.orm import Session
+from database.eventos import notificar_transaccion
 from src.entities.transacciones import Transacciones
 
 
 # Crear Transacción
-def create_transaccion(db: Session, transaccion: Transacciones):
+def create_transaccion(db: Session, transaccion: Transacciones, current_user_id=None):
     new_transaccion = Transacciones(
         idCuenta=str(transaccion.idCuenta),
         tipo=transaccion.tipo,
         monto=transaccion.monto,
         fecha=transaccion.fecha,
         descripcion=transaccion.descripcion,
+        id_usuario_creacion=current_user_id,
+        fecha_creacion=datetime.utcnow(),
     )
     db.add(new_transaccion)
+    db.flush()
+    notificar_transaccion(db, new_transaccion.idTransaccion)
     db.commit()
     db.refresh(new_transaccion)
     return new_transaccion
@@ -4,6 +4,7 @@ from .prestamos import Prestamos
 from .tarjetas import Tarjetas
 from .cheques import Cheques
 from .empleados import Empleados
+from .transacciones import Transacciones
 from .usuario import Usuario  # si lo mantienes para login
 
 __all__ = [
@@ -13,5 +14,6 @@ __all__ = [
     "Tarjetas",
     "Cheques",
     "Empleados",
+    "Transacciones",
     "Usuario",
 ]
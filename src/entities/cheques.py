@@ -1,8 +1,8 @@
-import uuid
-from sqlalchemy import Column, Date, DateTime, ForeignKey, String
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Numeric, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from database.connection import Base
+from database.identificadores import generar_pk
 
 
 class Cheques(Base):
@@ -10,14 +10,24 @@ class Cheques(Base):
     Modelo de Cheque Bancario
     """
     __tablename__ = "cheques"
+    __table_args__ = (
+        # Cheques pendientes por fecha de cobro (selección de la compensación)
+        Index(
+            "ix_cheques_pendientes_cobro",
+            "fechaCobro",
+            postgresql_where=text("estado = 'pendiente'"),
+        ),
+    )
 
-    idCheque = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    idCheque = Column(UUID(as_uuid=True), primary_key=True, default=generar_pk)
     idCliente = Column(UUID(as_uuid=True), ForeignKey("clientes.idCliente"), index=True)
+    idCuenta = Column(UUID(as_uuid=True), ForeignKey("cuentas.idCuenta"), index=True, nullable=True)
 
     fechaEmision = Column(DateTime, index=True)
     fechaCobro = Column(Date, index=True, nullable=True)
-    monto = Column(String, nullable=False)
+    monto = Column(Numeric(14, 2), nullable=False)
     motivo = Column(String)
+    estado = Column(String, default="pendiente")  # pendiente, cobrado
 
     # Auditoría
     id_usuario_creacion = Column(UUID(as_uuid=True), ForeignKey("empleados.idEmpleado"))
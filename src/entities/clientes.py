@@ -11,7 +11,7 @@ class Clientes(Base):
     """
     __tablename__ = "clientes"
 
-    idCliente = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    idCliente = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
     # Datos personales del cliente
     nombre = Column(String, nullable=False)
@@ -31,6 +31,4 @@ class Clientes(Base):
     # Relaciones con las entidades financieras
     cuentas = relationship("Cuentas", back_populates="cliente")
     prestamos = relationship("Prestamos", back_populates="cliente")
-    tarjetas = relationship("Tarjetas", back_populates="cliente")
-    inversiones = relationship("Inversiones", back_populates="cliente")
     cheques = relationship("Cheques", back_populates="cliente")
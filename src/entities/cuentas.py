@@ -10,8 +10,8 @@ class Cuentas(Base):
     """
     __tablename__ = "cuentas"
 
-    idCuenta = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    idCliente = Column(UUID(as_uuid=True), ForeignKey("clientes.idCliente"), nullable=False)
+    idCuenta = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    idCliente = Column(UUID(as_uuid=True), ForeignKey("clientes.idCliente"), nullable=False, index=True)
 
     numeroCuenta = Column(String, unique=True, nullable=False, index=True)
     tipoCuenta = Column(String, nullable=False)  # Ahorros / Corriente
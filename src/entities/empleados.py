@@ -11,7 +11,7 @@ class Empleados(Base):
     """
     __tablename__ = "empleados"
 
-    idEmpleado = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    idEmpleado = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     nombre = Column(String, nullable=False)
     apellido = Column(String, nullable=False)
     documento = Column(String, unique=True, nullable=False, index=True)
@@ -25,3 +25,6 @@ class Empleados(Base):
     id_usuario_actualizacion = Column(UUID(as_uuid=True), ForeignKey("empleados.idEmpleado"))
     fecha_creacion = Column(DateTime)
     fecha_actualizacion = Column(DateTime)
+
+    # Relaciones
+    prestamos = relationship("Prestamos", back_populates="empleado", foreign_keys="Prestamos.idEmpleado")
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, Float, ForeignKey
+from sqlalchemy import Column, String, DateTime, Float, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from database.connection import Base
@@ -10,15 +10,26 @@ class Prestamos(Base):
     Modelo de Préstamo Bancario
     """
     __tablename__ = "prestamos"
+    __table_args__ = (
+        # Préstamos pendientes por fecha de vencimiento (barrido de vencimientos)
+        Index(
+            "ix_prestamos_vencimiento_pendientes",
+            "fechaVencimiento",
+            postgresql_where=text("estado = 'pendiente'"),
+        ),
+    )
 
-    idPrestamo = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    idCliente = Column(UUID(as_uuid=True), ForeignKey("clientes.idCliente"), nullable=False)
-    idEmpleado = Column(UUID(as_uuid=True), ForeignKey("empleados.idEmpleado"), nullable=False)
+    idPrestamo = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    idCliente = Column(UUID(as_uuid=True), ForeignKey("clientes.idCliente"), nullable=False, index=True)
+    idEmpleado = Column(
+        UUID(as_uuid=True), ForeignKey("empleados.idEmpleado"), nullable=False, index=True
+    )
 
     monto = Column(Float, nullable=False)
     interes = Column(Float, nullable=False)
     plazoMeses = Column(String, nullable=False)
     estado = Column(String, default="pendiente")  # pendiente, pagado, vencido
+    fechaVencimiento = Column(DateTime, nullable=True)
 
     # Auditoría
     id_usuario_creacion = Column(UUID(as_uuid=True), ForeignKey("empleados.idEmpleado"))
@@ -28,4 +39,4 @@ class Prestamos(Base):
 
     # Relaciones
     cliente = relationship("Clientes", back_populates="prestamos")
-    empleado = relationship("Empleados", back_populates="prestamos")
+    empleado = relationship("Empleados", back_populates="prestamos", foreign_keys=[idEmpleado])
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, Float, ForeignKey
+from sqlalchemy import Column, String, DateTime, Float, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from database.connection import Base
@@ -10,15 +10,23 @@ class Tarjetas(Base):
     Modelo de Tarjeta Bancaria
     """
     __tablename__ = "tarjetas"
+    __table_args__ = (
+        # Tarjetas aún no vencidas por fecha de expiración (barrido de vencimientos)
+        Index(
+            "ix_tarjetas_expiracion_vigentes",
+            "fechaExpiracion",
+            postgresql_where=text("estado <> 'Vencida'"),
+        ),
+    )
 
-    idTarjeta = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    idCuenta = Column(UUID(as_uuid=True), ForeignKey("cuentas.idCuenta"), nullable=False)
+    idTarjeta = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    idCuenta = Column(UUID(as_uuid=True), ForeignKey("cuentas.idCuenta"), nullable=False, index=True)
 
     numeroTarjeta = Column(String, unique=True, nullable=False, index=True)
     tipo = Column(String, nullable=False)  # Débito, Crédito
     limiteCredito = Column(Float, nullable=True)
     saldoDisponible = Column(Float, default=0.0)
-    estado = Column(String, default="Activa")
+    estado = Column(String, default="Activa")  # Activa, Bloqueada, Vencida
     fechaExpiracion = Column(DateTime)
 
     # Auditoría
@@ -1,8 +1,8 @@
-import uuid
 from sqlalchemy import Column, String, Numeric, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from database.connection import Base
+from database.identificadores import generar_pk
 
 class Transacciones(Base):
     """
@@ -10,8 +10,8 @@ class Transacciones(Base):
     """
     __tablename__ = "transacciones"
 
-    idTransaccion = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    idCuenta = Column(UUID(as_uuid=True), ForeignKey("cuentas.idCuenta"), nullable=False)
+    idTransaccion = Column(UUID(as_uuid=True), primary_key=True, default=generar_pk)
+    idCuenta = Column(UUID(as_uuid=True), ForeignKey("cuentas.idCuenta"), nullable=False, index=True)
 
     tipo = Column(String, nullable=False)  # depósito, retiro, transferencia
     monto = Column(Numeric(14, 2), nullable=False)
@@ -1,10 +1,10 @@
-import uuid
 from datetime import datetime
 
 from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String
 from sqlalchemy.dialects.postgresql import UUID
 
 from database.connection import Base
+from database.identificadores import generar_pk
 
 
 class Usuario(Base):
@@ -13,9 +13,7 @@ class Usuario(Base):
     """
 
     __tablename__ = "usuarios"
-    id_usuario = Column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True
-    )
+    id_usuario = Column(UUID(as_uuid=True), primary_key=True, default=generar_pk)
     username = Column(String, unique=True, index=True, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
     nombre_completo = Column(String, nullable=False)
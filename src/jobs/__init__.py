@@ -0,0 +1,16 @@
+"""
+Tareas periódicas de mantenimiento.
+"""
+
+import os
+
+from .barridos import vencer_prestamos, vencer_tarjetas
+from .planificador import Planificador, TareaPeriodica
+
+INTERVALO_VENCIMIENTOS = float(os.getenv("INTERVALO_VENCIMIENTOS_SEGUNDOS", "900"))
+
+planificador = Planificador()
+planificador.registrar("vencer_tarjetas", vencer_tarjetas, INTERVALO_VENCIMIENTOS)
+planificador.registrar("vencer_prestamos", vencer_prestamos, INTERVALO_VENCIMIENTOS)
+
+__all__ = ["planificador", "Planificador", "TareaPeriodica"]
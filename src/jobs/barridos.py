@@ -0,0 +1,79 @@
+"""
+Barridos de mantenimiento que aplican cambios de estado por fecha.
+
+Cada barrido es un UPDATE por lotes apoyado en un índice parcial sobre la
+columna de fecha, con un commit por lote para no mantener bloqueos largos.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from database.invalidacion import publicar
+
+TAMANO_LOTE = 1000
+
+
+def _actualizar_por_lotes(conn: Connection, sentencia: str, tamano_lote: int,
+                          entidad: str = None) -> int:
+    """
+    Ejecuta un UPDATE limitado por lotes hasta que no queden filas.
+
+    Si se indica `entidad`, cada lote que cambia filas invalida su caché
+    completa en todos los workers.
+
+    Returns:
+        int: Total de filas actualizadas
+    """
+    total = 0
+    ahora = datetime.utcnow()
+    while True:
+        filas = conn.execute(
+            text(sentencia), {"ahora": ahora, "lote": tamano_lote}
+        ).rowcount
+        if entidad and filas:
+            publicar(conn, entidad)
+        conn.commit()
+        total += filas
+        if filas < tamano_lote:
+            return total
+
+
+def vencer_tarjetas(conn: Connection, tamano_lote: int = TAMANO_LOTE) -> int:
+    """
+    Marca como 'Vencida' las tarjetas cuya fecha de expiración ya pasó.
+    """
+    return _actualizar_por_lotes(
+        conn,
+        """
+        UPDATE tarjetas SET estado = 'Vencida', fecha_actualizacion = :ahora
+        WHERE "idTarjeta" IN (
+            SELECT "idTarjeta" FROM tarjetas
+            WHERE estado <> 'Vencida' AND "fechaExpiracion" < :ahora
+            LIMIT :lote
+            FOR UPDATE SKIP LOCKED
+        )
+        """,
+        tamano_lote,
+        entidad="tarjetas",
+    )
+
+
+def vencer_prestamos(conn: Connection, tamano_lote: int = TAMANO_LOTE) -> int:
+    """
+    Marca como 'vencido' los préstamos pendientes cuyo plazo ya terminó.
+    """
+    return _actualizar_por_lotes(
+        conn,
+        """
+        UPDATE prestamos SET estado = 'vencido', fecha_actualizacion = :ahora
+        WHERE "idPrestamo" IN (
+            SELECT "idPrestamo" FROM prestamos
+            WHERE estado = 'pendiente' AND "fechaVencimiento" < :ahora
+            LIMIT :lote
+            FOR UPDATE SKIP LOCKED
+        )
+        """,
+        tamano_lote,
+    )
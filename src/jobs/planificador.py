@@ -0,0 +1,170 @@
+"""
+Planificador de tareas periódicas basado en asyncio.
+
+Cada tarea corre en un hilo aparte para no bloquear el event loop. Antes de
+ejecutarse reclama su turno en la tabla tareas_programadas: bloquea la fila
+de la tarea con FOR UPDATE SKIP LOCKED, comprueba que su última ejecución
+sea de hace al menos un intervalo y la actualiza en la misma transacción.
+Así, con varios workers, solo uno ejecuta la tarea en cada intervalo. El
+turno es una fila y no un advisory lock de sesión, así que funciona a
+través del pooler en modo transacción y no queda tomado si el worker muere.
+Las fechas son las de Postgres (now()), no las de cada servidor.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from database.connection import engine
+
+logger = logging.getLogger(__name__)
+
+
+# Fracción del intervalo que debe haber pasado desde la última ejecución;
+# el margen evita que el desfase entre los bucles de los workers haga
+# saltear un intervalo entero
+MARGEN_TURNO = 0.9
+
+
+class TareaPeriodica:
+    """
+    Tarea que se ejecuta cada cierto intervalo en un solo worker a la vez.
+
+    La función recibe una conexión dedicada y devuelve la cantidad de filas
+    afectadas.
+    """
+
+    def __init__(self, nombre: str, funcion: Callable[[Connection], int], intervalo: float):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.intervalo = intervalo
+
+        self.ejecuciones = 0
+        self.omitidas = 0
+        self.ultima_ejecucion: Optional[datetime] = None
+        self.ultima_duracion: Optional[float] = None
+        self.ultimas_filas: Optional[int] = None
+        self.ultimo_error: Optional[str] = None
+
+    def _reclamar_turno(self, conn: Connection) -> bool:
+        """Registra la ejecución si ninguna otra la hizo en el último intervalo."""
+        conn.execute(
+            text(
+                "INSERT INTO tareas_programadas (nombre) VALUES (:nombre) "
+                "ON CONFLICT (nombre) DO NOTHING"
+            ),
+            {"nombre": self.nombre},
+        )
+        conn.commit()
+        reclamado = conn.execute(
+            text(
+                """
+                WITH turno AS (
+                    SELECT nombre FROM tareas_programadas
+                    WHERE nombre = :nombre
+                      AND (ultima_ejecucion IS NULL
+                           OR ultima_ejecucion <= now() - make_interval(secs => :espera))
+                    FOR UPDATE SKIP LOCKED
+                )
+                UPDATE tareas_programadas AS t SET ultima_ejecucion = now()
+                FROM turno WHERE t.nombre = turno.nombre
+                RETURNING t.nombre
+                """
+            ),
+            {"nombre": self.nombre, "espera": self.intervalo * MARGEN_TURNO},
+        ).first()
+        conn.commit()
+        return reclamado is not None
+
+    def ejecutar(self) -> bool:
+        """
+        Ejecuta la tarea si le toca a este proceso en el intervalo actual.
+
+        Returns:
+            bool: True si la tarea se ejecutó, False si otro worker ya la ejecutó
+        """
+        with engine.connect() as conn:
+            if not self._reclamar_turno(conn):
+                self.omitidas += 1
+                return False
+
+            inicio = time.perf_counter()
+            self.ultima_ejecucion = datetime.utcnow()
+            try:
+                self.ultimas_filas = self.funcion(conn)
+                self.ultimo_error = None
+            except Exception as e:
+                conn.rollback()
+                self.ultimo_error = str(e)
+                logger.error(f"❌ Error en la tarea {self.nombre}: {e}")
+            finally:
+                self.ultima_duracion = time.perf_counter() - inicio
+                self.ejecuciones += 1
+
+        logger.info(
+            f"🧹 Tarea {self.nombre}: {self.ultimas_filas} filas en "
+            f"{self.ultima_duracion:.3f} s"
+        )
+        return True
+
+    def estado(self) -> dict:
+        """Métricas de la última ejecución de la tarea."""
+        return {
+            "nombre": self.nombre,
+            "intervalo_segundos": self.intervalo,
+            "ejecuciones": self.ejecuciones,
+            "omitidas": self.omitidas,
+            "ultima_ejecucion": self.ultima_ejecucion,
+            "ultima_duracion_segundos": self.ultima_duracion,
+            "ultimas_filas": self.ultimas_filas,
+            "ultimo_error": self.ultimo_error,
+        }
+
+
+class Planificador:
+    """
+    Ejecuta las tareas registradas en segundo plano sobre el event loop.
+    """
+
+    def __init__(self):
+        self.tareas: Dict[str, TareaPeriodica] = {}
+        self._corrutinas: List[asyncio.Task] = []
+
+    def registrar(self, nombre: str, funcion: Callable[[Connection], int], intervalo: float):
+        """Registra una tarea periódica."""
+        self.tareas[nombre] = TareaPeriodica(nombre, funcion, intervalo)
+
+    async def _bucle(self, tarea: TareaPeriodica):
+        # Desfase inicial para que los workers no arranquen todos a la vez
+        await asyncio.sleep(random.uniform(0, min(tarea.intervalo, 30)))
+        while True:
+            try:
+                await asyncio.to_thread(tarea.ejecutar)
+            except Exception as e:
+                logger.error(f"❌ Error ejecutando la tarea {tarea.nombre}: {e}")
+            await asyncio.sleep(tarea.intervalo)
+
+    def iniciar(self):
+        """Inicia el bucle de cada tarea en el event loop actual."""
+        if self._corrutinas:
+            return
+        for tarea in self.tareas.values():
+            self._corrutinas.append(asyncio.create_task(self._bucle(tarea)))
+        logger.info(f"⏱️  Planificador iniciado con {len(self.tareas)} tareas")
+
+    async def detener(self):
+        """Cancela las tareas en curso."""
+        for corrutina in self._corrutinas:
+            corrutina.cancel()
+        await asyncio.gather(*self._corrutinas, return_exceptions=True)
+        self._corrutinas = []
+
+    def estado(self) -> List[dict]:
+        """Estado de todas las tareas registradas."""
+        return [tarea.estado() for tarea in self.tareas.values()]
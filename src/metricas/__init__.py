@@ -0,0 +1,187 @@
+"""
+Métricas de la aplicación, expuestas en /metrics.
+"""
+
+from fastapi.routing import APIRoute
+
+from database.connection import engine
+
+from .registro import (
+    LIMITES_LATENCIA,
+    Contador,
+    Histograma,
+    Medidor,
+    MedidorCalculado,
+    Registro,
+)
+
+registro = Registro()
+
+duracion_solicitudes = registro.registrar(
+    Histograma(
+        "http_solicitudes_duracion_segundos",
+        "Duración de las solicitudes HTTP por ruta y estado",
+        ("metodo", "ruta", "estado"),
+        LIMITES_LATENCIA,
+    )
+)
+solicitudes_en_curso = registro.registrar(
+    Medidor("http_solicitudes_en_curso", "Solicitudes HTTP que se están atendiendo")
+)
+consultas_sql = registro.registrar(
+    Contador("db_consultas_total", "Consultas SQL ejecutadas por ruta", ("metodo", "ruta"))
+)
+duracion_sql = registro.registrar(
+    Contador(
+        "db_consultas_segundos_total",
+        "Tiempo acumulado en consultas SQL por ruta",
+        ("metodo", "ruta"),
+    )
+)
+duracion_bcrypt = registro.registrar(
+    Histograma(
+        "auth_bcrypt_segundos",
+        "Duración de las operaciones bcrypt",
+        ("operacion",),
+        (0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+    )
+)
+duracion_jwt = registro.registrar(
+    Histograma(
+        "auth_jwt_segundos",
+        "Duración de la creación y verificación de tokens JWT",
+        ("operacion",),
+        (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005),
+    )
+)
+plazos_vencidos = registro.registrar(
+    Contador(
+        "http_plazos_vencidos_total",
+        "Solicitudes que agotaron su plazo y respondieron 504",
+        ("metodo", "ruta"),
+    )
+)
+solicitudes_descartadas = registro.registrar(
+    Contador(
+        "http_solicitudes_descartadas_total",
+        "Solicitudes rechazadas con 503 por el límite de concurrencia",
+        ("grupo", "motivo"),
+    )
+)
+concurrencia_en_curso = registro.registrar(
+    Medidor(
+        "http_concurrencia_en_curso",
+        "Solicitudes atendidas por grupo del límite de concurrencia",
+        ("grupo",),
+    )
+)
+concurrencia_en_espera = registro.registrar(
+    Medidor(
+        "http_concurrencia_en_espera",
+        "Solicitudes esperando lugar por grupo del límite de concurrencia",
+        ("grupo",),
+    )
+)
+espera_concurrencia = registro.registrar(
+    Histograma(
+        "http_concurrencia_espera_segundos",
+        "Tiempo de espera en la cola del límite de concurrencia",
+        ("grupo",),
+        LIMITES_LATENCIA,
+    )
+)
+cache_aciertos = registro.registrar(
+    Contador("cache_aciertos_total", "Lecturas resueltas por la caché de entidades", ("cache",))
+)
+cache_fallos = registro.registrar(
+    Contador("cache_fallos_total", "Lecturas que la caché de entidades llevó a la base", ("cache",))
+)
+cache_desalojos = registro.registrar(
+    Contador(
+        "cache_desalojos_total",
+        "Entradas desalojadas por superar el tamaño de la caché de entidades",
+        ("cache",),
+    )
+)
+bytes_compresion = registro.registrar(
+    Contador(
+        "http_compresion_bytes_total",
+        "Bytes de respuesta antes (entrada) y después (salida) de comprimir",
+        ("algoritmo", "sentido"),
+    )
+)
+eventos_sse = registro.registrar(
+    Contador("sse_eventos_total", "Eventos entregados a suscriptores SSE", ("evento",))
+)
+desbordes_sse = registro.registrar(
+    Contador(
+        "sse_desbordes_total",
+        "Suscriptores SSE con la cola llena a los que se pidió resincronizar",
+    )
+)
+
+
+def _estado_pool() -> dict:
+    pool = engine.pool
+    return {
+        ("en_uso",): pool.checkedout(),
+        ("disponibles",): pool.checkedin(),
+        ("desbordadas",): max(pool.overflow(), 0),
+    }
+
+
+registro.registrar(
+    MedidorCalculado(
+        "db_pool_conexiones", "Conexiones del pool por estado", _estado_pool, ("estado",)
+    )
+)
+registro.registrar(
+    MedidorCalculado(
+        "db_pool_tamano", "Tamaño configurado del pool", lambda: {(): engine.pool.size()}
+    )
+)
+
+for operacion in ("hash", "verificar"):
+    duracion_bcrypt.preregistrar(operacion)
+for operacion in ("crear", "verificar"):
+    duracion_jwt.preregistrar(operacion)
+
+
+def preregistrar_rutas(app):
+    """
+    Publica en cero las series de cada ruta de la aplicación.
+
+    Evita que una ruta aparezca recién con su primera solicitud, y que los
+    diccionarios de series crezcan durante el tráfico normal.
+    """
+    for ruta in app.routes:
+        if not isinstance(ruta, APIRoute):
+            continue
+        for metodo in ruta.methods:
+            duracion_solicitudes.preregistrar(metodo, ruta.path, "200")
+            consultas_sql.preregistrar(metodo, ruta.path)
+            duracion_sql.preregistrar(metodo, ruta.path)
+            plazos_vencidos.preregistrar(metodo, ruta.path)
+
+
+__all__ = [
+    "registro",
+    "duracion_solicitudes",
+    "solicitudes_en_curso",
+    "consultas_sql",
+    "duracion_sql",
+    "duracion_bcrypt",
+    "duracion_jwt",
+    "plazos_vencidos",
+    "solicitudes_descartadas",
+    "concurrencia_en_curso",
+    "concurrencia_en_espera",
+    "espera_concurrencia",
+    "cache_aciertos",
+    "cache_fallos",
+    "cache_desalojos",
+    "bytes_compresion",
+    "eventos_sse",
+    "desbordes_sse",
+    "preregistrar_rutas",
+]
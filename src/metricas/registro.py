@@ -0,0 +1,173 @@
+"""
+Primitivas de métricas con exposición en formato de texto de Prometheus.
+
+Cada hilo escribe en su propio fragmento (threading.local), así que
+registrar una observación no toma ningún lock: el lock solo se usa la
+primera vez que un hilo escribe en una métrica, para anotar su fragmento.
+Al exponer se suman los fragmentos de todos los hilos; una lectura
+concurrente puede quedar una observación atrás, lo cual es aceptable.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+LIMITES_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _etiquetas(nombres: Tuple[str, ...], valores: Tuple, extra: str = "") -> str:
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _numero(valor: float) -> str:
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class _Metrica:
+    """Base con los fragmentos por hilo y las series pre-registradas."""
+
+    tipo = ""
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = ()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = etiquetas
+        self._local = threading.local()
+        self._fragmentos: List[Dict] = []
+        self._lock = threading.Lock()
+        self._preregistradas = set()
+
+    def _fragmento(self) -> Dict:
+        try:
+            return self._local.datos
+        except AttributeError:
+            datos = self._local.datos = {}
+            with self._lock:
+                self._fragmentos.append(datos)
+            return datos
+
+    def preregistrar(self, *valores):
+        """Publica la serie en cero antes de su primera observación."""
+        self._preregistradas.add(tuple(valores))
+
+    def _series(self) -> Dict[Tuple, list]:
+        raise NotImplementedError
+
+    def exponer(self) -> List[str]:
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} {self.tipo}"]
+        lineas.extend(self._lineas(self._series()))
+        return lineas
+
+
+class Contador(_Metrica):
+    """Contador monótono, por ejemplo consultas o segundos acumulados."""
+
+    tipo = "counter"
+
+    def inc(self, valor: float = 1, *etiquetas):
+        datos = self._fragmento()
+        datos[etiquetas] = datos.get(etiquetas, 0) + valor
+
+    def _series(self):
+        series = {clave: 0 for clave in self._preregistradas}
+        for fragmento in list(self._fragmentos):
+            for clave, valor in list(fragmento.items()):
+                series[clave] = series.get(clave, 0) + valor
+        return series
+
+    def _lineas(self, series):
+        for clave, valor in sorted(series.items()):
+            yield f"{self.nombre}{_etiquetas(self.etiquetas, clave)} {_numero(valor)}"
+
+
+class Histograma(_Metrica):
+    """Histograma con límites fijos; guarda conteos por cubeta, suma y total."""
+
+    tipo = "histogram"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = (),
+                 limites: Iterable[float] = LIMITES_LATENCIA):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.limites = tuple(sorted(limites))
+
+    def observar(self, valor: float, *etiquetas):
+        datos = self._fragmento()
+        serie = datos.get(etiquetas)
+        if serie is None:
+            # Cubetas (la última es +Inf), suma y total
+            serie = datos[etiquetas] = [0] * (len(self.limites) + 1) + [0.0, 0]
+        serie[bisect_left(self.limites, valor)] += 1
+        serie[-2] += valor
+        serie[-1] += 1
+
+    def _series(self):
+        vacia = [0] * (len(self.limites) + 1) + [0.0, 0]
+        series = {clave: list(vacia) for clave in self._preregistradas}
+        for fragmento in list(self._fragmentos):
+            for clave, serie in list(fragmento.items()):
+                total = series.setdefault(clave, list(vacia))
+                for i, valor in enumerate(serie):
+                    total[i] += valor
+        return series
+
+    def _lineas(self, series):
+        for clave, serie in sorted(series.items()):
+            acumulado = 0
+            for limite, conteo in zip(self.limites + (float("inf"),), serie):
+                acumulado += conteo
+                le = "+Inf" if limite == float("inf") else _numero(limite)
+                etiquetas = _etiquetas(self.etiquetas, clave, 'le="' + le + '"')
+                yield f"{self.nombre}_bucket{etiquetas} {acumulado}"
+            yield f"{self.nombre}_sum{_etiquetas(self.etiquetas, clave)} {_numero(serie[-2])}"
+            yield f"{self.nombre}_count{_etiquetas(self.etiquetas, clave)} {serie[-1]}"
+
+
+class Medidor(Contador):
+    """Valor que sube y baja, por ejemplo las solicitudes en curso."""
+
+    tipo = "gauge"
+
+    def dec(self, valor: float = 1, *etiquetas):
+        self.inc(-valor, *etiquetas)
+
+
+class MedidorCalculado(_Metrica):
+    """Valor instantáneo que se calcula al exponer con una función."""
+
+    tipo = "gauge"
+
+    def __init__(self, nombre: str, ayuda: str, funcion: Callable[[], Dict[Tuple, float]],
+                 etiquetas: Tuple[str, ...] = ()):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.funcion = funcion
+
+    def _series(self):
+        return self.funcion()
+
+    def _lineas(self, series):
+        for clave, valor in sorted(series.items()):
+            yield f"{self.nombre}{_etiquetas(self.etiquetas, clave)} {_numero(valor)}"
+
+
+class Registro:
+    """Conjunto de métricas que se exponen juntas en /metrics."""
+
+    def __init__(self):
+        self.metricas: List[_Metrica] = []
+
+    def registrar(self, metrica: _Metrica) -> _Metrica:
+        self.metricas.append(metrica)
+        return metrica
+
+    def exponer(self) -> str:
+        lineas = []
+        for metrica in self.metricas:
+            lineas.extend(metrica.exponer())
+        return "\n".join(lineas) + "\n"
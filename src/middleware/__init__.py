@@ -0,0 +1,22 @@
+"""
+Middlewares ASGI de la aplicación.
+"""
+
+from .captura import CapturaMiddleware
+from .compresion import CompresionMiddleware
+from .consultas import ConsultasSQLMiddleware
+from .limites import GrupoConcurrencia, LimitesMiddleware
+from .metricas import MetricasMiddleware
+from .perfilamiento import PerfilamientoMiddleware
+from .plazos import PlazosMiddleware
+
+__all__ = [
+    "CapturaMiddleware",
+    "CompresionMiddleware",
+    "ConsultasSQLMiddleware",
+    "GrupoConcurrencia",
+    "LimitesMiddleware",
+    "MetricasMiddleware",
+    "PerfilamientoMiddleware",
+    "PlazosMiddleware",
+]
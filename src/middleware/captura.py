@@ -0,0 +1,195 @@
+"""
+Captura de tráfico real para reproducirlo en pruebas de carga.
+
+Guarda una muestra de las solicitudes (método, ruta, cuerpo, estado y
+duración) en un archivo JSONL. Es opcional: main.py solo lo instala con
+CAPTURA_ACTIVA=1. La escritura la hace un hilo en segundo plano, así que
+una solicitud muestreada solo paga el costo de encolar su registro; si la
+cola se llena, el registro se descarta en lugar de frenar la solicitud.
+
+Las credenciales nunca se escriben: la cabecera Authorization y los campos
+sensibles del cuerpo se reemplazan por REDACTADO, y los números de tarjeta
+se guardan enmascarados salvo sus últimos 4 dígitos. Los cuerpos que no son
+JSON ni formulario no se pueden redactar, así que se descartan. De la
+query string solo se conservan los valores de CONSULTA_PERMITIDOS (tamaños
+y fechas de corte); el resto, como el término de /clientes/buscar, puede
+ser un nombre o un documento y se redacta.
+"""
+
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode
+
+logger = logging.getLogger(__name__)
+
+REDACTADO = "<redactado>"
+CAMPOS_SENSIBLES = {"password", "clave", "token", "access_token", "cvv"}
+CAMPOS_ENMASCARADOS = {"numerotarjeta"}
+CONSULTA_PERMITIDOS = {"limite", "tamano_lote", "max_lotes", "fecha_corte"}
+CABECERAS_CAPTURADAS = {b"content-type", b"accept", b"x-request-timeout"}
+
+
+def _enmascarar(valor):
+    """Deja visibles solo los últimos 4 caracteres de un número de tarjeta."""
+    if not isinstance(valor, str):
+        return REDACTADO
+    return "*" * max(len(valor) - 4, 0) + valor[-4:]
+
+
+def _redactar_campo(clave: str, valor):
+    clave = clave.lower()
+    if clave in CAMPOS_SENSIBLES:
+        return REDACTADO
+    if clave in CAMPOS_ENMASCARADOS:
+        return _enmascarar(valor)
+    return _redactar(valor)
+
+
+def _redactar(valor):
+    """Reemplaza los campos sensibles de un cuerpo JSON, a cualquier profundidad."""
+    if isinstance(valor, dict):
+        return {k: _redactar_campo(k, v) for k, v in valor.items()}
+    if isinstance(valor, list):
+        return [_redactar(v) for v in valor]
+    return valor
+
+
+def _redactar_consulta(consulta: str) -> str:
+    """Redacta los valores de la query string salvo los de CONSULTA_PERMITIDOS."""
+    return urlencode([
+        (k, v if k.lower() in CONSULTA_PERMITIDOS else REDACTADO)
+        for k, v in parse_qsl(consulta, keep_blank_values=True)
+    ])
+
+
+class EscritorCaptura:
+    """
+    Hilo que escribe los registros capturados al archivo JSONL.
+    """
+
+    def __init__(self, archivo: str, capacidad: int = 10_000):
+        self.archivo = archivo
+        self.cola = queue.Queue(maxsize=capacidad)
+        self.descartados = 0
+        directorio = os.path.dirname(archivo)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self._hilo = threading.Thread(target=self._escribir, name="captura", daemon=True)
+        self._hilo.start()
+
+    def encolar(self, registro: dict):
+        try:
+            self.cola.put_nowait(registro)
+        except queue.Full:
+            self.descartados += 1
+
+    def _escribir(self):
+        with open(self.archivo, "a", encoding="utf-8") as salida:
+            while True:
+                registros = [self.cola.get()]
+                # Se escribe todo lo acumulado de una vez y se vacía el buffer
+                while True:
+                    try:
+                        registros.append(self.cola.get_nowait())
+                    except queue.Empty:
+                        break
+                for registro in registros:
+                    salida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                salida.flush()
+
+
+class CapturaMiddleware:
+    """
+    Middleware ASGI que muestrea solicitudes HTTP hacia un archivo JSONL.
+
+    Args:
+        app: Aplicación ASGI
+        archivo: Ruta del archivo de captura
+        muestreo: Fracción de solicitudes capturadas (0 a 1)
+        max_cuerpo: Bytes máximos del cuerpo que se guardan
+    """
+
+    def __init__(self, app, archivo: str, muestreo: float = 0.01, max_cuerpo: int = 64 * 1024):
+        self.app = app
+        self.muestreo = muestreo
+        self.max_cuerpo = max_cuerpo
+        self.escritor = EscritorCaptura(archivo)
+        logger.info(f"📼 Capturando {muestreo:.1%} de las solicitudes en {archivo}")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= self.muestreo:
+            await self.app(scope, receive, send)
+            return
+
+        partes = []
+        tamano = 0
+        estado = 500
+
+        async def receive_capturado():
+            nonlocal tamano
+            mensaje = await receive()
+            if mensaje["type"] == "http.request":
+                cuerpo = mensaje.get("body", b"")
+                if tamano < self.max_cuerpo:
+                    partes.append(cuerpo[: self.max_cuerpo - tamano])
+                tamano += len(cuerpo)
+            return mensaje
+
+        async def send_capturado(mensaje):
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+            await send(mensaje)
+
+        instante = time.time()
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive_capturado, send_capturado)
+        finally:
+            duracion_ms = (time.perf_counter() - inicio) * 1000
+            self.escritor.encolar(
+                self._registro(scope, b"".join(partes), tamano, estado, instante, duracion_ms)
+            )
+
+    def _registro(self, scope, cuerpo: bytes, tamano: int, estado: int,
+                  instante: float, duracion_ms: float) -> dict:
+        cabeceras = {}
+        autenticado = False
+        for nombre, valor in scope.get("headers", []):
+            if nombre == b"authorization":
+                autenticado = True
+            elif nombre in CABECERAS_CAPTURADAS:
+                cabeceras[nombre.decode("latin-1")] = valor.decode("latin-1")
+
+        ruta = scope.get("route")
+        registro = {
+            "instante": instante,
+            "metodo": scope["method"],
+            "ruta": scope["path"],
+            "plantilla": getattr(ruta, "path", None),
+            "consulta": _redactar_consulta(scope.get("query_string", b"").decode("latin-1")),
+            "cabeceras": cabeceras,
+            "autenticado": autenticado,
+            "estado": estado,
+            "duracion_ms": round(duracion_ms, 3),
+        }
+
+        if tamano > len(cuerpo):
+            # Un cuerpo truncado no se puede reproducir ni redactar con seguridad
+            registro["cuerpo_truncado"] = tamano
+        elif cuerpo:
+            tipo = cabeceras.get("content-type", "")
+            if tipo.startswith("application/x-www-form-urlencoded"):
+                registro["formulario"] = _redactar(dict(parse_qsl(cuerpo.decode("latin-1"))))
+            else:
+                try:
+                    registro["cuerpo"] = _redactar(json.loads(cuerpo))
+                except ValueError:
+                    # Un cuerpo que no es JSON ni formulario no se puede redactar
+                    registro["cuerpo_descartado"] = tamano
+        return registro
@@ -0,0 +1,236 @@
+"""
+Compresión de respuestas con negociación de Accept-Encoding.
+
+Comprime con gzip y, si están instalados los paquetes `brotli` o
+`zstandard`, también con br y zstd. De lo que acepta el cliente (respetando
+los valores q) se usa el primero de `algoritmos` en el orden del servidor.
+
+La respuesta se comprime por partes a medida que la aplicación la envía:
+cada parte se comprime y se vacía (flush) antes de pasarla al servidor, así
+que una respuesta en streaming llega al cliente al mismo ritmo que sin
+comprimir y nunca se guarda entera en memoria. Solo se retiene el comienzo
+hasta juntar `minimo` bytes, para decidir si vale la pena comprimir.
+
+No se comprimen los eventos SSE (text/event-stream, donde cada evento debe
+llegar apenas se emite), los tipos ya comprimidos ni las respuestas que ya
+traen Content-Encoding.
+"""
+
+import zlib
+from typing import Iterable, Optional
+
+from src.metricas import bytes_compresion
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+TIPOS_COMPRIMIBLES = (
+    "text/",
+    "application/json",
+    "application/problem+json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+TIPOS_EXCLUIDOS = ("text/event-stream",)
+
+
+class _Gzip:
+    nombre = "gzip"
+
+    def __init__(self, nivel: int):
+        self._compresor = zlib.compressobj(nivel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def parte(self, datos: bytes) -> bytes:
+        return self._compresor.compress(datos) + self._compresor.flush(zlib.Z_SYNC_FLUSH)
+
+    def final(self, datos: bytes) -> bytes:
+        return self._compresor.compress(datos) + self._compresor.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    nombre = "br"
+
+    def __init__(self, nivel: int):
+        self._compresor = brotli.Compressor(quality=nivel)
+
+    def parte(self, datos: bytes) -> bytes:
+        return self._compresor.process(datos) + self._compresor.flush()
+
+    def final(self, datos: bytes) -> bytes:
+        return self._compresor.process(datos) + self._compresor.finish()
+
+
+class _Zstd:
+    nombre = "zstd"
+
+    def __init__(self, nivel: int):
+        self._compresor = zstandard.ZstdCompressor(level=nivel).compressobj()
+
+    def parte(self, datos: bytes) -> bytes:
+        return (self._compresor.compress(datos)
+                + self._compresor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK))
+
+    def final(self, datos: bytes) -> bytes:
+        return self._compresor.compress(datos) + self._compresor.flush()
+
+
+CODIFICADORES = {"gzip": _Gzip}
+if brotli is not None:
+    CODIFICADORES["br"] = _Brotli
+if zstandard is not None:
+    CODIFICADORES["zstd"] = _Zstd
+
+
+def elegir_codificacion(aceptadas: str, algoritmos: Iterable[str]) -> Optional[str]:
+    """
+    Elige la codificación para una cabecera Accept-Encoding.
+
+    Returns:
+        str: El primero de `algoritmos` que el cliente acepta con q > 0, o None
+    """
+    calidades = {}
+    for entrada in aceptadas.lower().split(","):
+        nombre, _, parametros = entrada.partition(";")
+        nombre = nombre.strip()
+        if not nombre:
+            continue
+        calidad = 1.0
+        for parametro in parametros.split(";"):
+            clave, _, valor = parametro.partition("=")
+            if clave.strip() == "q":
+                try:
+                    calidad = float(valor)
+                except ValueError:
+                    calidad = 0.0
+        calidades[nombre] = calidad
+
+    comodin = calidades.get("*", 0.0)
+    for algoritmo in algoritmos:
+        if calidades.get(algoritmo, comodin) > 0:
+            return algoritmo
+    return None
+
+
+def _comprimible(cabeceras: dict) -> bool:
+    if b"content-encoding" in cabeceras:
+        return False
+    tipo = cabeceras.get(b"content-type", b"").decode("latin-1").lower()
+    if tipo.startswith(TIPOS_EXCLUIDOS):
+        return False
+    return tipo.startswith(TIPOS_COMPRIMIBLES)
+
+
+class CompresionMiddleware:
+    """
+    Middleware ASGI que comprime las respuestas HTTP.
+
+    Args:
+        app: Aplicación ASGI
+        minimo: Bytes a partir de los cuales se comprime
+        niveles: Nivel por algoritmo ("gzip", "br", "zstd")
+        algoritmos: Preferencia del servidor; los no instalados se ignoran
+    """
+
+    def __init__(self, app, minimo: int = 1024, niveles: Optional[dict] = None,
+                 algoritmos: Iterable[str] = ("zstd", "br", "gzip")):
+        self.app = app
+        self.minimo = minimo
+        self.niveles = {"gzip": 6, "br": 4, "zstd": 3, **(niveles or {})}
+        self.algoritmos = tuple(a for a in algoritmos if a in CODIFICADORES)
+        for algoritmo in self.algoritmos:
+            bytes_compresion.preregistrar(algoritmo, "entrada")
+            bytes_compresion.preregistrar(algoritmo, "salida")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        aceptadas = b""
+        for nombre, valor in scope["headers"]:
+            if nombre == b"accept-encoding":
+                aceptadas += valor + b","
+        algoritmo = elegir_codificacion(aceptadas.decode("latin-1"), self.algoritmos)
+        if algoritmo is None:
+            await self.app(scope, receive, send)
+            return
+
+        inicio = None
+        pendiente = b""
+        codificador = None
+        # None: todavía no se decidió; False: se envía sin comprimir
+        comprimir = None
+
+        async def send_comprimido(mensaje):
+            nonlocal inicio, pendiente, codificador, comprimir
+
+            if mensaje["type"] == "http.response.start":
+                inicio = mensaje
+                cabeceras = dict(mensaje.get("headers", ()))
+                if not _comprimible(cabeceras) or mensaje["status"] in (204, 304):
+                    comprimir = False
+                    await send(mensaje)
+                    return
+                longitud = cabeceras.get(b"content-length")
+                if longitud is not None and int(longitud) < self.minimo:
+                    comprimir = False
+                    await send(_con_vary(mensaje))
+                return
+
+            if mensaje["type"] != "http.response.body" or comprimir is False:
+                await send(mensaje)
+                return
+
+            cuerpo = mensaje.get("body", b"")
+            mas = mensaje.get("more_body", False)
+
+            if comprimir is None:
+                pendiente += cuerpo
+                if mas and len(pendiente) < self.minimo:
+                    return
+                if not mas and len(pendiente) < self.minimo:
+                    comprimir = False
+                    await send(_con_vary(inicio))
+                    await send({"type": "http.response.body", "body": pendiente})
+                    return
+                comprimir = True
+                codificador = CODIFICADORES[algoritmo](self.niveles[algoritmo])
+                await send({**inicio, "headers": _cabeceras_comprimidas(inicio["headers"], algoritmo)})
+                cuerpo, pendiente = pendiente, b""
+
+            salida = codificador.parte(cuerpo) if mas else codificador.final(cuerpo)
+            bytes_compresion.inc(len(cuerpo), algoritmo, "entrada")
+            bytes_compresion.inc(len(salida), algoritmo, "salida")
+            await send({"type": "http.response.body", "body": salida, "more_body": mas})
+
+        await self.app(scope, receive, send_comprimido)
+
+
+def _con_vary(mensaje: dict) -> dict:
+    cabeceras = [c for c in mensaje.get("headers", ()) if c[0] != b"vary"]
+    vary = [v for n, v in mensaje.get("headers", ()) if n == b"vary"]
+    if not any(b"accept-encoding" in v.lower() for v in vary):
+        vary.append(b"Accept-Encoding")
+    cabeceras.append((b"vary", b", ".join(vary)))
+    return {**mensaje, "headers": cabeceras}
+
+
+def _cabeceras_comprimidas(cabeceras: list, algoritmo: str) -> list:
+    resultado = []
+    for nombre, valor in _con_vary({"headers": cabeceras})["headers"]:
+        if nombre == b"content-length":
+            continue
+        if nombre == b"etag" and not valor.startswith(b"W/"):
+            # Los bytes cambian: un ETag fuerte deja de ser válido tal cual
+            valor = b"W/" + valor
+        resultado.append((nombre, valor))
+    resultado.append((b"content-encoding", algoritmo.encode()))
+    return resultado
@@ -0,0 +1,88 @@
+"""
+Middleware que reporta las consultas SQL de cada solicitud.
+"""
+
+import logging
+import time
+
+from database.instrumentacion import (
+    estadisticas_actuales,
+    finalizar_estadisticas,
+    iniciar_estadisticas,
+)
+
+logger = logging.getLogger(__name__)
+
+SIN_RUTA = "sin_ruta"
+MAX_FORMA_EN_LOG = 300
+
+
+class ConsultasSQLMiddleware:
+    """
+    Middleware ASGI que acumula las consultas SQL de cada solicitud.
+
+    Agrega a la respuesta la cabecera Server-Timing con el tiempo en la base
+    de datos y la cantidad de consultas (visible en las herramientas de
+    desarrollo del navegador), registra el resumen en el log con nivel DEBUG
+    y emite una advertencia cuando una misma forma de consulta se ejecuta
+    más de `umbral_repeticiones` veces en la solicitud, el síntoma típico de
+    un N+1.
+
+    Debe instalarse por fuera de MetricasMiddleware para que ambos
+    compartan las mismas estadísticas. Si quien llama a la aplicación ya
+    está acumulando consultas (la suite de benchmarks), usa esas.
+    """
+
+    def __init__(self, app, umbral_repeticiones: int = 10, server_timing: bool = True):
+        self.app = app
+        self.umbral_repeticiones = umbral_repeticiones
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        estado = 500
+
+        async def send_con_tiempos(mensaje):
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+                if self.server_timing:
+                    total_ms = (time.perf_counter() - inicio) * 1000
+                    valor = (
+                        f'db;dur={estadisticas.segundos * 1000:.2f};'
+                        f'desc="{estadisticas.consultas} consultas", app;dur={total_ms:.2f}'
+                    )
+                    mensaje["headers"] = list(mensaje.get("headers", [])) + [
+                        (b"server-timing", valor.encode("latin-1"))
+                    ]
+            await send(mensaje)
+
+        estadisticas, token = estadisticas_actuales(), None
+        if estadisticas is None:
+            estadisticas, token = iniciar_estadisticas(scope)
+        elif estadisticas.alcance is None:
+            estadisticas.alcance = scope
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_con_tiempos)
+        finally:
+            duracion_ms = (time.perf_counter() - inicio) * 1000
+            if token is not None:
+                finalizar_estadisticas(token)
+
+            metodo = scope["method"]
+            ruta = getattr(scope.get("route"), "path", SIN_RUTA)
+            logger.debug(
+                "%s %s %s en %.1f ms: %d consultas SQL (%.1f ms)",
+                metodo, ruta, estado, duracion_ms,
+                estadisticas.consultas, estadisticas.segundos * 1000,
+            )
+            for forma, veces, segundos in estadisticas.repetidas(self.umbral_repeticiones):
+                logger.warning(
+                    "⚠️  Posible N+1 en %s %s: la misma consulta se ejecutó %d veces "
+                    "(%.1f ms): %s",
+                    metodo, ruta, veces, segundos * 1000, forma[:MAX_FORMA_EN_LOG],
+                )
@@ -0,0 +1,220 @@
+"""
+Límite de concurrencia por grupo de rutas y descarte de carga.
+
+Sin límite, cada solicitud síncrona espera su turno en el threadpool de
+anyio y, bajo sobrecarga, la cola crece sin tope y la latencia sube para
+todas las rutas por igual. Este middleware admite a lo sumo `total`
+solicitudes a la vez, reparte ese cupo entre grupos de rutas con su propio
+límite y pone a esperar al resto en colas acotadas. Cuando se libera un
+lugar lo recibe primero el grupo de mayor prioridad (menor número), así que
+las operaciones transaccionales pasan antes que las consultas y reportes.
+
+Si la cola del grupo está llena, o la espera supera `espera_maxima` (o lo
+que le queda al plazo de la solicitud), se responde 503 con Retry-After.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Iterable, List, Optional
+
+from fastapi.responses import JSONResponse
+
+from database.plazos import tiempo_restante
+from src.metricas import (
+    concurrencia_en_curso,
+    concurrencia_en_espera,
+    espera_concurrencia,
+    solicitudes_descartadas,
+)
+
+COLA_LLENA = "cola_llena"
+ESPERA_AGOTADA = "espera_agotada"
+
+
+class GrupoConcurrencia:
+    """
+    Grupo de rutas con su propio límite de solicitudes en curso.
+
+    Una solicitud pertenece al primer grupo cuyas `rutas` (prefijos, con o
+    sin método: "/auth", "POST /tarjetas/autorizar") o `metodos` coinciden.
+    Un grupo sin rutas ni métodos recibe todo lo demás.
+
+    Args:
+        nombre: Nombre del grupo en las métricas
+        limite: Solicitudes del grupo atendidas a la vez
+        cola: Solicitudes del grupo que pueden esperar un lugar
+        prioridad: Orden para repartir los lugares libres (0 es la más alta)
+        espera_maxima: Segundos que una solicitud espera antes de descartarse
+        rutas: Prefijos de ruta del grupo
+        metodos: Métodos HTTP del grupo
+    """
+
+    def __init__(self, nombre: str, limite: int, cola: int, prioridad: int = 0,
+                 espera_maxima: float = 2.0, rutas: Iterable[str] = (),
+                 metodos: Iterable[str] = ()):
+        self.nombre = nombre
+        self.limite = limite
+        self.cola = cola
+        self.prioridad = prioridad
+        self.espera_maxima = espera_maxima
+        self.rutas = tuple(rutas)
+        self.metodos = frozenset(metodos)
+        self.en_curso = 0
+        self.espera = deque()
+
+    def coincide(self, metodo: str, ruta: str) -> bool:
+        if not self.rutas and not self.metodos:
+            return True
+        if metodo in self.metodos:
+            return True
+        con_metodo = f"{metodo} {ruta}"
+        return any(con_metodo.startswith(p) or ruta.startswith(p) for p in self.rutas)
+
+    @property
+    def reintentar_en(self) -> int:
+        return max(1, math.ceil(self.espera_maxima))
+
+
+class LimitadorConcurrencia:
+    """
+    Reparte `total` lugares entre los grupos según su límite y prioridad.
+
+    Todo ocurre en el event loop, así que los contadores no necesitan lock.
+    """
+
+    def __init__(self, total: int, grupos: List[GrupoConcurrencia]):
+        self.total = total
+        self.grupos = grupos
+        self.por_prioridad = sorted(grupos, key=lambda g: g.prioridad)
+        self.en_curso = 0
+        for grupo in grupos:
+            concurrencia_en_curso.preregistrar(grupo.nombre)
+            concurrencia_en_espera.preregistrar(grupo.nombre)
+            espera_concurrencia.preregistrar(grupo.nombre)
+            for motivo in (COLA_LLENA, ESPERA_AGOTADA):
+                solicitudes_descartadas.preregistrar(grupo.nombre, motivo)
+
+    def grupo_para(self, metodo: str, ruta: str) -> Optional[GrupoConcurrencia]:
+        for grupo in self.grupos:
+            if grupo.coincide(metodo, ruta):
+                return grupo
+        return None
+
+    def _hay_lugar(self, grupo: GrupoConcurrencia) -> bool:
+        return grupo.en_curso < grupo.limite and self.en_curso < self.total
+
+    def _ocupar(self, grupo: GrupoConcurrencia):
+        grupo.en_curso += 1
+        self.en_curso += 1
+        concurrencia_en_curso.inc(1, grupo.nombre)
+
+    def _puede_pasar(self, grupo: GrupoConcurrencia) -> bool:
+        """Hay lugar y nadie de su grupo o de mayor prioridad está esperando uno."""
+        if grupo.espera or not self._hay_lugar(grupo):
+            return False
+        return not any(
+            g.espera and g.prioridad < grupo.prioridad and g.en_curso < g.limite
+            for g in self.por_prioridad
+        )
+
+    async def entrar(self, grupo: GrupoConcurrencia) -> Optional[str]:
+        """
+        Espera un lugar para una solicitud del grupo.
+
+        Returns:
+            str: Motivo del descarte, o None si la solicitud puede seguir
+        """
+        if self._puede_pasar(grupo):
+            self._ocupar(grupo)
+            return None
+        if len(grupo.espera) >= grupo.cola:
+            solicitudes_descartadas.inc(1, grupo.nombre, COLA_LLENA)
+            return COLA_LLENA
+
+        espera = grupo.espera_maxima
+        restante = tiempo_restante()
+        if restante is not None:
+            espera = min(espera, max(restante, 0))
+
+        turno = asyncio.get_running_loop().create_future()
+        grupo.espera.append(turno)
+        concurrencia_en_espera.inc(1, grupo.nombre)
+        inicio = time.perf_counter()
+        try:
+            await asyncio.wait({turno}, timeout=espera)
+        except asyncio.CancelledError:
+            if turno.done():
+                self.salir(grupo)
+            raise
+        finally:
+            if not turno.done():
+                turno.cancel()
+                grupo.espera.remove(turno)
+            concurrencia_en_espera.dec(1, grupo.nombre)
+            espera_concurrencia.observar(time.perf_counter() - inicio, grupo.nombre)
+
+        if turno.cancelled():
+            solicitudes_descartadas.inc(1, grupo.nombre, ESPERA_AGOTADA)
+            return ESPERA_AGOTADA
+        return None
+
+    def salir(self, grupo: GrupoConcurrencia):
+        """Libera el lugar de una solicitud y se lo da a la siguiente en espera."""
+        grupo.en_curso -= 1
+        self.en_curso -= 1
+        concurrencia_en_curso.dec(1, grupo.nombre)
+        for candidato in self.por_prioridad:
+            while candidato.espera and self._hay_lugar(candidato):
+                turno = candidato.espera.popleft()
+                self._ocupar(candidato)
+                turno.set_result(None)
+
+
+class LimitesMiddleware:
+    """
+    Middleware ASGI que aplica un LimitadorConcurrencia a las solicitudes HTTP.
+
+    Args:
+        app: Aplicación ASGI
+        total: Solicitudes atendidas a la vez entre todos los grupos
+        grupos: Grupos en orden de coincidencia
+        exentas: Prefijos de ruta que nunca se limitan (sondas, métricas)
+        flujos: Sufijos de las rutas de streaming (SSE), que tampoco se limitan:
+            esperan eventos en el event loop sin ocupar hilos, y su tope es
+            el del difusor de src.tiempo_real
+    """
+
+    def __init__(self, app, total: int, grupos: List[GrupoConcurrencia],
+                 exentas: Iterable[str] = ("/health", "/metrics"),
+                 flujos: Iterable[str] = ("/stream",)):
+        self.app = app
+        self.limitador = LimitadorConcurrencia(total, grupos)
+        self.exentas = tuple(exentas)
+        self.flujos = tuple(flujos)
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or scope["path"].startswith(self.exentas)
+                or scope["path"].endswith(self.flujos)):
+            await self.app(scope, receive, send)
+            return
+
+        grupo = self.limitador.grupo_para(scope["method"], scope["path"])
+        if grupo is None:
+            await self.app(scope, receive, send)
+            return
+
+        if await self.limitador.entrar(grupo) is not None:
+            respuesta = JSONResponse(
+                {"detail": "Servidor sobrecargado, reintente más tarde"},
+                status_code=503,
+                headers={"Retry-After": str(grupo.reintentar_en)},
+            )
+            await respuesta(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limitador.salir(grupo)
@@ -0,0 +1,70 @@
+"""
+Middleware que alimenta las métricas HTTP y SQL de /metrics.
+"""
+
+import time
+
+from database.instrumentacion import (
+    estadisticas_actuales,
+    finalizar_estadisticas,
+    iniciar_estadisticas,
+)
+from src.metricas import (
+    consultas_sql,
+    duracion_solicitudes,
+    duracion_sql,
+    solicitudes_en_curso,
+)
+
+SIN_RUTA = "sin_ruta"
+METODOS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+OTRO_METODO = "OTRO"
+
+
+class MetricasMiddleware:
+    """
+    Middleware ASGI que mide cada solicitud HTTP.
+
+    Las series usan la plantilla de la ruta (/cuentas/{cuenta_id}) y no la
+    ruta concreta, para que la cantidad de series no crezca con los ids.
+    Las solicitudes que no coinciden con ninguna ruta se agrupan en sin_ruta
+    y los métodos fuera de METODOS en OTRO, porque el cliente elige ambos.
+    Si ConsultasSQLMiddleware ya está acumulando las consultas de la
+    solicitud, reutiliza sus estadísticas en lugar de crear otras.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        estado = 500
+
+        async def send_con_estado(mensaje):
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+            await send(mensaje)
+
+        solicitudes_en_curso.inc()
+        estadisticas, token = estadisticas_actuales(), None
+        if estadisticas is None:
+            estadisticas, token = iniciar_estadisticas(scope)
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_con_estado)
+        finally:
+            duracion = time.perf_counter() - inicio
+            if token is not None:
+                finalizar_estadisticas(token)
+            solicitudes_en_curso.dec()
+
+            metodo = scope["method"] if scope["method"] in METODOS else OTRO_METODO
+            ruta = getattr(scope.get("route"), "path", SIN_RUTA)
+            duracion_solicitudes.observar(duracion, metodo, ruta, str(estado))
+            if estadisticas.consultas:
+                consultas_sql.inc(estadisticas.consultas, metodo, ruta)
+                duracion_sql.inc(estadisticas.segundos, metodo, ruta)
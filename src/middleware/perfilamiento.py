@@ -0,0 +1,193 @@
+"""
+Perfilamiento a demanda de solicitudes individuales.
+
+Un administrador puede enviar la cabecera X-Profile: 1 para que su
+solicitud se ejecute bajo un muestreador estadístico. El resultado se
+guarda en formato de pilas colapsadas (una línea "marco;marco;marco N" por
+pila), que leen directamente flamegraph.pl, speedscope e inferno, y la
+respuesta indica el archivo en la cabecera X-Profile-File.
+
+Las solicitudes sin la cabecera solo pagan la búsqueda de la cabecera: el
+muestreador no existe hasta que se perfila algo.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+
+from database.connection import SessionLocal
+from src.auth.middleware import get_current_active_user, get_current_user, require_admin
+
+logger = logging.getLogger(__name__)
+
+CABECERA_PERFIL = b"x-profile"
+_perfil_en_curso = contextvars.ContextVar("perfil_en_curso", default=None)
+
+
+def _etiqueta(codigo) -> str:
+    archivo = codigo.co_filename
+    for prefijo in sys.path:
+        if prefijo and archivo.startswith(prefijo):
+            archivo = archivo[len(prefijo):].lstrip(os.sep)
+            break
+    return f"{codigo.co_name} ({archivo}:{codigo.co_firstlineno})"
+
+
+def _pila(marco) -> str:
+    marcos = []
+    while marco is not None:
+        marcos.append(_etiqueta(marco.f_code))
+        marco = marco.f_back
+    return ";".join(reversed(marcos))
+
+
+def _ejecuta_contexto(marco, marca) -> bool:
+    """
+    Indica si la pila corre dentro del contexto de la solicitud perfilada.
+
+    Los hilos del threadpool ejecutan la parte síncrona de la solicitud con
+    context.run(); el Context queda como variable local de algún marco.
+    """
+    while marco is not None:
+        for valor in marco.f_locals.values():
+            if isinstance(valor, contextvars.Context) and valor.get(_perfil_en_curso) is marca:
+                return True
+        marco = marco.f_back
+    return False
+
+
+class Muestreador:
+    """
+    Toma muestras de las pilas de una solicitud cada `intervalo` segundos.
+
+    Solo cuenta el hilo del event loop mientras ejecuta la tarea de la
+    solicitud y los hilos del threadpool que trabajan para ella, así que
+    las solicitudes concurrentes no contaminan el perfil.
+    """
+
+    def __init__(self, intervalo: float):
+        self.intervalo = intervalo
+        self.pilas = Counter()
+        self.muestras = 0
+        self._marca = object()
+        self._loop = asyncio.get_running_loop()
+        self._tarea = asyncio.current_task()
+        self._hilo_loop = threading.get_ident()
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._muestrear, name="perfilamiento", daemon=True)
+        self._token = None
+
+    def iniciar(self):
+        self._token = _perfil_en_curso.set(self._marca)
+        self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+        self._hilo.join()
+        _perfil_en_curso.reset(self._token)
+
+    def _muestrear(self):
+        propio = threading.get_ident()
+        while not self._detener.wait(self.intervalo):
+            self.muestras += 1
+            for hilo, marco in sys._current_frames().items():
+                if hilo == propio:
+                    continue
+                if hilo == self._hilo_loop:
+                    if asyncio.tasks._current_tasks.get(self._loop) is not self._tarea:
+                        continue
+                elif not _ejecuta_contexto(marco, self._marca):
+                    continue
+                self.pilas[_pila(marco)] += 1
+
+    def colapsadas(self) -> str:
+        return "".join(f"{pila} {n}\n" for pila, n in self.pilas.most_common())
+
+
+def _autorizar(token: str):
+    """Aplica require_admin sobre el usuario del token."""
+    db = SessionLocal()
+    try:
+        require_admin(get_current_active_user(get_current_user(token, db)))
+    finally:
+        db.close()
+
+
+class PerfilamientoMiddleware:
+    """
+    Middleware ASGI que perfila las solicitudes de administradores con X-Profile: 1.
+
+    Args:
+        app: Aplicación ASGI
+        directorio: Carpeta donde se guardan los perfiles
+        intervalo_ms: Milisegundos entre muestras
+    """
+
+    def __init__(self, app, directorio: str = "perfiles", intervalo_ms: float = 2.0):
+        self.app = app
+        self.directorio = directorio
+        self.intervalo = intervalo_ms / 1000
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not any(
+            nombre == CABECERA_PERFIL and valor == b"1" for nombre, valor in scope["headers"]
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        cabeceras = dict(scope["headers"])
+        esquema, _, token = cabeceras.get(b"authorization", b"").decode("latin-1").partition(" ")
+        try:
+            if esquema.lower() != "bearer" or not token:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="X-Profile requiere un token de administrador",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            await run_in_threadpool(_autorizar, token)
+        except HTTPException as e:
+            respuesta = JSONResponse({"detail": e.detail}, status_code=e.status_code, headers=e.headers)
+            await respuesta(scope, receive, send)
+            return
+
+        ahora = time.time()
+        nombre = "{}{:03d}-{}-{}.folded".format(
+            time.strftime("%Y%m%d-%H%M%S", time.localtime(ahora)),
+            int(ahora * 1000) % 1000,
+            scope["method"].lower(),
+            re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_")[:80] or "raiz",
+        )
+        archivo = os.path.join(self.directorio, nombre)
+
+        async def send_con_perfil(mensaje):
+            if mensaje["type"] == "http.response.start":
+                mensaje["headers"] = list(mensaje.get("headers", [])) + [
+                    (b"x-profile-file", archivo.encode())
+                ]
+            await send(mensaje)
+
+        muestreador = Muestreador(self.intervalo)
+        muestreador.iniciar()
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_con_perfil)
+        finally:
+            muestreador.detener()
+            os.makedirs(self.directorio, exist_ok=True)
+            with open(archivo, "w", encoding="utf-8") as salida:
+                salida.write(muestreador.colapsadas())
+            logger.info(
+                f"🔬 Perfil de {scope['method']} {scope['path']} "
+                f"({(time.perf_counter() - inicio) * 1000:.0f} ms, "
+                f"{sum(muestreador.pilas.values())} muestras) en {archivo}"
+            )
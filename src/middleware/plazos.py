@@ -0,0 +1,172 @@
+"""
+Plazo máximo por solicitud, con 504 al vencer.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Iterable, Optional
+
+from fastapi.responses import JSONResponse
+from psycopg2 import errors as errores_pg
+
+from database.plazos import fijar_plazo, restablecer_plazo
+from src.metricas import plazos_vencidos
+
+logger = logging.getLogger(__name__)
+
+CABECERA_PLAZO = b"x-request-timeout"
+SIN_RUTA = "sin_ruta"
+
+
+def leer_plazos(texto: str) -> Dict[str, float]:
+    """
+    Interpreta una lista "RUTA=segundos;RUTA=segundos".
+
+    Cada RUTA es un prefijo de la ruta, opcionalmente precedido por el
+    método: "POST /cheques/compensacion=120;/clientes/buscar=5".
+    """
+    plazos = {}
+    for entrada in filter(None, (e.strip() for e in texto.split(";"))):
+        ruta, _, segundos = entrada.rpartition("=")
+        plazos[ruta.strip()] = float(segundos)
+    return plazos
+
+
+def _respuesta_504(segundos: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": f"La solicitud superó su plazo de {segundos:g} s"}, status_code=504
+    )
+
+
+# Solicitudes vencidas que siguen terminando; asyncio solo guarda
+# referencias débiles a las tareas
+_pendientes = set()
+
+
+def _descartar_resultado(tarea: asyncio.Task):
+    # La solicitud vencida suele terminar con la excepción de la consulta
+    # abortada; se recupera para que asyncio no la reporte como perdida
+    _pendientes.discard(tarea)
+    if not tarea.cancelled():
+        tarea.exception()
+
+
+class PlazosMiddleware:
+    """
+    Middleware ASGI que limita el tiempo de cada solicitud.
+
+    El plazo sale del prefijo más largo de `por_ruta` que coincide con la
+    solicitud (con o sin método), o de `por_defecto`. El cliente puede
+    pedir uno más corto con la cabecera X-Request-Timeout (en segundos);
+    nunca puede alargarlo más allá del plazo de la ruta ni de `maximo`.
+    Las sentencias de base de datos lo reciben como statement_timeout (ver
+    database.plazos).
+
+    Al vencer el plazo se responde 504 de inmediato. La solicitud no se
+    cancela: termina en segundo plano cuando Postgres aborta su consulta,
+    lo que ocurre en el mismo plazo, y así sus dependencias (la sesión de
+    get_db) se cierran y la conexión vuelve al pool. Cancelarla dejaría la
+    sesión abierta, porque FastAPI no cierra las dependencias con yield
+    ante un CancelledError. Lo que la solicitud envíe después se descarta.
+
+    Las rutas terminadas en alguno de `flujos` (eventos SSE) no tienen
+    plazo: quedan abiertas mientras el cliente escuche.
+
+    Args:
+        app: Aplicación ASGI
+        por_defecto: Segundos para las rutas sin configuración propia
+        por_ruta: Prefijo de ruta ("/ruta" o "METODO /ruta") -> segundos
+        maximo: Tope para el plazo pedido por el cliente
+        flujos: Sufijos de las rutas de streaming
+    """
+
+    def __init__(self, app, por_defecto: float = 10.0,
+                 por_ruta: Optional[Dict[str, float]] = None, maximo: float = 60.0,
+                 flujos: Iterable[str] = ("/stream",)):
+        self.app = app
+        self.por_defecto = por_defecto
+        self.maximo = maximo
+        self.flujos = tuple(flujos)
+        # Los prefijos más largos primero, para que ganen los más específicos
+        self.por_ruta = sorted((por_ruta or {}).items(), key=lambda e: len(e[0]), reverse=True)
+
+    def _plazo(self, scope) -> float:
+        ruta = scope["path"]
+        con_metodo = f"{scope['method']} {ruta}"
+        plazo = self.por_defecto
+        for prefijo, segundos in self.por_ruta:
+            if con_metodo.startswith(prefijo) or ruta.startswith(prefijo):
+                plazo = segundos
+                break
+
+        # La cabecera del cliente solo puede acortar el plazo de la ruta
+        for nombre, valor in scope["headers"]:
+            if nombre == CABECERA_PLAZO:
+                try:
+                    pedido = float(valor)
+                except ValueError:
+                    break
+                if pedido > 0:
+                    return min(pedido, plazo, self.maximo)
+                break
+        return plazo
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].endswith(self.flujos):
+            await self.app(scope, receive, send)
+            return
+
+        segundos = self._plazo(scope)
+        vencida = False
+        iniciada = False
+
+        async def send_protegido(mensaje):
+            nonlocal iniciada
+            if vencida:
+                return
+            if mensaje["type"] == "http.response.start":
+                iniciada = True
+            await send(mensaje)
+
+        # La tarea copia el contexto con el plazo ya fijado
+        token = fijar_plazo(segundos)
+        try:
+            tarea = asyncio.ensure_future(self.app(scope, receive, send_protegido))
+        finally:
+            restablecer_plazo(token)
+
+        try:
+            await asyncio.wait({tarea}, timeout=segundos)
+        except asyncio.CancelledError:
+            tarea.cancel()
+            raise
+        if tarea.done():
+            tarea.result()
+            return
+
+        vencida = True
+        _pendientes.add(tarea)
+        tarea.add_done_callback(_descartar_resultado)
+
+        metodo = scope["method"]
+        ruta = getattr(scope.get("route"), "path", SIN_RUTA)
+        plazos_vencidos.inc(1, metodo, ruta)
+        logger.warning(f"⌛ {metodo} {scope['path']} superó su plazo de {segundos:g} s")
+        if not iniciada:
+            await _respuesta_504(segundos)(scope, receive, send)
+
+
+async def plazo_vencido_handler(request, exc):
+    """Responde 504 cuando la solicitud agotó su plazo antes de abrir una transacción."""
+    return JSONResponse({"detail": "La solicitud superó su plazo"}, status_code=504)
+
+
+async def consulta_cancelada_handler(request, exc):
+    """
+    Responde 504 si Postgres canceló la consulta por statement_timeout.
+
+    Cualquier otro OperationalError sigue su curso hacia un 500.
+    """
+    if isinstance(exc.orig, errores_pg.QueryCanceled):
+        return JSONResponse({"detail": "La solicitud superó su plazo"}, status_code=504)
+    raise exc
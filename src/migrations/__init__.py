@@ -2,6 +2,22 @@
 Sistema de migraciones automáticas para la base de datos.
 """
 
-from .migrator import get_existing_tables, print_migration_status, run_migrations
+from .auditoria import audit_indexes, generate_fix_migration, print_index_audit
+from .migrator import (
+    apply_pending_migrations,
+    get_existing_tables,
+    print_migration_status,
+    print_versioned_migrations,
+    run_migrations,
+)
 
-__all__ = ["run_migrations", "print_migration_status", "get_existing_tables"]
+__all__ = [
+    "run_migrations",
+    "print_migration_status",
+    "print_versioned_migrations",
+    "apply_pending_migrations",
+    "get_existing_tables",
+    "audit_indexes",
+    "print_index_audit",
+    "generate_fix_migration",
+]
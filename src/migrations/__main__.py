@@ -0,0 +1,62 @@
+"""
+Línea de comandos del migrador.
+
+Uso:
+    python -m src.migrations aplicar [--forzar]
+    python -m src.migrations estado
+    python -m src.migrations auditar [--generar]
+"""
+
+import argparse
+import sys
+
+from src.migrations.auditoria import (
+    audit_indexes,
+    generate_fix_migration,
+    print_index_audit,
+)
+from src.migrations.migrator import (
+    print_migration_status,
+    print_versioned_migrations,
+    run_migrations,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m src.migrations")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    aplicar = subparsers.add_parser("aplicar", help="Aplica las migraciones pendientes")
+    aplicar.add_argument(
+        "--forzar",
+        action="store_true",
+        help="Ejecuta la migración completa aunque el hash del esquema coincida",
+    )
+    subparsers.add_parser("estado", help="Muestra tablas y migraciones aplicadas")
+    auditar = subparsers.add_parser(
+        "auditar", help="Reporta índices duplicados, FKs sin índice e índices sin uso"
+    )
+    auditar.add_argument(
+        "--generar",
+        action="store_true",
+        help="Imprime las entradas de MIGRACIONES que corrigen los hallazgos",
+    )
+
+    args = parser.parse_args()
+
+    if args.comando == "aplicar":
+        if not run_migrations(force=args.forzar):
+            sys.exit(1)
+    elif args.comando == "estado":
+        print_migration_status()
+        print_versioned_migrations()
+    elif args.comando == "auditar":
+        hallazgos = audit_indexes()
+        print_index_audit(hallazgos)
+        if args.generar:
+            print("\n# Agregar al final de MIGRACIONES en src/migrations/versiones.py:")
+            print(generate_fix_migration(hallazgos))
+
+
+if __name__ == "__main__":
+    main()
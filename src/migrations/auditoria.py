@@ -0,0 +1,275 @@
+"""
+Auditoría de índices: duplicados, claves foráneas sin índice e índices sin uso.
+
+Combina lo declarado en Base.metadata con el catálogo de PostgreSQL
+(pg_index, pg_stat_user_indexes) y puede generar las migraciones
+versionadas que corrigen lo encontrado.
+"""
+
+from typing import List
+
+from sqlalchemy import text
+
+from database.connection import Base, engine
+from src.migrations.versiones import MIGRACIONES
+
+
+def get_declared_duplicates() -> List[dict]:
+    """
+    Columnas declaradas con primary_key=True e index=True.
+
+    La clave primaria ya tiene su índice único, así que index=True crea un
+    segundo índice idéntico que solo encarece cada inserción.
+
+    Returns:
+        List[dict]: Tabla, columna y nombre del índice redundante
+    """
+    duplicados = []
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            columnas = [c.name for c in index.columns]
+            pk = [c.name for c in table.primary_key.columns]
+            if columnas == pk:
+                duplicados.append(
+                    {"tabla": table.name, "columna": ", ".join(columnas), "indice": index.name}
+                )
+    return duplicados
+
+
+def get_duplicate_indexes(conn) -> List[dict]:
+    """
+    Índices con la misma definición (unicidad, columnas, clases, orden,
+    collation, expresiones y predicado).
+
+    Se conserva el que respalda una restricción (PK/UNIQUE), si no el que
+    es UNIQUE y, entre iguales, el de nombre menor; el resto se propone
+    eliminar.
+
+    Returns:
+        List[dict]: Índice redundante, índice que se conserva y tamaño
+    """
+    filas = conn.execute(
+        text(
+            """
+            SELECT t.relname AS tabla,
+                   i.relname AS indice,
+                   pg_relation_size(x.indexrelid) AS bytes,
+                   EXISTS (
+                       SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid
+                   ) AS respalda_restriccion,
+                   x.indrelid::text || ':' || x.indisunique::text || ':' || x.indkey::text
+                       || ':' || x.indclass::text || ':' || x.indoption::text
+                       || ':' || x.indcollation::text
+                       || ':' || COALESCE(pg_get_expr(x.indexprs, x.indrelid), '')
+                       || ':' || COALESCE(pg_get_expr(x.indpred, x.indrelid), '') AS firma
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            JOIN pg_class t ON t.oid = x.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            WHERE n.nspname = current_schema()
+            ORDER BY tabla, respalda_restriccion DESC, x.indisunique DESC, indice
+            """
+        )
+    ).all()
+
+    grupos = {}
+    for fila in filas:
+        grupos.setdefault(fila.firma, []).append(fila)
+
+    duplicados = []
+    for grupo in grupos.values():
+        conservado, *redundantes = grupo
+        for fila in redundantes:
+            if fila.respalda_restriccion:
+                continue
+            duplicados.append(
+                {
+                    "tabla": fila.tabla,
+                    "indice": fila.indice,
+                    "duplica_a": conservado.indice,
+                    "bytes": fila.bytes,
+                }
+            )
+    return duplicados
+
+
+def get_unindexed_foreign_keys(conn) -> List[dict]:
+    """
+    Claves foráneas de Base.metadata sin un índice que empiece por sus columnas.
+
+    Solo cuentan los índices no parciales, que son los que sirven para los
+    joins y para verificar la FK al borrar la fila referenciada.
+
+    Returns:
+        List[dict]: Tabla, columnas y tabla referenciada
+    """
+    indices = conn.execute(
+        text(
+            """
+            SELECT t.relname AS tabla,
+                   array_agg(a.attname::text ORDER BY k.n) AS columnas
+            FROM pg_index x
+            JOIN pg_class t ON t.oid = x.indrelid
+            JOIN pg_namespace ns ON ns.oid = t.relnamespace
+            CROSS JOIN LATERAL unnest(x.indkey) WITH ORDINALITY AS k(attnum, n)
+            JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum
+            WHERE ns.nspname = current_schema() AND x.indpred IS NULL
+            GROUP BY t.relname, x.indexrelid
+            """
+        )
+    ).all()
+
+    cubiertas = {}
+    for fila in indices:
+        cubiertas.setdefault(fila.tabla, []).append(list(fila.columnas))
+
+    faltantes = []
+    for table in Base.metadata.sorted_tables:
+        for fk in table.foreign_key_constraints:
+            columnas = [c.name for c in fk.columns]
+            indexada = any(
+                cols[: len(columnas)] == columnas for cols in cubiertas.get(table.name, [])
+            )
+            if not indexada:
+                faltantes.append(
+                    {
+                        "tabla": table.name,
+                        "columnas": columnas,
+                        "referencia": fk.referred_table.name,
+                    }
+                )
+    return faltantes
+
+
+def get_unused_indexes(conn) -> List[dict]:
+    """
+    Índices que nunca se han usado según pg_stat_user_indexes.
+
+    Se excluyen los que respaldan restricciones PK/UNIQUE, que se necesitan
+    aunque no se consulten. Las estadísticas son por servidor y se reinician
+    con pg_stat_reset, así que conviene revisar también las réplicas.
+
+    Returns:
+        List[dict]: Tabla, índice y tamaño, de mayor a menor
+    """
+    filas = conn.execute(
+        text(
+            """
+            SELECT s.relname AS tabla,
+                   s.indexrelname AS indice,
+                   pg_relation_size(s.indexrelid) AS bytes
+            FROM pg_stat_user_indexes s
+            JOIN pg_index x ON x.indexrelid = s.indexrelid
+            WHERE s.schemaname = current_schema()
+              AND s.idx_scan = 0
+              AND NOT x.indisunique
+              AND NOT EXISTS (
+                  SELECT 1 FROM pg_constraint c WHERE c.conindid = s.indexrelid
+              )
+            ORDER BY bytes DESC
+            """
+        )
+    ).all()
+    return [dict(fila._mapping) for fila in filas]
+
+
+def audit_indexes() -> dict:
+    """
+    Ejecuta todas las verificaciones de la auditoría.
+
+    Returns:
+        dict: Hallazgos por categoría
+    """
+    with engine.connect() as conn:
+        return {
+            "declarados_duplicados": get_declared_duplicates(),
+            "duplicados": get_duplicate_indexes(conn),
+            "fk_sin_indice": get_unindexed_foreign_keys(conn),
+            "sin_uso": get_unused_indexes(conn),
+        }
+
+
+def _tamano(bytes_: int) -> str:
+    for unidad in ("B", "kB", "MB", "GB"):
+        if bytes_ < 1024:
+            return f"{bytes_:.0f} {unidad}"
+        bytes_ /= 1024
+    return f"{bytes_:.1f} TB"
+
+
+def print_index_audit(hallazgos: dict):
+    """
+    Imprime el reporte de la auditoría de índices.
+    """
+    print("\n🔍 Auditoría de índices:")
+    print("=" * 50)
+
+    print("\nÍndices declarados sobre la clave primaria (index=True redundante):")
+    for d in hallazgos["declarados_duplicados"]:
+        print(f"  ⚠️  {d['tabla']}.{d['columna']} -> {d['indice']}")
+    if not hallazgos["declarados_duplicados"]:
+        print("  ✅ Ninguno")
+
+    print("\nÍndices duplicados en la base de datos:")
+    for d in hallazgos["duplicados"]:
+        print(
+            f"  ⚠️  {d['tabla']}.{d['indice']} duplica a {d['duplica_a']} "
+            f"({_tamano(d['bytes'])})"
+        )
+    if not hallazgos["duplicados"]:
+        print("  ✅ Ninguno")
+
+    print("\nClaves foráneas sin índice:")
+    for f in hallazgos["fk_sin_indice"]:
+        print(f"  ⚠️  {f['tabla']}({', '.join(f['columnas'])}) -> {f['referencia']}")
+    if not hallazgos["fk_sin_indice"]:
+        print("  ✅ Ninguna")
+
+    print("\nÍndices nunca usados (idx_scan = 0):")
+    for u in hallazgos["sin_uso"]:
+        print(f"  💤 {u['tabla']}.{u['indice']} ({_tamano(u['bytes'])})")
+    if not hallazgos["sin_uso"]:
+        print("  ✅ Ninguno")
+
+    print("=" * 50)
+
+
+def generate_fix_migration(hallazgos: dict) -> str:
+    """
+    Genera las entradas de MIGRACIONES que corrigen los hallazgos.
+
+    Los índices duplicados se eliminan y las claves foráneas sin índice se
+    indexan, todo de forma concurrente. Los índices sin uso se emiten
+    comentados: eliminarlos requiere confirmar que tampoco se usan en las
+    réplicas ni en procesos periódicos.
+
+    Returns:
+        str: Código Python para agregar al final de MIGRACIONES
+    """
+    version = max((m.version for m in MIGRACIONES), default=0) + 1
+    lineas = []
+
+    for d in hallazgos["duplicados"]:
+        lineas.append(
+            f'    eliminar_indice_concurrente({version}, "{d["indice"]}"),'
+        )
+        version += 1
+
+    for f in hallazgos["fk_sin_indice"]:
+        nombre = f"ix_{f['tabla']}_{'_'.join(f['columnas'])}"
+        columnas = ", ".join(f'"{c}"' for c in f["columnas"])
+        lineas.append(
+            f'    indice_concurrente({version}, "{nombre}", "{f["tabla"]}", \'({columnas})\'),'
+        )
+        version += 1
+
+    eliminados = {d["indice"] for d in hallazgos["duplicados"]}
+    for u in hallazgos["sin_uso"]:
+        if u["indice"] in eliminados:
+            continue
+        lineas.append(
+            f'    # eliminar_indice_concurrente(<versión>, "{u["indice"]}"),  '
+            f"# sin uso, {_tamano(u['bytes'])}"
+        )
+
+    return "\n".join(lineas)
@@ -2,13 +2,22 @@
 Sistema de migración automática para la base de datos Neon PostgreSQL.
 """
 
+import hashlib
 import logging
-from typing import List
-
-from sqlalchemy import text
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Optional, Set
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, text
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.schema import CreateIndex, CreateTable
 
-from database.connection import Base, create_tables, engine
+from database.connection import Base, create_tables, engine, engine_directo
+from src.migrations.versiones import MIGRACIONES, Migracion
 from src.entities import (
     clientes,
     cuentas,
@@ -24,6 +33,31 @@ from src.entities import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Versión del esquema aplicada, fuera de Base.metadata para no alterar el hash
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("hash", String(64), nullable=False),
+    Column("fecha_aplicacion", DateTime, nullable=False),
+)
+
+# Registro de las migraciones versionadas ya aplicadas
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("descripcion", String, nullable=False),
+    Column("fecha_aplicacion", DateTime, nullable=False),
+    Column("duracion_ms", Integer, nullable=False),
+)
+
+# Cada cuántos segundos se informa el avance de un índice concurrente
+PROGRESS_INTERVAL = 5
+
+# Advisory lock que serializa las migraciones entre procesos y servidores
+MIGRATION_LOCK_KEY = zlib.crc32(b"migraciones")
+
 
 def check_table_exists(table_name: str) -> bool:
     """
@@ -80,6 +114,63 @@ def get_existing_tables() -> List[str]:
         return []
 
 
+def compute_schema_hash() -> str:
+    """
+    Calcula un hash del esquema declarado en Base.metadata.
+
+    Se basa en el DDL que generaría PostgreSQL para cada tabla e índice más
+    las migraciones versionadas, así que cualquier cambio en las entidades
+    o una migración nueva produce un hash distinto.
+
+    Returns:
+        str: Hash SHA-256 en hexadecimal
+    """
+    dialecto = postgresql.dialect()
+    digest = hashlib.sha256()
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialecto)).encode())
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialecto)).encode())
+    for migracion in MIGRACIONES:
+        digest.update(str(migracion.version).encode())
+        for sentencia in migracion.sentencias:
+            digest.update(sentencia.encode())
+    return digest.hexdigest()
+
+
+def get_recorded_schema_hash() -> Optional[str]:
+    """
+    Obtiene el hash del último esquema aplicado con una sola consulta por PK.
+
+    Returns:
+        Optional[str]: Hash registrado o None si aún no hay registro
+    """
+    with engine.connect() as conn:
+        try:
+            return conn.execute(
+                text("SELECT hash FROM schema_version WHERE id = 1")
+            ).scalar()
+        except SQLAlchemyError:
+            # La tabla schema_version todavía no existe
+            return None
+
+
+def record_schema_hash(schema_hash: str):
+    """
+    Registra el hash del esquema recién aplicado.
+    """
+    schema_version.create(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        conn.execute(
+            postgresql.insert(schema_version)
+            .values(id=1, hash=schema_hash, fecha_aplicacion=datetime.utcnow())
+            .on_conflict_do_update(
+                index_elements=[schema_version.c.id],
+                set_={"hash": schema_hash, "fecha_aplicacion": datetime.utcnow()},
+            )
+        )
+
+
 def create_missing_tables():
     """
     Crea las tablas que no existen en la base de datos.
@@ -93,6 +184,140 @@ def create_missing_tables():
         raise
 
 
+def get_applied_versions() -> Set[int]:
+    """
+    Obtiene las versiones de migración ya aplicadas.
+
+    Returns:
+        Set[int]: Versiones registradas en schema_migrations
+    """
+    schema_migrations.create(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        return set(conn.execute(text("SELECT version FROM schema_migrations")).scalars())
+
+
+def _record_migration(conn, migracion: Migracion, duracion_ms: int):
+    conn.execute(
+        schema_migrations.insert().values(
+            version=migracion.version,
+            descripcion=migracion.descripcion,
+            fecha_aplicacion=datetime.utcnow(),
+            duracion_ms=duracion_ms,
+        )
+    )
+
+
+def _report_index_progress(pid: int, indice: str, detener: threading.Event):
+    """
+    Informa periódicamente el avance de CREATE INDEX CONCURRENTLY.
+
+    Usa su propia conexión en autocommit para no retener un snapshot que
+    la construcción concurrente tendría que esperar.
+    """
+    try:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            while not detener.wait(PROGRESS_INTERVAL):
+                fila = conn.execute(
+                    text(
+                        """
+                        SELECT phase, blocks_done, blocks_total, tuples_done, tuples_total
+                        FROM pg_stat_progress_create_index WHERE pid = :pid
+                        """
+                    ),
+                    {"pid": pid},
+                ).first()
+                if fila is None:
+                    continue
+                avance = f"{fila.blocks_done}/{fila.blocks_total} bloques"
+                if fila.tuples_total:
+                    avance += f", {fila.tuples_done}/{fila.tuples_total} tuplas"
+                logger.info(f"⏳ {indice}: {fila.phase} ({avance})")
+    except Exception as e:
+        logger.warning(f"⚠️  No se pudo consultar el avance de {indice}: {e}")
+
+
+def _apply_concurrent_migration(migracion: Migracion):
+    """
+    Aplica una migración CONCURRENTLY fuera de transacción.
+
+    Si una ejecución anterior se interrumpió, el índice queda creado pero
+    marcado como inválido; se elimina (también de forma concurrente) y se
+    vuelve a construir.
+
+    Usa engine_directo: a través del pooler cada sentencia puede caer en otro
+    backend y el pg_backend_pid() que sigue el monitor no sería el que
+    construye el índice.
+    """
+    with engine_directo.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if migracion.indice:
+            invalido = conn.execute(
+                text(
+                    """
+                    SELECT 1 FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE n.nspname = current_schema()
+                      AND c.relname = :indice
+                      AND NOT i.indisvalid
+                    """
+                ),
+                {"indice": migracion.indice},
+            ).scalar()
+            if invalido:
+                logger.warning(
+                    f"♻️  Índice {migracion.indice} inválido por una construcción "
+                    "interrumpida, se reconstruye"
+                )
+                conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{migracion.indice}"'))
+
+        pid = conn.execute(text("SELECT pg_backend_pid()")).scalar()
+        detener = threading.Event()
+        monitor = threading.Thread(
+            target=_report_index_progress,
+            args=(pid, migracion.indice or migracion.descripcion, detener),
+            daemon=True,
+        )
+        monitor.start()
+        try:
+            for sentencia in migracion.sentencias:
+                conn.execute(text(sentencia))
+        finally:
+            detener.set()
+            monitor.join()
+
+
+def apply_pending_migrations():
+    """
+    Aplica en orden las migraciones versionadas que aún no están registradas.
+    """
+    try:
+        aplicadas = get_applied_versions()
+        pendientes = [m for m in MIGRACIONES if m.version not in aplicadas]
+        if not pendientes:
+            logger.info("✅ No hay migraciones versionadas pendientes")
+            return
+
+        logger.info(f"🔧 Migraciones pendientes: {[m.version for m in pendientes]}")
+        for migracion in pendientes:
+            logger.info(f"▶️  {migracion.version}: {migracion.descripcion}")
+            inicio = time.perf_counter()
+            if migracion.concurrente:
+                _apply_concurrent_migration(migracion)
+                duracion_ms = int((time.perf_counter() - inicio) * 1000)
+                with engine.begin() as conn:
+                    _record_migration(conn, migracion, duracion_ms)
+            else:
+                with engine.begin() as conn:
+                    for sentencia in migracion.sentencias:
+                        conn.execute(text(sentencia))
+                    duracion_ms = int((time.perf_counter() - inicio) * 1000)
+                    _record_migration(conn, migracion, duracion_ms)
+            logger.info(f"✅ Migración {migracion.version} aplicada en {duracion_ms} ms")
+    except Exception as e:
+        logger.error(f"❌ Error aplicando migraciones versionadas: {e}")
+        raise
+
+
 def verify_migration_success() -> bool:
     """
     Verifica que la migración se haya completado exitosamente.
@@ -124,35 +349,68 @@ def verify_migration_success() -> bool:
     return True
 
 
-def run_migrations():
+@contextmanager
+def migration_lock():
+    """
+    Mantiene el advisory lock de migraciones mientras dura el bloque.
+
+    El lock es de sesión y se confirma la transacción apenas se obtiene:
+    una transacción abierta en esta conexión haría esperar para siempre a
+    los CREATE INDEX CONCURRENTLY de las migraciones. Por eso se toma en
+    una conexión directa (engine_directo) y no a través del pooler en modo
+    transacción, donde el unlock podría ejecutarse en otro backend y dejar
+    el lock tomado para siempre.
+    """
+    with engine_directo.connect() as conn:
+        inicio = time.perf_counter()
+        conn.execute(text("SELECT pg_advisory_lock(:clave)"), {"clave": MIGRATION_LOCK_KEY})
+        conn.commit()
+        espera = time.perf_counter() - inicio
+        if espera > 1:
+            logger.info(f"🔒 Lock de migraciones obtenido tras {espera:.1f} s de espera")
+        try:
+            yield
+        finally:
+            try:
+                conn.execute(text("SELECT pg_advisory_unlock(:clave)"), {"clave": MIGRATION_LOCK_KEY})
+                conn.commit()
+            except SQLAlchemyError:
+                # Cerrar la conexión libera el lock; no debe volver al pool con él
+                conn.invalidate()
+                raise
+
+
+def run_migrations(force: bool = False):
     """
     Ejecuta el sistema de migración automática.
 
+    Si el hash del esquema registrado en schema_version coincide con el de
+    Base.metadata, se omite toda la reflexión del catálogo y la migración
+    termina tras una única consulta.
+
+    Varios procesos pueden llamarla a la vez: la migración corre bajo un
+    advisory lock y quien lo obtiene después de otro vuelve a comparar el
+    hash, así que solo el primero aplica los cambios.
+
+    Args:
+        force: Ejecuta la migración completa aunque el hash coincida
+
     Returns:
         bool: True si la migración fue exitosa
     """
     try:
-        logger.info("🔄 Iniciando migración automática...")
+        schema_hash = compute_schema_hash()
 
-        # Verificar conexión a la base de datos
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-        logger.info("✅ Conexión a Neon PostgreSQL establecida")
-
-        # Obtener tablas existentes
-        existing_tables = get_existing_tables()
-        logger.info(f"📋 Tablas existentes: {existing_tables}")
-
-        # Crear tablas faltantes
-        create_missing_tables()
-
-        # Verificar que la migración fue exitosa
-        if verify_migration_success():
-            logger.info("🎉 Migración completada exitosamente!")
+        # Camino rápido: una consulta por PK confirma conexión y versión
+        if not force and get_recorded_schema_hash() == schema_hash:
+            logger.info(f"⚡ Esquema al día ({schema_hash[:12]}), se omite la migración")
             return True
-        else:
-            logger.error("❌ La migración no se completó correctamente")
-            return False
+
+        with migration_lock():
+            if not force and get_recorded_schema_hash() == schema_hash:
+                logger.info("⚡ Otro proceso completó la migración mientras se esperaba el lock")
+                return True
+            return _migrate(schema_hash)
 
     except SQLAlchemyError as e:
         logger.error(f"❌ Error de base de datos durante la migración: {e}")
@@ -162,6 +420,61 @@ def run_migrations():
         return False
 
 
+def _migrate(schema_hash: str) -> bool:
+    """Aplica la migración completa; se llama con el lock de migraciones tomado."""
+    logger.info("🔄 Iniciando migración automática...")
+
+    # Verificar conexión a la base de datos
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    logger.info("✅ Conexión a Neon PostgreSQL establecida")
+
+    # Obtener tablas existentes
+    existing_tables = get_existing_tables()
+    logger.info(f"📋 Tablas existentes: {existing_tables}")
+
+    # Crear tablas faltantes
+    create_missing_tables()
+
+    # Aplicar migraciones versionadas pendientes
+    apply_pending_migrations()
+
+    # Verificar que la migración fue exitosa
+    if verify_migration_success():
+        record_schema_hash(schema_hash)
+        logger.info("🎉 Migración completada exitosamente!")
+        print_migration_status()
+        return True
+    else:
+        logger.error("❌ La migración no se completó correctamente")
+        return False
+
+
+def print_versioned_migrations():
+    """
+    Imprime las migraciones versionadas, aplicadas y pendientes.
+    """
+    schema_migrations.create(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        aplicadas = {
+            fila.version: fila
+            for fila in conn.execute(
+                text("SELECT version, fecha_aplicacion, duracion_ms FROM schema_migrations")
+            )
+        }
+
+    print("\n📜 Migraciones versionadas:")
+    print("=" * 50)
+    for migracion in MIGRACIONES:
+        fila = aplicadas.get(migracion.version)
+        if fila:
+            detalle = f"{fila.fecha_aplicacion:%Y-%m-%d %H:%M} ({fila.duracion_ms} ms)"
+            print(f"✅ {migracion.version:>3} {migracion.descripcion} - {detalle}")
+        else:
+            print(f"⏳ {migracion.version:>3} {migracion.descripcion} - pendiente")
+    print("=" * 50)
+
+
 def print_migration_status():
     """
     Imprime el estado actual de las tablas en la base de datos.
@@ -188,7 +501,7 @@ def print_migration_status():
 
         print("=" * 50)
 
-        if len(existing_tables) == len(required_tables):
+        if all(table in existing_tables for table in required_tables):
             print("🎉 Todas las tablas están presentes y actualizadas")
         else:
             print("⚠️  Algunas tablas faltan o necesitan actualización")
@@ -0,0 +1,226 @@
+"""
+Migraciones versionadas del esquema.
+
+Cada migración se aplica una sola vez, en orden de versión, y queda
+registrada en la tabla schema_migrations. Las que crean índices sobre
+tablas con tráfico usan CREATE INDEX CONCURRENTLY, que no bloquea las
+escrituras pero no puede ejecutarse dentro de una transacción: por eso
+cada índice concurrente es una migración propia.
+
+Para agregar un cambio basta con añadir una entrada al final de
+MIGRACIONES con la siguiente versión; nunca se modifica una ya publicada.
+"""
+
+from typing import List, Optional
+
+
+class Migracion:
+    """
+    Paso de migración con una o más sentencias SQL.
+
+    Las migraciones normales se ejecutan en una transacción junto con su
+    registro en schema_migrations. Las concurrentes se ejecutan en modo
+    autocommit y deben contener una única sentencia CONCURRENTLY.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        descripcion: str,
+        sentencias: List[str],
+        concurrente: bool = False,
+        indice: Optional[str] = None,
+    ):
+        self.version = version
+        self.descripcion = descripcion
+        self.sentencias = sentencias
+        self.concurrente = concurrente
+        # Nombre del índice que construye, para reanudar una construcción interrumpida
+        self.indice = indice
+
+
+def indice_concurrente(
+    version: int, nombre: str, tabla: str, definicion: str, descripcion: str = None
+) -> Migracion:
+    """
+    Crea una migración que construye un índice con CREATE INDEX CONCURRENTLY.
+
+    Args:
+        version: Versión de la migración
+        nombre: Nombre del índice
+        tabla: Tabla indexada
+        definicion: Resto de la definición, por ejemplo '("idCliente")'
+
+    Returns:
+        Migracion: Migración concurrente
+    """
+    return Migracion(
+        version,
+        descripcion or f"Índice {nombre} en {tabla}",
+        [f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{nombre}" ON {tabla} {definicion}'],
+        concurrente=True,
+        indice=nombre,
+    )
+
+
+def eliminar_indice_concurrente(
+    version: int, nombre: str, descripcion: str = None
+) -> Migracion:
+    """
+    Crea una migración que elimina un índice con DROP INDEX CONCURRENTLY.
+
+    Args:
+        version: Versión de la migración
+        nombre: Nombre del índice
+
+    Returns:
+        Migracion: Migración concurrente
+    """
+    return Migracion(
+        version,
+        descripcion or f"Elimina el índice {nombre}",
+        [f'DROP INDEX CONCURRENTLY IF EXISTS "{nombre}"'],
+        concurrente=True,
+    )
+
+
+MIGRACIONES = [
+    Migracion(
+        1,
+        "Cheques: monto numérico para poder sumarlo en SQL",
+        [
+            """
+            DO $$
+            BEGIN
+                IF (SELECT data_type FROM information_schema.columns
+                    WHERE table_schema = 'public' AND table_name = 'cheques'
+                    AND column_name = 'monto') <> 'numeric' THEN
+                    ALTER TABLE cheques
+                        ALTER COLUMN monto TYPE NUMERIC(14, 2) USING monto::numeric;
+                END IF;
+            END $$;
+            """
+        ],
+    ),
+    Migracion(
+        2,
+        "Cheques: cuenta a debitar y estado de compensación",
+        [
+            'ALTER TABLE cheques ADD COLUMN IF NOT EXISTS "idCuenta" UUID '
+            'REFERENCES cuentas ("idCuenta")',
+            "ALTER TABLE cheques ADD COLUMN IF NOT EXISTS estado VARCHAR DEFAULT 'pendiente'",
+        ],
+    ),
+    indice_concurrente(3, "ix_cheques_idCuenta", "cheques", '("idCuenta")'),
+    indice_concurrente(
+        4,
+        "ix_cheques_pendientes_cobro",
+        "cheques",
+        """("fechaCobro") WHERE estado = 'pendiente'""",
+    ),
+    indice_concurrente(
+        5,
+        "ix_tarjetas_expiracion_vigentes",
+        "tarjetas",
+        """("fechaExpiracion") WHERE estado <> 'Vencida'""",
+    ),
+    Migracion(
+        6,
+        "Préstamos: fecha de vencimiento calculada a partir del plazo",
+        [
+            'ALTER TABLE prestamos ADD COLUMN IF NOT EXISTS "fechaVencimiento" TIMESTAMP',
+            """
+            UPDATE prestamos
+            SET "fechaVencimiento" = fecha_creacion + "plazoMeses"::int * INTERVAL '1 month'
+            WHERE "fechaVencimiento" IS NULL
+              AND fecha_creacion IS NOT NULL
+              AND "plazoMeses" ~ '^[0-9]+$'
+            """,
+        ],
+    ),
+    indice_concurrente(
+        7,
+        "ix_prestamos_vencimiento_pendientes",
+        "prestamos",
+        """("fechaVencimiento") WHERE estado = 'pendiente'""",
+    ),
+    Migracion(
+        8,
+        "Extensión pg_trgm para búsqueda de clientes",
+        ["CREATE EXTENSION IF NOT EXISTS pg_trgm"],
+    ),
+    indice_concurrente(
+        9, "ix_clientes_nombre_trgm", "clientes", "USING gin (nombre gin_trgm_ops)"
+    ),
+    indice_concurrente(
+        10, "ix_clientes_apellido_trgm", "clientes", "USING gin (apellido gin_trgm_ops)"
+    ),
+    indice_concurrente(
+        11, "ix_clientes_documento_prefijo", "clientes", "(documento text_pattern_ops)"
+    ),
+    # Claves foráneas usadas en joins y filtros
+    indice_concurrente(12, "ix_cuentas_idCliente", "cuentas", '("idCliente")'),
+    indice_concurrente(13, "ix_tarjetas_idCuenta", "tarjetas", '("idCuenta")'),
+    indice_concurrente(14, "ix_prestamos_idCliente", "prestamos", '("idCliente")'),
+    indice_concurrente(15, "ix_transacciones_idCuenta", "transacciones", '("idCuenta")'),
+    # Índices redundantes con la clave primaria (python -m src.migrations auditar)
+    eliminar_indice_concurrente(16, "ix_cheques_idCheque"),
+    eliminar_indice_concurrente(17, "ix_clientes_idCliente"),
+    eliminar_indice_concurrente(18, "ix_cuentas_idCuenta"),
+    eliminar_indice_concurrente(19, "ix_empleados_idEmpleado"),
+    eliminar_indice_concurrente(20, "ix_prestamos_idPrestamo"),
+    eliminar_indice_concurrente(21, "ix_tarjetas_idTarjeta"),
+    eliminar_indice_concurrente(22, "ix_transacciones_idTransaccion"),
+    eliminar_indice_concurrente(23, "ix_usuarios_id_usuario"),
+    indice_concurrente(24, "ix_prestamos_idEmpleado", "prestamos", '("idEmpleado")'),
+    Migracion(
+        25,
+        "Función uuid_generate_v7 para claves ordenadas por tiempo generadas en SQL",
+        [
+            """
+            CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+                SELECT encode(
+                    set_bit(
+                        set_bit(
+                            overlay(
+                                uuid_send(gen_random_uuid())
+                                PLACING substring(
+                                    int8send(
+                                        floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint
+                                    ) FROM 3
+                                )
+                                FROM 1 FOR 6
+                            ),
+                            52, 1
+                        ),
+                        53, 1
+                    ),
+                    'hex'
+                )::uuid
+            $$ LANGUAGE sql VOLATILE
+            """
+        ],
+    ),
+    Migracion(
+        26,
+        "Planificador: última ejecución de cada tarea periódica",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS tareas_programadas (
+                nombre VARCHAR PRIMARY KEY,
+                ultima_ejecucion TIMESTAMPTZ
+            )
+            """
+        ],
+    ),
+    # Búsqueda de clientes: GiST permite recorrer por distancia (<<->) además
+    # de filtrar por <%, así que reemplaza a los índices GIN
+    indice_concurrente(
+        27, "ix_clientes_nombre_trgm_gist", "clientes", "USING gist (nombre gist_trgm_ops)"
+    ),
+    indice_concurrente(
+        28, "ix_clientes_apellido_trgm_gist", "clientes", "USING gist (apellido gist_trgm_ops)"
+    ),
+    eliminar_indice_concurrente(29, "ix_clientes_nombre_trgm"),
+    eliminar_indice_concurrente(30, "ix_clientes_apellido_trgm"),
+]
@@ -1,5 +1,8 @@
 # src/routers/cheque.py
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from uuid import UUID
@@ -7,7 +10,9 @@ from uuid import UUID
 import src.controller.cheques as cheque_controller
 import src.controller.clientes as cliente_controller
 from database.connection import get_db
-from src.schemas.cheques import ChequeCreate, ChequeResponse
+from src.auth.middleware import require_admin
+from src.schemas.auth import UserResponse
+from src.schemas.cheques import ChequeCreate, ChequeResponse, CompensacionResponse
 
 router = APIRouter(prefix="/cheques", tags=["Cheques"])
 
@@ -38,6 +43,19 @@ def create_cheque(cheque: ChequeCreate, db: Session = Depends(get_db), current_u
         },
     )
 
+# Compensar cheques con fecha de cobro vencida (solo administradores)
+@router.post("/compensacion", response_model=CompensacionResponse)
+def compensar_cheques(
+    tamano_lote: int = Query(500, gt=0, le=10000),
+    max_lotes: Optional[int] = Query(None, gt=0),
+    fecha_corte: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(require_admin),
+):
+    return cheque_controller.compensar_cheques(
+        db, tamano_lote=tamano_lote, max_lotes=max_lotes, fecha_corte=fecha_corte
+    )
+
 # Listar todos los Cheques
 @router.get("/", response_model=list[ChequeResponse])
 def read_cheques(db: Session = Depends(get_db)):
@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 import src.controller.clientes as cliente_controller
 from database.connection import get_db
 from src.auth.middleware import get_current_active_user
+from src.cache.etags import cabeceras, coincide, etag_debil, no_modificado
 from src.schemas.auth import UserResponse
-from src.schemas.clientes import ClienteCreate, ClienteResponse
+from src.schemas.clientes import ClienteBusqueda, ClienteCreate, ClienteResponse
 
 """Creamos el router para los clientes
 Define un prefijo para las rutas y etiquetas para la documentación
@@ -51,14 +52,42 @@ def create_cliente(
         )
 
 
+@router.get("/buscar", response_model=list[ClienteBusqueda], tags=["Clientes"])
+def buscar_clientes(
+    q: str = Query(..., min_length=2, max_length=100),
+    limite: int = Query(cliente_controller.LIMITE_BUSQUEDA, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_active_user),
+):
+    """
+    Busca clientes por nombre, apellido o prefijo de documento.
+
+    Args:
+        q: Texto parcial a buscar
+        limite: Cantidad máxima de resultados
+
+    Returns:
+        list[ClienteBusqueda]: Clientes ordenados por similitud
+    """
+    return cliente_controller.buscar_clientes(db, q=q, limite=limite)
+
+
 @router.get("/clientes/", response_model=list[ClienteResponse], tags=["Clientes"])
 def read_all_clientes(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_active_user),
 ):
+    # La versión se lee antes que el listado: si cambia entre ambas lecturas,
+    # el cliente recibe datos más nuevos que su ETag y el próximo GET los trae
+    etag = etag_debil("clientes", *cliente_controller.version_clientes(db))
+    if coincide(request, etag):
+        return no_modificado(etag)
     clientes_db = cliente_controller.get_clientes(db)
     if not clientes_db:
         raise HTTPException(status_code=404, detail="No hay clientes registrados")
+    response.headers.update(cabeceras(etag))
     return clientes_db  
 
 
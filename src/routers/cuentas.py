@@ -1,13 +1,18 @@
 # src/routers/cheque.py
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from uuid import UUID
 
 import src.controller.cuentas as cuenta_controller
 import src.controller.clientes as cliente_controller
-from database.connection import get_db
+from database.connection import SessionLocal, get_db
+from src.auth.middleware import get_current_user, oauth2_scheme
+from src.cache.etags import cabeceras, coincide, etag_debil, no_modificado
 from src.schemas.cuentas import CuentaCreate, CuentaResponse
+from src.tiempo_real import LATIDO_SEGUNDOS, difusor, flujo_eventos
 
 router = APIRouter(prefix="/cuentas", tags=["Cuentas"])
 
@@ -49,14 +54,18 @@ def read_cuentas(db: Session = Depends(get_db)):
 
 # Obtener un cheque
 @router.get("/{cuenta_id}", response_model=CuentaResponse, tags=["Cuentas"])
-def read_one_cuenta(cuenta_id: UUID, db: Session = Depends(get_db)):
+def read_one_cuenta(cuenta_id: UUID, request: Request, db: Session = Depends(get_db)):
     db_cuenta = cuenta_controller.get_cuenta(db, cuenta_id=cuenta_id)
     if db_cuenta is None:
         raise HTTPException(status_code=404, detail="Cuenta no encontrada")
+    etag = etag_debil("cuenta", db_cuenta.idCuenta, db_cuenta.fecha_actualizacion)
+    if coincide(request, etag):
+        return no_modificado(etag)
     else:
         return JSONResponse(
             status_code=200,
-            content={
+            headers=cabeceras(etag),
+            content=jsonable_encoder({
                 "detail": "Cuenta encontrada",
                 "data": {
                     "idCuenta": db_cuenta.idCuenta,
@@ -66,8 +75,77 @@ def read_one_cuenta(cuenta_id: UUID, db: Session = Depends(get_db)):
                     "saldo":db_cuenta.saldo,
                     "estado":db_cuenta.estado,
                 },
-            },
+            }),
         )
+def _leer_cuenta(cuenta_id: UUID):
+    # Sesión propia y breve: get_db la mantendría abierta mientras dure el flujo
+    db = SessionLocal()
+    try:
+        return cuenta_controller.get_cuenta(db, cuenta_id=cuenta_id)
+    finally:
+        db.close()
+
+
+# Roles del banco que pueden seguir cualquier cuenta
+ROLES_PERSONAL = {"admin", "empleado"}
+
+
+def _autorizar_flujo(token: str, cuenta_id: UUID):
+    """
+    Valida el token y que el usuario pueda leer la cuenta.
+
+    El personal del banco lee cualquier cuenta; un usuario solo las del
+    cliente registrado con su mismo email. Usa una sesión breve por la misma
+    razón que _leer_cuenta.
+    """
+    db = SessionLocal()
+    try:
+        usuario = get_current_user(token, db)
+        db_cuenta = cuenta_controller.get_cuenta(db, cuenta_id=cuenta_id)
+        if db_cuenta is None:
+            raise HTTPException(status_code=404, detail="Cuenta no encontrada")
+        if usuario.rol not in ROLES_PERSONAL:
+            titular = cliente_controller.get_cliente(db, cliente_id=db_cuenta.idCliente)
+            if titular is None or (titular.email or "").lower() != usuario.email.lower():
+                raise HTTPException(status_code=403, detail="No tiene acceso a esta cuenta")
+    finally:
+        db.close()
+
+
+# Eventos de una cuenta en tiempo real
+@router.get("/{cuenta_id}/stream", tags=["Cuentas"])
+async def stream_cuenta(cuenta_id: UUID, token: str = Depends(oauth2_scheme)):
+    """
+    Flujo Server-Sent Events con los movimientos y cambios de saldo de la cuenta.
+
+    Requiere un usuario autenticado con acceso a la cuenta. Envía primero el
+    saldo actual (evento `saldo`) y luego, a medida que se confirman, los
+    eventos `transaccion` y `saldo`. Un evento `resincronizar` indica que
+    pudieron perderse eventos y que el cliente debe volver a leer la cuenta.
+    """
+    await run_in_threadpool(_autorizar_flujo, token, cuenta_id)
+    if difusor.lleno:
+        raise HTTPException(
+            status_code=503,
+            detail="Demasiadas conexiones en tiempo real, reintente más tarde",
+            headers={"Retry-After": "5"},
+        )
+
+    async def saldo_actual():
+        db_cuenta = await run_in_threadpool(_leer_cuenta, cuenta_id)
+        if db_cuenta is None:
+            return None
+        return "saldo", {
+            "saldo": db_cuenta.saldo,
+            "fecha_actualizacion": db_cuenta.fecha_actualizacion,
+        }
+
+    return StreamingResponse(
+        flujo_eventos(difusor, str(cuenta_id), saldo_actual, LATIDO_SEGUNDOS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 # Actualizar Cheque
 @router.put("/cuentas/{cuenta_id}", response_model=CuentaResponse, tags=["Cuentas"])
 def update_cuenta(cuenta_id: UUID, cuenta: CuentaCreate, db: Session = Depends(get_db)):
@@ -77,7 +155,7 @@ def update_cuenta(cuenta_id: UUID, cuenta: CuentaCreate, db: Session = Depends(g
     else:
         return JSONResponse(
             status_code=201,
-            content={
+            content=jsonable_encoder({
                 "detail": "Cuenta actualizada correctamente",
                 "data": {
                     "idCuenta": db_cuenta.idCuenta,
@@ -87,7 +165,7 @@ def update_cuenta(cuenta_id: UUID, cuenta: CuentaCreate, db: Session = Depends(g
                     "saldo":db_cuenta.saldo,
                     "estado":db_cuenta.estado,
                 },
-            },
+            }),
         )
 
 # Eliminar Cheque
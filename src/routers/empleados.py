@@ -24,6 +24,10 @@ def create_empleado(
     """Busca en la base de datos si ya existe un empleado con la misma cédula (idEmpleado)"""
 
     db_empleado = empleado_controller.get_empleado(db, empleado_id=empleado.idEmpleado)
+    if db_empleado is None:
+        db_empleado = empleado_controller.get_empleado_por_documento(
+            db, documento=empleado.documentoEmpleado
+        )
 
     """Si el empleado ya está registrado, lanza una excepción HTTP con código 400 (Bad Request)"""
 
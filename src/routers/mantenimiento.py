@@ -0,0 +1,26 @@
+"""
+Router de tareas de mantenimiento (solo administradores).
+"""
+
+from fastapi import APIRouter, Depends
+
+from src.auth.middleware import require_admin
+from src.jobs import planificador
+from src.schemas.auth import UserResponse
+from src.schemas.mantenimiento import TareaEstado
+
+router = APIRouter(prefix="/mantenimiento", tags=["Mantenimiento"])
+
+
+@router.get("/tareas", response_model=list[TareaEstado], tags=["Mantenimiento"])
+def read_tareas(current_user: UserResponse = Depends(require_admin)):
+    """
+    Obtiene la duración y las filas afectadas de la última ejecución de cada tarea.
+
+    Args:
+        current_user: Usuario administrador autenticado
+
+    Returns:
+        list[TareaEstado]: Estado de cada tarea periódica
+    """
+    return planificador.estado()
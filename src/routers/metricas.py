@@ -0,0 +1,23 @@
+"""
+Router de métricas en formato de texto de Prometheus.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.metricas import registro
+
+router = APIRouter(tags=["Mantenimiento"])
+
+TIPO_CONTENIDO = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics():
+    """
+    Expone las métricas de la aplicación para que Prometheus las recolecte.
+
+    Returns:
+        PlainTextResponse: Métricas en formato de exposición de texto
+    """
+    return PlainTextResponse(registro.exponer(), media_type=TIPO_CONTENIDO)
@@ -1,5 +1,6 @@
 # src/routers/cheque.py
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from uuid import UUID
@@ -14,7 +15,7 @@ router = APIRouter(prefix="/prestamos", tags=["Prestamos"])
 
 # Crear Cheque
 @router.post("/", response_model=PrestamoResponse)
-def create_prestamo(prestamo: PrestamoCreate, db: Session = Depends(get_db), current_user_id: UUID = None):
+def create_prestamo(prestamo: PrestamoCreate, db: Session = Depends(get_db)):
     # Validar Cliente
     cliente = cliente_controller.get_cliente(db, prestamo.idCliente)
     if not cliente:
@@ -26,13 +27,13 @@ def create_prestamo(prestamo: PrestamoCreate, db: Session = Depends(get_db), cur
         raise HTTPException(status_code=400, detail="El empleado no existe")
 
     # Crear Cheque
-    db_prestamo = prestamo_controller.create_prestamo(db, prestamo, current_user_id)
+    db_prestamo = prestamo_controller.create_prestamo(db, prestamo)
     if not db_prestamo:
         raise HTTPException(status_code=400, detail="Error al crear préstamo")
 
     return JSONResponse(
         status_code=201,
-        content={
+        content=jsonable_encoder({
             "detail": "Préstamo creado correctamente",
             "data": {
                 "idPrestamo": db_prestamo.idPrestamo,
@@ -43,7 +44,7 @@ def create_prestamo(prestamo: PrestamoCreate, db: Session = Depends(get_db), cur
                 "plazo":prestamo.plazoMeses,
                 "estado":prestamo.estado,
             },
-        },
+        }),
     )
 
 # Listar todos los Préstamos
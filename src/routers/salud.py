@@ -0,0 +1,45 @@
+"""
+Router de sondas de salud (liveness y readiness).
+"""
+
+from fastapi import APIRouter
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.arranque import preparacion
+
+router = APIRouter(prefix="/health", tags=["Salud"])
+
+
+@router.get("/live")
+async def read_live():
+    """
+    Indica que el proceso está vivo. No consulta la base de datos.
+
+    Responde 503 si la preparación agotó sus reintentos, para que el
+    orquestador reinicie el proceso.
+
+    Returns:
+        JSONResponse: 200 si está vivo, 503 si la preparación falló
+    """
+    if not preparacion.vivo():
+        return JSONResponse(
+            jsonable_encoder({"estado": "fallido", **preparacion.resumen()}), status_code=503
+        )
+    return {"estado": "vivo"}
+
+
+@router.get("/ready")
+async def read_ready():
+    """
+    Indica si la aplicación terminó de arrancar y puede recibir tráfico.
+
+    Usa el último resultado cacheado, así que nunca consulta la base.
+
+    Returns:
+        JSONResponse: 200 si está lista, 503 mientras arranca o si falló
+    """
+    listo = preparacion.listo()
+    return JSONResponse(
+        jsonable_encoder(preparacion.resumen()), status_code=200 if listo else 503
+    )
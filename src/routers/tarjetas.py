@@ -7,7 +7,12 @@ from uuid import UUID
 import src.controller.cuentas as cuenta_controller
 import src.controller.tarjetas as tarjeta_controller
 from database.connection import get_db
-from src.schemas.tarjetas import TarjetaCreate, TarjetaResponse
+from src.schemas.tarjetas import (
+    AutorizacionRequest,
+    AutorizacionResponse,
+    TarjetaCreate,
+    TarjetaResponse,
+)
 
 router = APIRouter(prefix="/tarjetas", tags=["Tarjetas"])
 
@@ -38,6 +43,27 @@ def create_tarjeta(tarjeta: TarjetaCreate, db: Session = Depends(get_db), curren
         },
     )
 
+# Autorizar compra con tarjeta (POS)
+@router.post("/autorizar", response_model=AutorizacionResponse)
+def autorizar_tarjeta(autorizacion: AutorizacionRequest, db: Session = Depends(get_db)):
+    tarjeta, resultado = tarjeta_controller.autorizar_tarjeta(
+        db,
+        numero_tarjeta=autorizacion.numeroTarjeta,
+        monto=autorizacion.monto,
+        descripcion=autorizacion.descripcion,
+    )
+    if tarjeta is None:
+        status_code = 404 if resultado == "Tarjeta no encontrada" else 400
+        raise HTTPException(status_code=status_code, detail=resultado)
+
+    return AutorizacionResponse(
+        idTarjeta=tarjeta.idTarjeta,
+        idCuenta=tarjeta.idCuenta,
+        idTransaccion=resultado,
+        monto=autorizacion.monto,
+        saldoDisponible=tarjeta.saldoDisponible,
+    )
+
 # Listar todos los Tarjetas
 @router.get("/", response_model=list[TarjetaResponse])
 def read_tarjetas(db: Session = Depends(get_db)):
@@ -1,20 +1,27 @@
 # src/routers/transaccion.py
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from uuid import UUID
 import src.controller.transacciones as transaccion_controller
 from database.connection import get_db
-from src.schemas.transaccion import TransaccionCreate, TransaccionResponse
+from src.auth.middleware import get_current_active_user
+from src.schemas.auth import UserResponse
+from src.schemas.transacciones import TransaccionCreate, TransaccionResponse
 
 router = APIRouter(prefix="/transacciones", tags=["Transacciones"])
 
 @router.post("/", response_model=TransaccionResponse)
-def create_transaccion(transaccion: TransaccionCreate, db: Session = Depends(get_db), current_user_id: UUID = None):
-    db_transaccion = transaccion_controller.create_transaccion(db, transaccion, current_user_id)
+def create_transaccion(
+    transaccion: TransaccionCreate,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_active_user),
+):
+    db_transaccion = transaccion_controller.create_transaccion(db, transaccion, current_user.id_usuario)
     if not db_transaccion:
         raise HTTPException(status_code=400, detail="Error al crear transacción")
-    return JSONResponse(status_code=201, content={"detail": "Transacción creada correctamente", "data": db_transaccion.__dict__})
+    return JSONResponse(status_code=201, content=jsonable_encoder({"detail": "Transacción creada correctamente", "data": TransaccionResponse.model_validate(db_transaccion)}))
 
 @router.get("/", response_model=list[TransaccionResponse])
 def read_transacciones(db: Session = Depends(get_db)):
@@ -5,25 +5,36 @@ This module contains Pydantic models that are used for
 API request/response validation and serialization.
 """
 
-from .cheques import ChequeCreate, ChequeResponse
-from .clientes import ClienteCreate, ClienteResponse
+from .cheques import ChequeCreate, ChequeResponse, CompensacionResponse
+from .clientes import ClienteBusqueda, ClienteCreate, ClienteResponse
 from .cuentas import CuentaCreate, CuentaResponse
 from .empleados import EmpleadoCreate, EmpleadoResponse
+from .mantenimiento import TareaEstado
 from .prestamos import PrestamoCreate, PrestamoResponse
-from .tarjetas import TarjetaCreate, TarjetaResponse
+from .tarjetas import (
+    AutorizacionRequest,
+    AutorizacionResponse,
+    TarjetaCreate,
+    TarjetaResponse,
+)
 from .transacciones import TransaccionCreate, TransaccionResponse
 
 __all__ = [
+    "AutorizacionRequest",
+    "AutorizacionResponse",
     "ChequeCreate",
     "ChequeResponse",
+    "ClienteBusqueda",
     "ClienteCreate",
     "ClienteResponse",
+    "CompensacionResponse",
     "CuentaCreate",
     "CuentaResponse",
     "EmpleadoCreate",
     "EmpleadoResponse",
     "PrestamoCreate",
     "PrestamoResponse",
+    "TareaEstado",
     "TarjetaCreate",
     "TarjetaResponse",
     "TransaccionCreate",
@@ -13,7 +13,9 @@ class ChequeBase(BaseModel):
     """Base schema for Cheque with common fields."""
 
     idCliente: UUID
+    idCuenta: Optional[UUID] = None
     fechaEmision: date
+    fechaCobro: Optional[date] = None
     monto: float
     motivo: str
 
@@ -28,6 +30,7 @@ class ChequeResponse(ChequeBase):
     """Schema for Cheque response."""
 
     idCheque: UUID
+    estado: Optional[str] = None
     id_usuario_creacion: Optional[UUID] = None
     id_usuario_actualizacion: Optional[UUID] = None
     fecha_creacion: Optional[datetime] = None
@@ -35,3 +38,14 @@ class ChequeResponse(ChequeBase):
 
     class Config:
         from_attributes = True
+
+
+class CompensacionResponse(BaseModel):
+    """Schema for the result of a cheque clearing run."""
+
+    lotes: int
+    cheques: int
+    rechazados: int = 0
+    monto_total: float
+    segundos: float
+    cheques_por_segundo: float
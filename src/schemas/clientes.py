@@ -31,6 +31,7 @@ class ClienteCreate(ClienteBase):
 class ClienteResponse(ClienteBase):
     """Schema for Cliente response."""
 
+    idCliente: UUID
     id_usuario_creacion: Optional[UUID] = None
     id_usuario_actualizacion: Optional[UUID] = None
     fecha_creacion: Optional[datetime] = None
@@ -38,3 +39,16 @@ class ClienteResponse(ClienteBase):
 
     class Config:
         from_attributes = True
+
+
+class ClienteBusqueda(BaseModel):
+    """Schema for a ranked Cliente search result."""
+
+    idCliente: UUID
+    nombre: str
+    apellido: str
+    documento: str
+    similitud: float
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,21 @@
+"""
+Pydantic schemas for maintenance jobs.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class TareaEstado(BaseModel):
+    """Schema for the last run of a periodic maintenance job."""
+
+    nombre: str
+    intervalo_segundos: float
+    ejecuciones: int
+    omitidas: int
+    ultima_ejecucion: Optional[datetime] = None
+    ultima_duracion_segundos: Optional[float] = None
+    ultimas_filas: Optional[int] = None
+    ultimo_error: Optional[str] = None
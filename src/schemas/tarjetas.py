@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class TarjetaBase(BaseModel):
@@ -38,3 +38,21 @@ class TarjetaResponse(TarjetaBase):
 
     class Config:
         from_attributes = True
+
+
+class AutorizacionRequest(BaseModel):
+    """Schema for a card purchase authorization request."""
+
+    numeroTarjeta: str
+    monto: float = Field(gt=0)
+    descripcion: Optional[str] = None
+
+
+class AutorizacionResponse(BaseModel):
+    """Schema for an approved card purchase authorization."""
+
+    idTarjeta: UUID
+    idCuenta: UUID
+    idTransaccion: UUID
+    monto: float
+    saldoDisponible: float
@@ -0,0 +1,57 @@
+"""
+Eventos de cuentas en tiempo real para los clientes conectados por SSE.
+
+Los avisos del canal de database.eventos llegan por la conexión de escucha
+del bus de invalidación y se reparten con un Difusor por proceso. Si esa
+conexión se cortó, los avisos del intervalo se perdieron: los suscriptores
+reciben RESINCRONIZAR para que vuelvan a leer el estado.
+"""
+
+import json
+import os
+
+from database.eventos import CANAL_CUENTAS
+from database.invalidacion import TODO, bus_invalidacion, normalizar_clave
+from src.metricas import registro
+from src.metricas.registro import MedidorCalculado
+
+from .difusor import RESINCRONIZAR, Difusor, Suscripcion
+from .sse import LATIDO, flujo_eventos, formatear
+
+LATIDO_SEGUNDOS = float(os.getenv("SSE_LATIDO_SEGUNDOS", "15"))
+
+difusor = Difusor(
+    capacidad=int(os.getenv("SSE_CAPACIDAD_COLA", "64")),
+    maximo=int(os.getenv("SSE_MAXIMO_SUSCRIPTORES", "10000")),
+)
+
+
+def _al_recibir_evento(carga: str):
+    aviso = json.loads(carga)
+    difusor.publicar(normalizar_clave(aviso["cuenta"]), aviso["evento"], aviso.get("datos") or {})
+
+
+def _al_invalidar_cuentas(clave: str):
+    if clave == TODO:
+        difusor.publicar_todos(RESINCRONIZAR, {})
+
+
+bus_invalidacion.escuchar(CANAL_CUENTAS, _al_recibir_evento)
+bus_invalidacion.suscribir("cuentas", _al_invalidar_cuentas)
+
+registro.registrar(
+    MedidorCalculado(
+        "sse_suscriptores", "Conexiones SSE abiertas en este proceso", lambda: {(): difusor.total}
+    )
+)
+
+__all__ = [
+    "difusor",
+    "Difusor",
+    "Suscripcion",
+    "RESINCRONIZAR",
+    "LATIDO",
+    "LATIDO_SEGUNDOS",
+    "flujo_eventos",
+    "formatear",
+]
@@ -0,0 +1,110 @@
+"""
+Reparto en memoria de eventos a muchos suscriptores en el event loop.
+
+Un único publicador (el hilo del bus de avisos) entrega cada evento al
+difusor, que lo copia a la cola de cada suscriptor de esa clave. Un
+suscriptor es solo una cola de asyncio: miles de conexiones SSE inactivas
+esperan en el event loop sin ocupar hilos ni conexiones de la base.
+
+Si un cliente lee más lento de lo que llegan sus eventos y su cola se
+llena, se vacía y se le envía RESINCRONIZAR, para que vuelva a leer el
+estado completo en lugar de frenar al resto o acumular memoria.
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Dict, Optional, Set
+
+from src.metricas import desbordes_sse, eventos_sse
+
+RESINCRONIZAR = "resincronizar"
+
+
+class Suscripcion:
+    """Cola de eventos (evento, datos) de un suscriptor; None indica cierre."""
+
+    __slots__ = ("clave", "cola")
+
+    def __init__(self, clave: str, capacidad: int):
+        self.clave = clave
+        self.cola: asyncio.Queue = asyncio.Queue(capacidad)
+
+
+class Difusor:
+    """
+    Reparte eventos por clave a las suscripciones del proceso.
+
+    suscribir() y desuscribir() se llaman desde el event loop; publicar()
+    puede llamarse desde cualquier hilo.
+
+    Args:
+        capacidad: Eventos pendientes por suscriptor antes de pedirle resincronizar
+        maximo: Suscripciones abiertas a la vez en este proceso
+    """
+
+    def __init__(self, capacidad: int = 64, maximo: int = 10000):
+        self.capacidad = capacidad
+        self.maximo = maximo
+        self.total = 0
+        self._suscripciones: Dict[str, Set[Suscripcion]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def lleno(self) -> bool:
+        return self.total >= self.maximo
+
+    def suscribir(self, clave: str) -> Suscripcion:
+        self._loop = asyncio.get_running_loop()
+        suscripcion = Suscripcion(clave, self.capacidad)
+        self._suscripciones[clave].add(suscripcion)
+        self.total += 1
+        return suscripcion
+
+    def desuscribir(self, suscripcion: Suscripcion):
+        suscripciones = self._suscripciones.get(suscripcion.clave)
+        if suscripciones is None or suscripcion not in suscripciones:
+            return
+        suscripciones.discard(suscripcion)
+        if not suscripciones:
+            del self._suscripciones[suscripcion.clave]
+        self.total -= 1
+
+    def publicar(self, clave: str, evento: str, datos: dict):
+        """Entrega un evento a los suscriptores de `clave`."""
+        # Sin suscriptores en este proceso no hace falta despertar al loop
+        if self._loop is None or clave not in self._suscripciones:
+            return
+        self._loop.call_soon_threadsafe(self._repartir, clave, (evento, datos))
+
+    def publicar_todos(self, evento: str, datos: dict):
+        """Entrega un evento a todos los suscriptores del proceso."""
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._repartir_todos, (evento, datos))
+
+    def cerrar(self):
+        """Termina todas las suscripciones; se llama desde el event loop."""
+        for suscripciones in list(self._suscripciones.values()):
+            for suscripcion in suscripciones:
+                self._encolar(suscripcion, None)
+
+    def _repartir(self, clave: str, mensaje: tuple):
+        suscripciones = self._suscripciones.get(clave, ())
+        for suscripcion in suscripciones:
+            self._encolar(suscripcion, mensaje)
+        eventos_sse.inc(len(suscripciones), mensaje[0])
+
+    def _repartir_todos(self, mensaje: tuple):
+        for clave in list(self._suscripciones):
+            self._repartir(clave, mensaje)
+
+    def _encolar(self, suscripcion: Suscripcion, mensaje: Optional[tuple]):
+        try:
+            suscripcion.cola.put_nowait(mensaje)
+            return
+        except asyncio.QueueFull:
+            pass
+        while not suscripcion.cola.empty():
+            suscripcion.cola.get_nowait()
+        desbordes_sse.inc(1)
+        suscripcion.cola.put_nowait(mensaje if mensaje is None else (RESINCRONIZAR, {}))
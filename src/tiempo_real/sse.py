@@ -0,0 +1,60 @@
+"""
+Formato Server-Sent Events y generador del flujo de un suscriptor.
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from .difusor import Difusor
+
+LATIDO = b": latido\n\n"
+
+
+def formatear(evento: str, datos: dict) -> bytes:
+    """Serializa un evento SSE con su nombre y los datos en JSON."""
+    cuerpo = json.dumps(jsonable_encoder(datos), separators=(",", ":"), ensure_ascii=False)
+    return f"event: {evento}\ndata: {cuerpo}\n\n".encode()
+
+
+async def flujo_eventos(
+    difusor: Difusor,
+    clave: str,
+    inicial: Callable[[], Awaitable[Optional[tuple]]],
+    latido: float = 15.0,
+    reintento_ms: int = 3000,
+) -> AsyncIterator[bytes]:
+    """
+    Emite los eventos de `clave` mientras el cliente siga conectado.
+
+    Se suscribe antes de pedir el estado inicial, así que ningún evento
+    confirmado entre ambos pasos se pierde (a lo sumo llega repetido). Si
+    no hay eventos en `latido` segundos envía un comentario, para que
+    proxies y balanceadores no cierren la conexión por inactividad.
+
+    Args:
+        difusor: Difusor del proceso
+        clave: Clave de los eventos a seguir
+        inicial: Corrutina que devuelve el primer evento (evento, datos), o None
+        latido: Segundos sin eventos antes de enviar un latido
+        reintento_ms: Espera que el navegador usa antes de reconectar
+    """
+    suscripcion = difusor.suscribir(clave)
+    try:
+        yield f"retry: {reintento_ms}\n\n".encode()
+        primero = await inicial()
+        if primero is not None:
+            yield formatear(*primero)
+        while True:
+            try:
+                mensaje = await asyncio.wait_for(suscripcion.cola.get(), latido)
+            except asyncio.TimeoutError:
+                yield LATIDO
+                continue
+            if mensaje is None:
+                return
+            yield formatear(*mensaje)
+    finally:
+        difusor.desuscribir(suscripcion)